@@ -0,0 +1,70 @@
+"""Benchmark of the ordering of interval events: ``sorted`` with a key function against ``numpy.lexsort``.
+
+The merge fixtures of ``stream_graph/test/test_dataframe.py`` are repeated, shifted in time and
+spread over keys, up to the requested number of rows (10^7 by default, which needs several GB of memory).
+The operands are sorted by starting time, so that their streamed k-way merge is timed as well, both
+fully consumed and up to its first thousand events (as a loop exiting early)::
+
+    python benchmarks/event_ordering.py [rows]
+
+"""
+from __future__ import print_function
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from stream_graph.base.dataframes import CIntervalDF
+from stream_graph.base.dataframes import DIntervalDF
+from stream_graph.base.dataframes.algorithms.utils import bounds
+from stream_graph.base.dataframes.algorithms.utils import no_bounds
+from stream_graph.base.dataframes.algorithms.utils.orderings import sort_events, stream_events
+from stream_graph.base.dataframes.algorithms.utils.orderings import order_0_1, r_order_1_n2_0n2
+from stream_graph.base.dataframes.algorithms.utils.orderings import b_order_0_n2_1n2, rb_order_1_n3_0n3_2n3
+
+FIXTURE = [(480, 500), (460, 540), (560, 580), (520, 540), (580, 600), (620, 660), (480, 500)]
+
+
+def fixture(rows, discrete, seed=0):
+    base = np.array(FIXTURE * (rows // len(FIXTURE) + 1))[:rows]
+    shift = 1000 * (np.arange(rows) // len(FIXTURE))
+    df = pd.DataFrame({'u': np.random.RandomState(seed).randint(0, 100, rows), 'ts': base[:, 0] + shift, 'tf': base[:, 1] + shift})
+    if discrete:
+        df = DIntervalDF(df, disjoint_intervals=True)
+    else:
+        df = CIntervalDF(df.assign(s=(np.arange(rows) % 2 == 0), f=(np.arange(rows) % 3 != 0)), disjoint_intervals=True)
+    return df.sort_values(by='ts', kind='mergesort')
+
+
+def timed(f):
+    start = time.time()
+    out = f()
+    return out, time.time() - start
+
+
+def compare(name, dfs, generate, key, fields, time_position):
+    # All timings include the generation of the events
+    slow, t_slow = timed(lambda: sorted(generate(dfs), key=key))
+    fast, t_fast = timed(lambda: sort_events(generate(dfs), key, *(fields(dfs) + (time_position, ))))
+    streamed, t_stream = timed(lambda: list(stream_events(dfs, generate, fields, key, time_position)))
+    _, t_first = timed(lambda: list(islice(stream_events(dfs, generate, fields, key, time_position), 1000)))
+    assert slow == fast == streamed
+    print('{:<24} {:>10} events  sorted: {:>7.2f}s  lexsort: {:>7.2f}s  stream: {:>7.2f}s  first 1000: {:>7.3f}s'.format(
+        name, len(slow), t_slow, t_fast, t_stream, t_first))
+
+
+def main(rows):
+    for discrete, module, merge_order, difference_order in [(True, no_bounds, order_0_1, r_order_1_n2_0n2),
+                                                            (False, bounds, b_order_0_n2_1n2, rb_order_1_n3_0n3_2n3)]:
+        a, b = fixture(rows, discrete, 0), fixture(rows, discrete, 1)
+        kind = ('discrete' if discrete else 'continuous')
+        uni, pair = ((module.events_uni_not_sorted, module.events_not_sorted) if discrete else (module.events_uni_ns, module.events_ns))
+        compare(kind + ' merge', [a], lambda p: list(uni(p[0], weights=False)), merge_order, module.event_fields, 0)
+        compare(kind + ' difference', [a, b], lambda p: list(pair(p[0], p[1], reference=True)), difference_order,
+                lambda p: module.event_fields(p, True), 1)
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7)
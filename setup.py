@@ -51,7 +51,8 @@ with open('requirements.txt') as f:
 ext_address = "./stream_graph/_c_functions/"
 ext = Extension(name="stream_graph._c_functions",
                 sources=[ext_address + "functions.pyx",
-                         ext_address + "src/closeness.cpp"],
+                         ext_address + "src/closeness.cpp",
+                         ext_address + "src/ego.cpp"],
                 include_dirs=[ext_address + "include", get_include()],
                 depends=[ext_address + "include/functions.hpp"],
                 language="c++",
@@ -100,7 +101,8 @@ setup(name='stream_graph',
       python_requires='>=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*, !=3.4.*, <4',
       ext_modules=[ext],
       extras_require={
-        'visualize': ["bokeh"]
+        'visualize': ["bokeh"],
+        'parquet': ["pyarrow"]
       },
       cmdclass={'build_ext': build_ext},
       )
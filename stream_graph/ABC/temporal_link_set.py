@@ -125,18 +125,22 @@ class TemporalLinkSet(ABC):
         pass
 
     @abc.abstractmethod
-    def links_at(t=None):
+    def links_at(self, t=None, times=None):
         """Return the links at a certain time.
 
         Parameters
         ----------
         t : Real or None
 
+        times : array_like of Real, default=None
+            Time-instants sorted in ascending order. If given, t is ignored.
+
         Returns
         -------
-        links : LinkSet or TimeGenerator(LinkSet)
+        links : LinkSet or TimeGenerator(LinkSet) or TimeCollection(LinkSet)
             Active links at time t.
             If t is None, return a continuous TimeGenerator of LinkSet
+            If times is given, return an instantaneous TimeCollection with the LinkSet at each instant, computed in one pass.
 
         """
         pass
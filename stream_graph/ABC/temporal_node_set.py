@@ -115,6 +115,23 @@ class TemporalNodeSet(ABC):
         """
         pass
 
+    @property
+    def measures(self):
+        """Returns the size and the total common time of the TemporalNodeSet.
+
+        Parameters
+        ----------
+        None. Property.
+
+
+        Returns
+        -------
+        size, total_common_time : Real
+            Computed together where the implementation allows it.
+
+        """
+        return self.size, self.total_common_time
+
     @property
     def n(self):
         """Returns number of nodes of the TemporalNodeSet.
@@ -225,18 +242,22 @@ class TemporalNodeSet(ABC):
         pass
 
     @abc.abstractmethod
-    def nodes_at(self, t=None):
+    def nodes_at(self, t=None, times=None):
         """Return the nodes at a certain time.
 
         Parameters
         ----------
         t : Real or None
 
+        times : array_like of Real, default=None
+            Time-instants sorted in ascending order. If given, t is ignored.
+
         Returns
         -------
-        nodes : NodeSet or TimeGenerator(NodeSet)
+        nodes : NodeSet or TimeGenerator(NodeSet) or TimeCollection(NodeSet)
             Active nodes at time t.
             If None returns an TimeGenerator of tuples containing a timestamp and a NodeSet.
+            If times is given, return an instantaneous TimeCollection with the NodeSet at each instant, computed in one pass.
 
         """
         pass
@@ -1,5 +1,5 @@
 """Global init file"""
-from .base import NodeSetS, ITimeSetS, LinkSetDF, TimeSetDF, TemporalNodeSetB, TemporalNodeSetDF, TemporalLinkSetDF, ITemporalNodeSetDF, ITemporalLinkSetDF, Graph, StreamGraph  # noqa
+from .base import NodeSetS, ITimeSetS, LinkSetDF, TimeSetDF, TemporalNodeSetB, TemporalNodeSetDF, TemporalLinkSetDF, LazyTemporalLinkSetDF, TemporalLinkSetBuilder, ITemporalNodeSetDF, ITemporalLinkSetDF, Graph, StreamGraph, NodeDictionary, read_link_stream  # noqa
 from .visualize import Visualizer  # noqa
 
 __version__ = '0.2'
@@ -1,6 +1,7 @@
 """A file that wraps c++ functions used in stream_graph"""
 # Author: Ioannis Siglidis <y.siglidis@gmail.com>
 
+import numpy as np
 import pandas as pd
 import cython
 
@@ -8,31 +9,45 @@ from operator import itemgetter
 from numbers import Real
 from libcpp.vector cimport vector
 from libcpp.pair cimport pair
-from stream_graph._c_functions.header cimport closeness, closeness_at
-from stream_graph.collections import NodeCollection, TimeCollection
+from libc.stdint cimport int64_t
+from libcpp cimport bool
+from stream_graph._c_functions.header cimport closeness, closeness_at, closeness_all, closeness_at_all, ego
+from stream_graph.collections import NodeCollection, TimeCollection, TimeArrayCollection
 
-def closeness_c(u, t, df, both, detailed, discrete):
-    """C++ wrapped implementation of Cummulative Closeness."""
+def closeness_c(u, t, df, both, detailed, discrete, n_jobs=None):
+    """C++ wrapped implementation of Cummulative Closeness.
+
+    If u is None, the closeness of all nodes is computed outside of the GIL over
+    n_jobs threads (all the hardware threads if -1).
+
+    """
     assert list(df.columns) == ['u', 'v', 'ts']
     assert df['ts'].dtype.kind in ['i']
     is_interval = (isinstance(t, tuple) and len(t)==2 and all(isinstance(to, int) for to in t) and t[0] < t[1])
     assert is_interval or t is None or t == 'max' or (isinstance(t, Real) or t > .0)
 
-    us = set(df.u.values.flat) | set(df.v.values.flat)
+    # Label nodes with contiguous integer codes that the C++ side reads in place
+    cdef int64_t n = df.shape[0]
+    codes, us = pd.factorize(pd.concat([df['u'], df['v']], ignore_index=True))
+    us = pd.Index(us)
     assert u is None or u in us
-    if df['u'].dtype.kind in ['i'] and df['v'].dtype.kind in ['i']:
-        def m(a):
-            return a
-    else:
-        # Map nodes to integers
-        ud = {a: i for i, a in enumerate(us)}
-        def m(a):
-            return ud[a]
+    if n == 0:
+        return NodeCollection()
 
-    # Prepare input
-    cdef vector[pair[int, pair[int, int]]] inp
-    for a, b, ts in df.itertuples(index=False, name=None):
-        inp.push_back(pair[int, pair[int, int]](ts, pair[int, int](m(a), m(b))))
+    cdef const int64_t[::1] ts_v = np.ascontiguousarray(df['ts'].values, dtype=np.int64)
+    cdef const int64_t[::1] us_v = np.ascontiguousarray(codes[:n], dtype=np.int64)
+    cdef const int64_t[::1] vs_v = np.ascontiguousarray(codes[n:], dtype=np.int64)
+    cdef const int64_t *ts_p = &ts_v[0]
+    cdef const int64_t *us_p = &us_v[0]
+    cdef const int64_t *vs_p = &vs_v[0]
+    cdef int64_t n_nodes = len(us), t_at
+    cdef bool c_both = both
+    cdef int n_threads = (1 if n_jobs is None else (0 if n_jobs == -1 else n_jobs))
+    cdef vector[vector[pair[int64_t, double]]] all_times
+    cdef vector[double] all_at
+
+    def m(a):
+        return us.get_loc(a)
 
     if is_interval:
         s, f = t
@@ -50,21 +65,88 @@ def closeness_c(u, t, df, both, detailed, discrete):
     else:
         if discrete:
             def tc(vec, f):
-                return TimeCollection(iter_(vec), instantaneous=f, discrete=True)
+                return TimeArrayCollection(iter_(vec), instantaneous=f, discrete=True)
         else:
             def tc(vec, f):
-                return TimeCollection(continuous_tc(iter_(vec)), instantaneous=f, discrete=False)
+                return TimeArrayCollection(continuous_tc(iter_(vec)), instantaneous=f, discrete=False)
 
     if u is None:
         if t is None:
-            return NodeCollection({u: tc(closeness(inp, m(u), both), detailed) for u in us})
+            with nogil:
+                all_times = closeness_all(ts_p, us_p, vs_p, n, n_nodes, c_both, n_threads)
+            return NodeCollection({u: tc(all_times[x], detailed) for x, u in enumerate(us)})
         else:
-            return NodeCollection({u: closeness_at(inp, m(u), t, both) for u in us})
+            t_at = t
+            with nogil:
+                all_at = closeness_at_all(ts_p, us_p, vs_p, n, n_nodes, t_at, c_both, n_threads)
+            return NodeCollection({u: all_at[x] for x, u in enumerate(us)})
     elif t is None:
-        return tc(closeness(inp, m(u), both), detailed)
+        return tc(closeness(ts_p, us_p, vs_p, n, m(u), both), detailed)
     else:
-        return closeness_at(inp, m(u), t, both)
+        return closeness_at(ts_p, us_p, vs_p, n, m(u), t, both)
 
 def continuous_tc(vec):
     for t, v in vec:
         yield ((t, True), v)
+
+
+cdef class EgoLines:
+    """Links :code:`(u, v, ts)` sorted by time, coded once as integers for all ego computations."""
+    cdef vector[pair[int, pair[int, int]]] inp
+    cdef public dict nodes
+    cdef public list times
+
+    def __init__(self, lines):
+        self.nodes, self.times = dict(), list()
+        for a, b, ts in lines:
+            if not len(self.times) or self.times[-1] != ts:
+                self.times.append(ts)
+            self.inp.push_back(pair[int, pair[int, int]](len(self.times) - 1, pair[int, int](self._code(a), self._code(b))))
+
+    def _code(self, a):
+        return self.nodes.setdefault(a, len(self.nodes))
+
+    def __len__(self):
+        return self.inp.size()
+
+    cdef vector[pair[int, double]] run(self, e, ne, both):
+        # Nodes that do not appear in any link get codes after the known ones
+        cdef int extra = len(self.nodes)
+        cdef vector[int] nev
+        codes = dict()
+        for a in ne:
+            if a not in self.nodes:
+                codes[a] = extra
+                extra += 1
+            nev.push_back(self.nodes.get(a, codes.get(a)))
+        return ego(self.inp, self.nodes.get(e, codes.get(e, extra)), nev, both)
+
+
+def ego_c(e, ne, EgoLines lines, both, detailed, discrete):
+    """C++ wrapped implementation of Ego-Betweeness."""
+    cdef vector[pair[int, double]] vec = lines.run(e, ne, both)
+    times, prev = list(), None
+    for tc, val in vec:
+        t = lines.times[tc]
+        if detailed:
+            times.append((t, val))
+        elif prev is None or prev != val:
+            times.append(((t if discrete else (t, True)), val))
+            prev = val
+    return TimeCollection(times, instantaneous=detailed, discrete=discrete)
+
+
+def ego_at_c(e, ne, EgoLines lines, at, both, detailed, discrete):
+    """C++ wrapped implementation of Ego-Betweeness at a time instant."""
+    cdef vector[pair[int, double]] vec = lines.run(e, ne, both)
+    prev = None
+    for tc, val in vec:
+        time = lines.times[tc]
+        if prev is None and at < time:
+            return .0
+        elif at == time:
+            return val
+        elif prev is not None and at > prev[0] and at < time:
+            return prev[1]
+        prev = (time, val)
+    return (prev[1] if prev is not None else .0)
@@ -2,8 +2,12 @@ cimport cython
 from libcpp.vector cimport vector
 from libcpp.pair cimport pair
 from libcpp cimport bool
+from libc.stdint cimport int64_t
 
-cdef extern from "include/functions.hpp":
-    vector[pair[int, double]] closeness(vector[pair[int, pair[int, int]]] input, int x, bool both);
-    double closeness_at(vector[pair[int, pair[int, int]]] input, int x, int t, bool both);
+cdef extern from "include/functions.hpp" nogil:
+    vector[pair[int64_t, double]] closeness(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, bool both);
+    double closeness_at(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, int64_t t, bool both);
+    vector[vector[pair[int64_t, double]]] closeness_all(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t n_nodes, bool both, int n_threads);
+    vector[double] closeness_at_all(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t n_nodes, int64_t t, bool both, int n_threads);
+    vector[pair[int, double]] ego(const vector[pair[int, pair[int, int]]]& input, int x, const vector[int]& ne, bool both);
 
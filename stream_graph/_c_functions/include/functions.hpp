@@ -2,9 +2,13 @@
 #define FUNCTIONS_H_
 
 #include <vector>
+#include <cstdint>
 using namespace std;
 
-vector<pair<int, double>> closeness(vector<pair<int, pair<int,int>>> input, int x, bool both);
-double closeness_at(vector<pair<int, pair<int,int>>> input, int x, int t, bool both);
+vector<pair<int64_t, double>> closeness(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, bool both);
+double closeness_at(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, int64_t t, bool both);
+vector<vector<pair<int64_t, double>>> closeness_all(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t n_nodes, bool both, int n_threads);
+vector<double> closeness_at_all(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t n_nodes, int64_t t, bool both, int n_threads);
+vector<pair<int, double>> ego(const vector<pair<int, pair<int,int>>> &input, int x, const vector<int> &ne, bool both);
 
 #endif
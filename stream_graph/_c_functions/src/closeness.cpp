@@ -19,12 +19,15 @@
 #include <stdlib.h>
 #include <queue>
 #include <iostream>
+#include <thread>
+#include <atomic>
+#include <algorithm>
 
 
 using namespace std;
 
 
-int binary_search(vector<int> v,int value){
+int binary_search(const vector<int64_t> &v, int64_t value){
 	int max =  v.size() - 1;
 	int min = 0;
 	int m = 0;
@@ -65,22 +68,22 @@ int binary_search(vector<int> v,int value){
 }
 
 
-pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int,int>>> input, int x){
-	long cur_start_time = -1 ,prev_ts =-1 ,start_time = -1 ,t = -1;
+pair<vector<int64_t>, vector<double>> closeness_times_both(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x){
+	int64_t cur_start_time = -1 ,prev_ts =-1 ,start_time = -1 ,t = -1;
 	int u,v;
 
-	map<int,vector<pair<long,long > > > reachable_from_at = map<int,std::vector<pair<long,long > > >();
+	map<int,vector<pair<int64_t,int64_t > > > reachable_from_at = map<int,std::vector<pair<int64_t,int64_t > > >();
 	vector<double> cum_closeness;
-	vector<int> time_closeness = vector<int>();
-    auto it = input.begin();
+	vector<int64_t> time_closeness = vector<int64_t>();
+    int64_t row = 0;
 
-	while (cur_start_time == -1 && it != input.end()){
-        t = it->first;
-        u = it->second.first;
-        v = it->second.second;
+	while (cur_start_time == -1 && row < n){
+        t = ts[row];
+        u = us[row];
+        v = vs[row];
 		if(u == x || v == x){
 			cur_start_time = t;
-			vector<pair<long,long > > list = vector<pair <long,long> >();
+			vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 			if (u == x){
 				list.push_back(make_pair(t,t));
 				reachable_from_at[v] = list;
@@ -93,7 +96,7 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 			time_closeness.push_back(t);
 			cum_closeness.push_back(0.0);
 		}
-		++it;
+		++row;
 	}
 
 	for(int i = 0 ; i < cum_closeness.size() ; i++){
@@ -102,10 +105,10 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 		}
 	}
 
-	for(;it != input.end(); ++it){
-        t = it->first;
-        u = it->second.first;
-        v = it->second.second;
+	for(; row < n; ++row){
+        t = ts[row];
+        u = us[row];
+        v = vs[row];
 
 		if(t != time_closeness.back()){
 			time_closeness.push_back(t);
@@ -117,13 +120,13 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 				v = u;
 				u = x;
 			}	
-			map<int,vector<pair<long,long > > >::iterator it;
+			map<int,vector<pair<int64_t,int64_t > > >::iterator it;
 			it = reachable_from_at.find(v);
 			if(it != reachable_from_at.end()){
-				vector<pair<long,long > > list = vector<pair <long,long> >();
+				vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 				list = it->second;
 				prev_ts = list.back().first;
-				vector<pair<long,long > > tmp = vector<pair <long,long> >();
+				vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 				for(int i = 0 ; i < list.size() ; i++){
 					if(list[i].second < t){
 						tmp.push_back(list[i]);
@@ -133,7 +136,7 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 				reachable_from_at[v] = tmp;
 			}else{
 				prev_ts = -1;
-				vector<pair<long,long > > list = vector<pair <long,long> >();
+				vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 				list.push_back(make_pair(t,t));
 				reachable_from_at[v] = list;
 			}
@@ -156,14 +159,14 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 		 /* NEITHER NODES ARE X */
 		 }else{
 			//cout << "neither nodes " << "\n";
-			map<int,vector<pair<long,long > > >::iterator it,it2;
+			map<int,vector<pair<int64_t,int64_t > > >::iterator it,it2;
 			it = reachable_from_at.find(u);
 			it2 = reachable_from_at.find(v);
 			if(it != reachable_from_at.end()){
 				if(it2 != reachable_from_at.end()){
-					vector<pair<long,long > > lu = vector<pair <long,long> >();
-					vector<pair<long,long > > list = vector<pair <long,long> >();
-					vector<pair<long,long > > list2 = vector<pair <long,long> >();
+					vector<pair<int64_t,int64_t > > lu = vector<pair <int64_t,int64_t> >();
+					vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
+					vector<pair<int64_t,int64_t > > list2 = vector<pair <int64_t,int64_t> >();
 
 					list = it->second;
 					for(int i = 0 ; i < list.size() ; i++){
@@ -174,7 +177,7 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 
 					if(lu.size() > 0){
 						int start_time_index = binary_search(time_closeness,it2->second.back().first)+1;
-						long start_time_value = time_closeness[start_time_index];
+						int64_t start_time_value = time_closeness[start_time_index];
 						
 						while(start_time_value <= lu.back().first){
 				            //cout << "1. cum_closeness[start_time_index=" << start_time_index << "] before" << cum_closeness[start_time_index] << "\n";
@@ -184,7 +187,7 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 							start_time_value = time_closeness[start_time_index];
 						}
 
-						vector<pair<long,long > > tmp = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 						list = it2->second;
 						for(int i = 0 ; i < list.size() ; i++){
 							if(list[i].second  < t){
@@ -192,12 +195,12 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 							}
 						}
 						tmp.push_back(make_pair(lu.back().first,t));
-						list = vector<pair<long,long >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
+						list = vector<pair<int64_t,int64_t >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
 						reachable_from_at[v] = list;
 					
 					}else{
-						vector<pair<long,long > > lv = vector<pair <long,long> >();
-						vector<pair<long,long > > list = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > lv = vector<pair <int64_t,int64_t> >();
+						vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 						list = it2->second;
 						for(int i = 0 ; i < list.size() ; i++){
 							if(list[i].first > it->second.back().first && list[i].second < t){
@@ -206,7 +209,7 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 						}
 						if(lv.size() > 0){
 							int start_time_index = binary_search(time_closeness,it->second.back().first)+1;
-							long start_time_value = time_closeness[start_time_index];
+							int64_t start_time_value = time_closeness[start_time_index];
 							while(start_time_value <= lv.back().first){
 	    			            //cout << "2. cum_closeness[start_time_index=" << start_time_index <<"] before" << cum_closeness[start_time_index] << "\n";
 								cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
@@ -214,7 +217,7 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 								start_time_index++;
 								start_time_value = time_closeness[start_time_index];
 							}	
-							vector<pair<long,long > > tmp = vector<pair <long,long> >();
+							vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 							list = it->second;
 							for(int i = 0 ; i < list.size() ; i++){
 								if(list[i].second  < t){
@@ -222,15 +225,15 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 								}
 							}
 							tmp.push_back(make_pair(lv.back().first,t));
-							list = vector<pair<long,long >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
+							list = vector<pair<int64_t,int64_t >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
 							reachable_from_at[u] = list;
 						}else{
 							continue;
 						}
 					}
 				}else{
-					vector<pair<long,long > > lu = vector<pair <long,long> >();
-					vector<pair<long,long > > list = vector<pair <long,long> >();
+					vector<pair<int64_t,int64_t > > lu = vector<pair <int64_t,int64_t> >();
+					vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 					list = it->second;
 					for(int i = 0 ; i < list.size() ; i++){
 						if(list[i].second < t){
@@ -238,11 +241,11 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 						}
 					}
 					if(lu.size() > 0){
-						vector<pair<long,long > > tmp = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 						tmp.push_back(make_pair(lu.back().first,t));
 						reachable_from_at[v] = tmp;
 						int start_time_index = 0;
-						long start_time_value = time_closeness[start_time_index];
+						int64_t start_time_value = time_closeness[start_time_index];
 						while(start_time_value <= lu.back().first){
     			            //cout << "3. cum_closeness[start_time_index=" << start_time_index <<"] before" << cum_closeness[start_time_index] << "\n";
     						cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
@@ -253,8 +256,8 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 					}
 				}
 			}else if (it2 != reachable_from_at.end()){
-						vector<pair<long,long > > lv = vector<pair <long,long> >();
-						vector<pair<long,long > > list = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > lv = vector<pair <int64_t,int64_t> >();
+						vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 						list = it2->second;
 						for(int i = 0 ; i < list.size() ; i++){
 							if(list[i].second < t){
@@ -262,11 +265,11 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 							}
 						}
 						if(lv.size() > 0){
-							vector<pair<long,long > > tmp = vector<pair <long,long> >();
+							vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 							tmp.push_back(make_pair(lv.back().first,t));
 							reachable_from_at[u] = tmp;
 							int start_time_index = 0;
-							long start_time_value = time_closeness[start_time_index];
+							int64_t start_time_value = time_closeness[start_time_index];
 							while(start_time_value <= lv.back().first){
         			            //cout << "4. cum_closeness[start_time_index=" << start_time_index <<"] before" << cum_closeness[start_time_index] << "\n";
 								cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
@@ -284,23 +287,23 @@ pair<vector<int>, vector<double>> closeness_times_both(vector<pair<int, pair<int
 }
 
 
-pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,int>>> input, int x){
-	long cur_start_time = -1 ,prev_ts =-1 ,start_time = -1 ,t = -1;
+pair<vector<int64_t>, vector<double>> closeness_times_out(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x){
+	int64_t cur_start_time = -1 ,prev_ts =-1 ,start_time = -1 ,t = -1;
 	int u,v;
 
-	map<int,vector<pair<long,long > > > reachable_from_at = map<int,std::vector<pair<long,long > > >();
+	map<int,vector<pair<int64_t,int64_t > > > reachable_from_at = map<int,std::vector<pair<int64_t,int64_t > > >();
 	vector<double> cum_closeness;
-	vector<int> time_closeness = vector<int>();
-    auto it = input.begin();
+	vector<int64_t> time_closeness = vector<int64_t>();
+    int64_t row = 0;
 
-	while (cur_start_time == -1 && it != input.end()){
-        t = it->first;
-        u = it->second.first;
-        v = it->second.second;
+	while (cur_start_time == -1 && row < n){
+        t = ts[row];
+        u = us[row];
+        v = vs[row];
         
 		if(u == x || v == x){
 			cur_start_time = t;
-			vector<pair<long,long > > list = vector<pair <long,long> >();
+			vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 			if (u == x){
 				list.push_back(make_pair(t,t));
 				reachable_from_at[v] = list;
@@ -313,7 +316,7 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 			time_closeness.push_back(t);
 			cum_closeness.push_back(0.0);
 		}
-		++it;
+		++row;
 	}
 
 	for(int i = 0 ; i < cum_closeness.size() ; i++){
@@ -322,10 +325,10 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 		}
 	}
 
-	for(;it != input.end(); ++it){
-        t = it->first;
-        u = it->second.first;
-        v = it->second.second;
+	for(; row < n; ++row){
+        t = ts[row];
+        u = us[row];
+        v = vs[row];
 		if(t != time_closeness.back()){
 			time_closeness.push_back(t);
 			cum_closeness.push_back(0.0);
@@ -336,13 +339,13 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 				v = u;
 				u = x;
 			}	
-			map<int,vector<pair<long,long > > >::iterator it;
+			map<int,vector<pair<int64_t,int64_t > > >::iterator it;
 			it = reachable_from_at.find(v);
 			if(it != reachable_from_at.end()){
-				vector<pair<long,long > > list = vector<pair <long,long> >();
+				vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 				list = it->second;
 				prev_ts = list.back().first;
-				vector<pair<long,long > > tmp = vector<pair <long,long> >();
+				vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 				for(int i = 0 ; i < list.size() ; i++){
 					if(list[i].second < t){
 						tmp.push_back(list[i]);
@@ -352,7 +355,7 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 				reachable_from_at[v] = tmp;
 			}else{
 				prev_ts = -1;
-				vector<pair<long,long > > list = vector<pair <long,long> >();
+				vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 				list.push_back(make_pair(t,t));
 				reachable_from_at[v] = list;
 			}
@@ -373,14 +376,14 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 		/*NEITHER NODES ARE X*/
 		 }else{
 			// cout << "neither nodes " << "\n";
-			map<int,vector<pair<long,long > > >::iterator it,it2;
+			map<int,vector<pair<int64_t,int64_t > > >::iterator it,it2;
 			it = reachable_from_at.find(u);
 			it2 = reachable_from_at.find(v);
 			if(it != reachable_from_at.end()){
 				if(it2 != reachable_from_at.end()){
-					vector<pair<long,long > > lu = vector<pair <long,long> >();
-					vector<pair<long,long > > list = vector<pair <long,long> >();
-					vector<pair<long,long > > list2 = vector<pair <long,long> >();
+					vector<pair<int64_t,int64_t > > lu = vector<pair <int64_t,int64_t> >();
+					vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
+					vector<pair<int64_t,int64_t > > list2 = vector<pair <int64_t,int64_t> >();
 
 					list = it->second;
 					for(int i = 0 ; i < list.size() ; i++){
@@ -391,7 +394,7 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 
 					if(lu.size() > 0){
 						int start_time_index = binary_search(time_closeness,it2->second.back().first)+1;
-						long start_time_value = time_closeness[start_time_index];
+						int64_t start_time_value = time_closeness[start_time_index];
 						
 						while(start_time_value <= lu.back().first){
 							cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
@@ -399,7 +402,7 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 							start_time_value = time_closeness[start_time_index];
 						}
 
-						vector<pair<long,long > > tmp = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 						list = it2->second;
 						for(int i = 0 ; i < list.size() ; i++){
 							if(list[i].second  < t){
@@ -407,12 +410,12 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 							}
 						}
 						tmp.push_back(make_pair(lu.back().first,t));
-						list = vector<pair<long,long >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
+						list = vector<pair<int64_t,int64_t >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
 						reachable_from_at[v] = list;
 					
 					}else{
-						vector<pair<long,long > > lv = vector<pair <long,long> >();
-						vector<pair<long,long > > list = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > lv = vector<pair <int64_t,int64_t> >();
+						vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 						list = it2->second;
 						for(int i = 0 ; i < list.size() ; i++){
 							if(list[i].first > it->second.back().first && list[i].second < t){
@@ -421,13 +424,13 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 						}
 						if(lv.size() > 0){
 							int start_time_index = binary_search(time_closeness,it->second.back().first)+1;
-							long start_time_value = time_closeness[start_time_index];
+							int64_t start_time_value = time_closeness[start_time_index];
 							while(start_time_value <= lv.back().first){
 								cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
 								start_time_index++;
 								start_time_value = time_closeness[start_time_index];
 							}	
-							vector<pair<long,long > > tmp = vector<pair <long,long> >();
+							vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 							list = it->second;
 							for(int i = 0 ; i < list.size() ; i++){
 								if(list[i].second  < t){
@@ -435,15 +438,15 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 								}
 							}
 							tmp.push_back(make_pair(lv.back().first,t));
-							list = vector<pair<long,long >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
+							list = vector<pair<int64_t,int64_t >> (tmp.end() - min((int)tmp.size(),2),tmp.end());
 							reachable_from_at[u] = list;
 						}else{
 							continue;
 						}
 					}
 				}else{
-					vector<pair<long,long > > lu = vector<pair <long,long> >();
-					vector<pair<long,long > > list = vector<pair <long,long> >();
+					vector<pair<int64_t,int64_t > > lu = vector<pair <int64_t,int64_t> >();
+					vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 					list = it->second;
 					for(int i = 0 ; i < list.size() ; i++){
 						if(list[i].second < t){
@@ -451,11 +454,11 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 						}
 					}
 					if(lu.size() > 0){
-						vector<pair<long,long > > tmp = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 						tmp.push_back(make_pair(lu.back().first,t));
 						reachable_from_at[v] = tmp;
 						int start_time_index = 0;
-						long start_time_value = time_closeness[start_time_index];
+						int64_t start_time_value = time_closeness[start_time_index];
 						while(start_time_value <= lu.back().first){
 							cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
 							start_time_index++;
@@ -464,8 +467,8 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 					}
 				}
 			}else if (it2 != reachable_from_at.end()){
-						vector<pair<long,long > > lv = vector<pair <long,long> >();
-						vector<pair<long,long > > list = vector<pair <long,long> >();
+						vector<pair<int64_t,int64_t > > lv = vector<pair <int64_t,int64_t> >();
+						vector<pair<int64_t,int64_t > > list = vector<pair <int64_t,int64_t> >();
 						list = it2->second;
 						for(int i = 0 ; i < list.size() ; i++){
 							if(list[i].second < t){
@@ -473,11 +476,11 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
 							}
 						}
 						if(lv.size() > 0){
-							vector<pair<long,long > > tmp = vector<pair <long,long> >();
+							vector<pair<int64_t,int64_t > > tmp = vector<pair <int64_t,int64_t> >();
 							tmp.push_back(make_pair(lv.back().first,t));
 							reachable_from_at[u] = tmp;
 							int start_time_index = 0;
-							long start_time_value = time_closeness[start_time_index];
+							int64_t start_time_value = time_closeness[start_time_index];
 							while(start_time_value <= lv.back().first){
 								cum_closeness[start_time_index]+= 1.0/(t - start_time_value);
 								start_time_index++;
@@ -492,31 +495,73 @@ pair<vector<int>, vector<double>> closeness_times_out(vector<pair<int, pair<int,
     return make_pair(time_closeness, cum_closeness);
 }
 
-pair<vector<int>, vector<double>> closeness_times(vector<pair<int, pair<int,int>>> input, int x, bool both){
+pair<vector<int64_t>, vector<double>> closeness_times(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, bool both){
     if(both){
-        return closeness_times_both(input, x);
+        return closeness_times_both(ts, us, vs, n, x);
     }else{
-        return closeness_times_out(input, x);
+        return closeness_times_out(ts, us, vs, n, x);
     }
 }
 
-double closeness_at(vector<pair<int, pair<int,int>>> input, int x, int t, bool both){
-    pair<vector<int>, vector<double>> obj = closeness_times(input, x, both);
-    vector<int> time_closeness = obj.first;
-    vector<double> cum_closeness = obj.second;
+double closeness_at(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, int64_t t, bool both){
+    pair<vector<int64_t>, vector<double>> obj = closeness_times(ts, us, vs, n, x, both);
+    const vector<int64_t> &time_closeness = obj.first;
+    const vector<double> &cum_closeness = obj.second;
 
     int idx = binary_search(time_closeness, t);
     return cum_closeness[idx];
 }
 
-vector<pair<int, double>> closeness(vector<pair<int, pair<int,int>>> input, int x, bool both){
-    pair<vector<int>, vector<double>> obj = closeness_times(input, x, both);
-    vector<int> time_closeness = obj.first;
-    vector<double> cum_closeness = obj.second;
-    vector<pair<int, double>> result = vector<pair<int, double>>();
+vector<pair<int64_t, double>> closeness(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t x, bool both){
+    pair<vector<int64_t>, vector<double>> obj = closeness_times(ts, us, vs, n, x, both);
+    const vector<int64_t> &time_closeness = obj.first;
+    const vector<double> &cum_closeness = obj.second;
+    vector<pair<int64_t, double>> result = vector<pair<int64_t, double>>();
     
   	for(int i = 0 ; i < cum_closeness.size() ; i++){
 		result.push_back(make_pair(time_closeness[i], cum_closeness[i]));
 	}
 	return result;
 }
+
+
+/* Run a worker on a number of threads, or on all hardware threads if n_threads <= 0 */
+template<class F>
+void run_threads(F worker, int n_threads, int64_t n_tasks){
+    if(n_threads <= 0){
+        n_threads = thread::hardware_concurrency();
+    }
+    n_threads = (int) min<int64_t>(max(n_threads, 1), max<int64_t>(n_tasks, 1));
+    vector<thread> threads = vector<thread>();
+    for(int i = 1; i < n_threads; i++){
+        threads.push_back(thread(worker));
+    }
+    worker();
+    for(int i = 0; i < threads.size(); i++){
+        threads[i].join();
+    }
+}
+
+vector<vector<pair<int64_t, double>>> closeness_all(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t n_nodes, bool both, int n_threads){
+    vector<vector<pair<int64_t, double>>> result = vector<vector<pair<int64_t, double>>>(n_nodes);
+    atomic<int64_t> next(0);
+    auto worker = [&](){
+        for(int64_t x = next++; x < n_nodes; x = next++){
+            result[x] = closeness(ts, us, vs, n, x, both);
+        }
+    };
+    run_threads(worker, n_threads, n_nodes);
+    return result;
+}
+
+vector<double> closeness_at_all(const int64_t *ts, const int64_t *us, const int64_t *vs, int64_t n, int64_t n_nodes, int64_t t, bool both, int n_threads){
+    vector<double> result = vector<double>(n_nodes);
+    atomic<int64_t> next(0);
+    auto worker = [&](){
+        for(int64_t x = next++; x < n_nodes; x = next++){
+            result[x] = closeness_at(ts, us, vs, n, x, t, both);
+        }
+    };
+    run_threads(worker, n_threads, n_nodes);
+    return result;
+}
@@ -0,0 +1,153 @@
+/* Ego-Betweeness
+ * Author: Ioannis Siglidis <y.siglidis@gmail.com>
+ *
+ * A port of stream_graph.base.functions.ego on integer coded nodes and times,
+ * where the dictionaries indexed by pairs of nodes are replaced by flat arrays
+ * over the ego-network of x.
+ */
+#include "../include/functions.hpp"
+
+#include <vector>
+#include <algorithm>
+#include <iterator>
+
+using namespace std;
+
+
+vector<pair<int, double>> ego(const vector<pair<int, pair<int,int>>> &input, int x, const vector<int> &ne, bool both){
+    vector<pair<int, double>> result = vector<pair<int, double>>();
+    int n = input.size();
+    if(n == 0){
+        return result;
+    }
+
+    /* Map the nodes of the ego-network to local indices, x being the last one */
+    int max_code = x;
+    for(int i = 0; i < n; i++){
+        max_code = max(max_code, max(input[i].second.first, input[i].second.second));
+    }
+    for(int i = 0; i < ne.size(); i++){
+        max_code = max(max_code, ne[i]);
+    }
+    vector<int> local = vector<int>(max_code + 1, -1);
+    vector<int> ne_local = vector<int>();
+    int k = 0;
+    for(int i = 0; i < ne.size(); i++){
+        if(local[ne[i]] == -1){
+            local[ne[i]] = k++;
+        }
+        ne_local.push_back(local[ne[i]]);
+    }
+    if(local[x] == -1){
+        local[x] = k++;
+    }
+    int e = local[x];
+
+    /* info: the last time of a link, lines: the links of the current time, -2 if absent */
+    vector<int> info = vector<int>(k * k, -1);
+    vector<int> lines = vector<int>(k * k, -2);
+    vector<int> touched = vector<int>();
+    vector<int> paths_time = vector<int>(k * k, 0);
+    vector<char> paths_exist = vector<char>(k * k, 0);
+    vector<vector<int>> paths = vector<vector<int>>(k * k);
+    vector<int> Q = vector<int>(), merged = vector<int>();
+
+    int index = 0, t = 0, time = input[0].first;
+    bool quiet, prev_quiet = false;
+    double val = 0.0;
+    while(index < n - 1){
+        /* get all links of time stamp */
+        quiet = true;
+        while(index < n - 1){
+            t = input[index].first;
+            int a = input[index].second.first, b = input[index].second.second;
+            index++;
+            if(local[a] != -1 && local[b] != -1){
+                int la = local[a], lb = local[b];
+                if(lines[la * k + lb] == -2){
+                    touched.push_back(la * k + lb);
+                }
+                lines[la * k + lb] = t;
+                if(both){
+                    if(lines[lb * k + la] == -2){
+                        touched.push_back(lb * k + la);
+                    }
+                    lines[lb * k + la] = t;
+                }
+                quiet = false;
+            }
+            if(t != time){
+                break;
+            }
+        }
+
+        /* Without new links the paths are stable after one time stamp */
+        if(!(quiet && prev_quiet)){
+            val = 0.0;
+            for(int i = 0; i < ne_local.size(); i++){
+                int u = ne_local[i];
+                for(int j = 0; j < ne_local.size(); j++){
+                    int v = ne_local[j];
+                    if(u == v){
+                        continue;
+                    }
+                    int p = u * k + v;
+                    if(lines[p] == -2){
+                        int news = info[p];
+                        Q.clear();
+                        for(int y = 0; y < k; y++){
+                            if(y == u || y == v){
+                                continue;
+                            }
+                            int ux = info[u * k + y];
+                            int xv = (lines[y * k + v] != -2 ? lines[y * k + v] : info[y * k + v]);
+                            if(ux != -1 && xv != -1 && ux < xv){
+                                if(ux == news){
+                                    Q.push_back(y);
+                                }
+                                if(ux > news){
+                                    Q.clear();
+                                    Q.push_back(y);
+                                    news = ux;
+                                }
+                            }
+                        }
+
+                        if(paths_exist[p]){
+                            if(paths_time[p] == news){
+                                merged.clear();
+                                set_union(paths[p].begin(), paths[p].end(), Q.begin(), Q.end(), back_inserter(merged));
+                                paths[p].swap(merged);
+                            }else if(paths_time[p] < news){
+                                paths_time[p] = news;
+                                paths[p] = Q;
+                            }
+                        }else{
+                            paths_exist[p] = 1;
+                            paths_time[p] = news;
+                            paths[p] = Q;
+                        }
+
+                        if(binary_search(paths[p].begin(), paths[p].end(), e)){
+                            val += 1.0 / paths[p].size();
+                        }
+                    }else{
+                        paths_exist[p] = 1;
+                        paths_time[p] = t;
+                        paths[p] = vector<int>(1, u);
+                    }
+                }
+            }
+        }
+        result.push_back(make_pair(time, val));
+
+        for(int i = 0; i < touched.size(); i++){
+            info[touched[i]] = lines[touched[i]];
+            lines[touched[i]] = -2;
+        }
+        touched.clear();
+        time = input[index].first;
+        prev_quiet = quiet;
+    }
+    return result;
+}
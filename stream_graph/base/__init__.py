@@ -6,10 +6,14 @@ from .time_set_df import TimeSetDF  # noqa
 from .temporal_node_set_b import TemporalNodeSetB  # noqa
 from .itemporal_link_set_df import ITemporalLinkSetDF  # noqa
 from .temporal_link_set_df import TemporalLinkSetDF  # noqa
+from .lazy_temporal_link_set_df import LazyTemporalLinkSetDF  # noqa
+from .temporal_link_set_builder import TemporalLinkSetBuilder  # noqa
 from .temporal_node_set_df import TemporalNodeSetDF  # noqa
 from .itemporal_node_set_df import ITemporalNodeSetDF  # noqa
 from .itemporal_link_set_df import ITemporalLinkSetDF  # noqa
 from .graph import Graph  # noqa
 from .stream_graph import StreamGraph  # noqa
+from .node_dictionary import NodeDictionary  # noqa
+from .readers import read_link_stream  # noqa
 
 __version__ = '0.2'
@@ -306,7 +306,7 @@ def issuper_no_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = cache_issuper_constructor()
-    for ev in events(dfa, dfb, issuper_order, reference=True):
+    for ev in events(dfa, dfb, issuper_order, reference=True, lazy=True):
         if update_cache_issuper(cache, ev[:4]):
             return False
         if ev[1] > t_max:
@@ -319,7 +319,7 @@ def issuper_by_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = defaultdict(cache_issuper_constructor)
-    for event in events(dfa, dfb, issuper_order, True):
+    for event in events(dfa, dfb, issuper_order, True, lazy=True):
         ev, key = event[:4], event[4:]
         if update_cache_issuper(cache[key], ev):
             return False
@@ -348,7 +348,7 @@ def nonempty_intersection_no_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = cache_nonempty_intersection_constructor()
-    for ev in events(dfa, dfb, nei_order, reference=True):
+    for ev in events(dfa, dfb, nei_order, reference=True, lazy=True):
         if update_cache_nonempty_intersection(cache, ev):
             return True
         if ev[1] > t_max:
@@ -361,7 +361,7 @@ def nonempty_intersection_by_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = defaultdict(cache_nonempty_intersection_constructor)
-    for event in events(dfa, dfb, nei_order, reference=True):
+    for event in events(dfa, dfb, nei_order, reference=True, lazy=True):
         ev, key = event[:4], event[4:]
         if update_cache_nonempty_intersection(cache[key], ev):
             return True
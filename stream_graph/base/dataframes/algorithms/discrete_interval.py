@@ -284,7 +284,7 @@ def issuper_no_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = [None]
-    for ev in events(dfa, dfb, issuper_order, reference=True):
+    for ev in events(dfa, dfb, issuper_order, reference=True, lazy=True):
         if update_cache_issuper(cache, ev[:3]):
             return False
         if ev[1] > t_max:
@@ -297,7 +297,7 @@ def issuper_by_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = defaultdict(issuper_constructor)
-    for event in events(dfa, dfb, issuper_order, reference=True):
+    for event in events(dfa, dfb, issuper_order, reference=True, lazy=True):
         ev, key = event[:3], event[3:]
         if update_cache_issuper(cache[key], ev):
             return False
@@ -326,7 +326,7 @@ def nonempty_intersection_no_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = nonempty_intersection_constructor()
-    for ev in events(dfa, dfb, nonempty_intersection_order, reference=True):
+    for ev in events(dfa, dfb, nonempty_intersection_order, reference=True, lazy=True):
         if update_cache_nonempty_intersection(cache, ev):
             return True
         if ev[1] > t_max:
@@ -339,7 +339,7 @@ def nonempty_intersection_by_key(dfa, dfb):
     t_max = dfb.tf.max()
 
     cache = defaultdict(nonempty_intersection_constructor)
-    for event in events(dfa, dfb, nonempty_intersection_order, reference=True):
+    for event in events(dfa, dfb, nonempty_intersection_order, reference=True, lazy=True):
         ev, key = event[:3], event[3:]
         if update_cache_nonempty_intersection(cache[key], ev):
             return True
@@ -1,8 +1,14 @@
 from itertools import chain
 
+import numpy as np
+
+from .orderings import sort_events, stream_events, flag_ranks, presorted
+
 
 def events_uni(a, key, weights=False):
-    return sorted(events_uni_ns(a, weights=weights), key=key)
+    evs = list(events_uni_ns(a, weights=weights))
+    times, flags = event_fields([a])
+    return sort_events(evs, key, times, flags, 0)
 
 
 def events_uni_ns(a, weights):
@@ -13,8 +19,23 @@ def events_uni_ns(a, weights):
         return (ev for it in a.itertuples(bounds=True) for ev in [(it[-4], it[-2], True) + it[:-4], (it[-3], it[-1], False) + it[:-4]])
 
 
-def events(a, b, key, reference=False, weights=False):
-    return sorted(events_ns(a, b, reference=reference, weights=weights), key=key)
+def events(a, b, key, reference=False, weights=False, lazy=False):
+    if lazy and presorted([a, b]) and flag_ranks(key, 2 + int(reference), int(reference)) is not None:
+        return stream_events([a, b], lambda p: list(events_ns(p[0], p[1], reference=reference, weights=weights)),
+                             lambda p: event_fields(p, reference), key, int(reference))
+    evs = list(events_ns(a, b, reference=reference, weights=weights))
+    times, flags = event_fields([a, b], reference)
+    return sort_events(evs, key, times, flags, int(reference))
+
+
+def event_fields(dfs, reference=False):
+    """The times and flags (reference, closed, start) of the events of :code:`events_ns`, in the same order."""
+    times = np.concatenate([np.column_stack([df['ts'].values, df['tf'].values]).ravel() for df in dfs])
+    closed = np.concatenate([np.column_stack([df['s'].values, df['f'].values]).ravel() for df in dfs]).astype(bool)
+    start = np.tile([True, False], len(times) // 2)
+    if reference:
+        return times, [np.repeat([True, False], [2 * len(df) for df in dfs]), closed, start]
+    return times, [closed, start]
 
 
 def events_ns(a, b, reference=False, weights=False):
@@ -1,4 +1,4 @@
-from six import iteritems, viewkeys
+from six import iteritems, viewkeys, string_types
 from collections import defaultdict
 
 
@@ -67,3 +67,26 @@ def print_by_key(ks, ds, iter_, map_):
     for it in iter_:
         d[it[ks]].append(it[ds])
     print({k: map_(d[k]) for k in d.keys()})
+
+
+def mean(ws):
+    ws = list(ws)
+    return sum(ws) / float(len(ws))
+
+
+# Merge functions known by name, that have a vectorized implementation
+REDUCERS = {'sum': sum, 'max': max, 'min': min, 'mean': mean, 'count': len}
+
+
+def reducer_function(merge_function):
+    """The function of a named reducer, or the merge function itself."""
+    if isinstance(merge_function, string_types):
+        return REDUCERS.get(merge_function, merge_function)
+    return merge_function
+
+
+def reducer_name(merge_function):
+    """The name of a merge function that is a known reducer, or None."""
+    for name, f in iteritems(REDUCERS):
+        if f is merge_function:
+            return name
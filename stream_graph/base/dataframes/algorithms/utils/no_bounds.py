@@ -1,15 +1,47 @@
 from itertools import chain
 
+import numpy as np
+import pandas as pd
 
-def events(a, b, key, reference=False, weights=False):
-    return sorted(events_not_sorted(a, b, reference=reference, weights=weights), key=key)
+from .orderings import sort_events, stream_events, flag_ranks, presorted
+
+
+def events(a, b, key, reference=False, weights=False, lazy=False):
+    if lazy and presorted([a, b]) and flag_ranks(key, 1 + int(reference), int(reference)) is not None:
+        return stream_events([a, b], lambda p: list(events_not_sorted(p[0], p[1], reference=reference, weights=weights)),
+                             lambda p: event_fields(p, reference), key, int(reference))
+    evs = list(events_not_sorted(a, b, reference=reference, weights=weights))
+    times, flags = event_fields([a, b], reference)
+    return sort_events(evs, key, times, flags, int(reference))
 
 
 def events_uni(df, key, weights=False):
+    evs = list(events_uni_not_sorted(df, weights=weights))
+    times, flags = event_fields([df])
+    return sort_events(evs, key, times, flags, 0)
+
+
+def events_uni_not_sorted(df, weights=False):
     if weights:
-        return sorted((ev for it in df.itertuples(name=None, index=False, weights=True) for ev in [(it[-3], True, it[-1]) + it[:-3], (it[-2], False, it[-1]) + it[:-3]]), key=key)
+        return (ev for it in df.itertuples(name=None, index=False, weights=True) for ev in [(it[-3], True, it[-1]) + it[:-3], (it[-2], False, it[-1]) + it[:-3]])
     else:
-        return sorted((ev for it in df.itertuples(name=None, index=False) for ev in [(it[-2], True) + it[:-2], (it[-1], False) + it[:-2]]), key=key)
+        return (ev for it in df.itertuples(name=None, index=False) for ev in [(it[-2], True) + it[:-2], (it[-1], False) + it[:-2]])
+
+
+def event_fields(dfs, reference=False):
+    """The times and flags (reference, start) of the events of :code:`events_not_sorted`, in the same order.
+
+    Only plain DataFrames ending with the columns ts, tf are supported, as others are iterated in their column order:
+    for any other the times are None.
+
+    """
+    if any(type(df) is pd.DataFrame and list(df.columns[-2:]) != ['ts', 'tf'] for df in dfs):
+        return None, []
+    times = np.concatenate([np.column_stack([df['ts'].values, df['tf'].values]).ravel() for df in dfs])
+    start = np.tile([True, False], len(times) // 2)
+    if reference:
+        return times, [np.repeat([True, False], [2 * len(df) for df in dfs]), start]
+    return times, [start]
 
 
 def events_not_sorted(a, b, reference=False, weights=False):
@@ -2,6 +2,9 @@
 from __future__ import print_function
 import inspect
 import sys
+from itertools import chain, product
+
+import numpy as np
 
 
 LIST_BOUNDS = [(a, b, c) for a in range(1, 3) for b in [False, True] for c in [False, True]]
@@ -86,6 +89,154 @@ def key_order_reference(key):
     return print_order_reference(events_sorted(LIST, key=key, reference=True))
 
 
+_RANKS = dict()
+
+
+def flag_ranks(key, n_flags, time_position):
+    """The rank under :code:`key` of every combination of the boolean fields of an event at a same time.
+
+    Events are tuples whose first :code:`n_flags + 1` fields are the time, at :code:`time_position`,
+    and boolean flags (reference, closed, start). The combination of flags :code:`c` is encoded as
+    :math:`\\sum_j c_j 2^j`.
+
+    Returns
+    -------
+    ranks: numpy.ndarray or None
+        None if the key does not order events first by their time and then by their flags only.
+
+    """
+    cache_key = (key, n_flags, time_position)
+    if cache_key not in _RANKS:
+        ranks = None
+        try:
+            keys = []
+            for flags in product([False, True], repeat=n_flags):
+                flags = list(reversed(flags))
+                for t in [0, 1]:
+                    k = key(tuple(flags[:time_position] + [t] + flags[time_position:]))
+                    if k[0] != t:
+                        raise ValueError
+                keys.append(tuple(k[1:]))
+            distinct = sorted(set(keys))
+            ranks = np.array([distinct.index(k) for k in keys], dtype=np.int8)
+        except (IndexError, TypeError, ValueError):
+            pass
+        _RANKS[cache_key] = ranks
+    return _RANKS[cache_key]
+
+
+def presorted(dfs):
+    """If all DataFrames are known, from their :code:`sorted_by` invariant, to be sorted by starting time."""
+    return all((getattr(df, '_sorted_by', None) or [None])[0] == 'ts' for df in dfs)
+
+
+def sort_events(events, key, times, flags, time_position):
+    """Sort a list of events as :code:`sorted(events, key=key)`.
+
+    The events are ordered with a single stable :code:`numpy.lexsort` of their times and of the
+    integer rank of their flags, instead of calling :code:`key` on every event.
+
+    Parameters
+    ----------
+    events: list
+        The events, as tuples.
+
+    key: callable
+        One of the orderings of this module.
+
+    times: numpy.ndarray or None
+        The time of each event. If None the events are sorted with :code:`key`.
+
+    flags: list
+        A boolean array for each flag of the events, in the order of their fields.
+
+    time_position: int
+        The position of the time among the fields of the events.
+
+    Returns
+    -------
+    events: list
+
+    """
+    ranks = flag_ranks(key, len(flags), time_position)
+    if ranks is None or times is None or times.dtype == object or len(events) != len(times):
+        return sorted(events, key=key)
+    order = np.lexsort((ranks[flag_codes(flags, len(times))], times))
+    return [events[i] for i in order]
+
+
+def flag_codes(flags, n):
+    code = np.zeros(n, dtype=np.int8)
+    for j, f in enumerate(flags):
+        code |= np.asarray(f, dtype=np.int8) << j
+    return code
+
+
+def stream_events(dfs, generate, fields, key, time_position, block=2 ** 16):
+    """Generate the events of DataFrames sorted by starting time, as :code:`sorted(events, key=key)`.
+
+    Instead of generating and sorting all events, the operands are consumed as a k-way merge of
+    their sorted starting times, by blocks of about :code:`block` rows. Events up to the last
+    starting time of a block are final: they are sorted and yielded, while later (finishing) events
+    are carried to the next blocks. A loop that stops early only generates the blocks it reads,
+    but a full consumption is slower than :code:`sort_events`: only sweeps that may exit early
+    (:code:`lazy=True` in :code:`events`) use it.
+
+    Parameters
+    ----------
+    dfs: list
+        The operands, sorted by :code:`ts` (see :code:`presorted`).
+
+    generate: callable
+        Given a row slice of each operand, returns the list of their events, as :code:`events_ns`.
+
+    fields: callable
+        Given a row slice of each operand, returns the times and flags of their events, as :code:`event_fields`.
+
+    key: callable
+        One of the orderings of this module, for which :code:`flag_ranks` is not None.
+
+    time_position: int
+        The position of the time among the fields of the events.
+
+    block: int, default=2**16
+
+    Returns
+    -------
+    events: Iterator
+
+    """
+    return chain.from_iterable(_event_blocks(dfs, generate, fields, key, time_position, block))
+
+
+def _event_blocks(dfs, generate, fields, key, time_position, block):
+    times, flags = fields([df[:0] for df in dfs])
+    ranks = flag_ranks(key, len(flags), time_position)
+    starts = [df['ts'].values for df in dfs]
+    offsets = np.cumsum([0] + [2 * len(df) for df in dfs])
+    lo = [0] * len(dfs)
+    events, codes, index = [], np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int64)
+    while True:
+        remaining = [k for k in range(len(dfs)) if lo[k] < len(starts[k])]
+        if not len(remaining):
+            break
+        t = min(starts[k][min(lo[k] + block, len(starts[k])) - 1] for k in remaining)
+        hi = [int(np.searchsorted(s, t, side='right')) for s in starts]
+        parts = [df[l:h] for df, l, h in zip(dfs, lo, hi)]
+        part_times, part_flags = fields(parts)
+        events = events + generate(parts)
+        times = np.concatenate([times, part_times])
+        codes = np.concatenate([codes, ranks[flag_codes(part_flags, len(part_times))]])
+        index = np.concatenate([index] + [np.arange(o + 2 * l, o + 2 * h) for o, l, h in zip(offsets, lo, hi)])
+        lo = hi
+
+        final = times <= t
+        yield [events[i] for i in np.flatnonzero(final)[np.lexsort((index[final], codes[final], times[final]))]]
+        rest = np.flatnonzero(~final)
+        events, times, codes, index = [events[i] for i in rest], times[rest], codes[rest], index[rest]
+    yield [events[i] for i in np.lexsort((index, codes, times))]
+
+
 # NI - NR
 def order_0_n1(k):
     return (k[0], not k[1])
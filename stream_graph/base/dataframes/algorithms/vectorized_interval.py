@@ -0,0 +1,475 @@
+"""Array based sweeps for interval set operations.
+
+Each interval is mapped to a half-open segment ``[lo, hi)`` over coordinates
+``(t, r)``, where ``r = 0`` is the instant ``t`` and ``r = 1`` lies just after it.
+For continuous intervals a closed start maps to ``(ts, 0)``, an open one to ``(ts, 1)``,
+a closed end to ``(tf, 1)`` and an open one to ``(tf, 0)``. For discrete intervals
+``[ts, tf]`` maps to ``[(ts, 0), (tf + 1, 0))``.
+
+All endpoints are sorted at once with :code:`numpy.lexsort` on (key code, t, r) and the
+number of active intervals of each operand is obtained by a cumulative sum, so that set
+operations reduce to selecting and coalescing elementary segments.
+
+"""
+from __future__ import absolute_import
+import numpy as np
+import pandas as pd
+
+
+def key_codes(columns):
+    """Encode a list of equal length key arrays as a single integer code."""
+    code = None
+    for values in columns:
+        c, uniques = pd.factorize(values)
+        if code is None:
+            code = c
+        else:
+            code = pd.factorize(code * len(uniques) + c)[0]
+    return code
+
+
+def _bounds(df, discrete):
+    if discrete:
+        ts, tf = df['ts'].values, df['tf'].values
+        zeros = np.zeros(ts.shape[0], dtype=np.int8)
+        return ts, zeros, tf + 1, zeros
+    else:
+        return (df['ts'].values, (~df['s'].values.astype(bool)).astype(np.int8),
+                df['tf'].values, df['f'].values.astype(np.int8))
+
+
+def sweep(dfs, key_columns, discrete, select, coalesce=True):
+    """Select the maximal intervals whose coverage satisfies a condition.
+
+    Parameters
+    ----------
+    dfs : list of DataFrame
+        The operands. Each should contain all :code:`key_columns` and ts, tf (and s, f if not discrete).
+
+    key_columns : list
+        The columns over which intervals are grouped.
+
+    discrete : Bool
+        Whether the intervals are discrete.
+
+    select : callable
+        Receives an array of shape :code:`(len(dfs), n_segments)` with the number of
+        active intervals of each operand on every elementary segment and returns a boolean mask.
+
+    coalesce : Bool, default=True
+        If False, selected segments are not joined where an interval of some operand
+        ends exactly where another starts.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        With columns :code:`key_columns + ['ts', 'tf']` (and :code:`['s', 'f']` if not discrete).
+
+    """
+    los, los_r, his, his_r, sizes = [], [], [], [], []
+    for df in dfs:
+        lo, lo_r, hi, hi_r = _bounds(df, discrete)
+        los.append(lo)
+        los_r.append(lo_r)
+        his.append(hi)
+        his_r.append(hi_r)
+        sizes.append(lo.shape[0])
+
+    n = sum(sizes)
+    rows = np.arange(n)
+    t = np.concatenate(los + his)
+    r = np.concatenate(los_r + his_r)
+    if len(key_columns):
+        # Encoded node columns that share a dtype stay categorical and are factorized by code
+        keys = [pd.concat([df[c] for df in dfs], ignore_index=True).values for c in key_columns]
+        code = np.tile(key_codes(keys), 2)
+    else:
+        keys = []
+        code = np.zeros(2 * n, dtype=np.int64)
+
+    order = np.lexsort((r, t, code))
+    t, r, code = t[order], r[order], code[order]
+    source = np.tile(rows, 2)[order]
+    operand = np.repeat(np.arange(len(dfs)), sizes)[source]
+    delta = np.where(order < n, 1, -1).astype(np.int32)
+
+    # The coverage after each distinct coordinate is the running sum at the last event that shares it
+    last = np.ones(2 * n, dtype=bool)
+    if n:
+        last[:-1] = (t[1:] != t[:-1]) | (r[1:] != r[:-1]) | (code[1:] != code[:-1])
+    last = np.flatnonzero(last)
+    coverage = np.array([np.cumsum(np.where(operand == i, delta, 0))[last] for i in range(len(dfs))])
+    t, r, source = t[last], r[last], source[last]
+
+    selected = np.asarray(select(coverage), dtype=bool)
+    previous = np.concatenate([[False], selected[:-1]])
+    if not coalesce:
+        # Keep the intervals apart wherever an operand ends and starts at the same coordinate
+        first = np.concatenate([[0], last[:-1] + 1])
+        touch = np.zeros(last.shape[0], dtype=bool)
+        for i in range(len(dfs)):
+            starts = np.add.reduceat(((operand == i) & (delta > 0)).astype(np.int32), first) if n else touch
+            ends = np.add.reduceat(((operand == i) & (delta < 0)).astype(np.int32), first) if n else touch
+            touch |= (starts > 0) & (ends > 0)
+        previous &= ~touch
+    joined = selected & previous
+    start = np.flatnonzero(selected & ~joined)
+    end = np.flatnonzero(selected & ~np.concatenate([joined[1:], [False]])) + 1
+
+    data = {c: k[source[start]] for c, k in zip(key_columns, keys)}
+    if discrete:
+        data['ts'], data['tf'] = t[start], t[end] - 1
+        columns = key_columns + ['ts', 'tf']
+    else:
+        data['ts'], data['tf'] = t[start], t[end]
+        data['s'], data['f'] = r[start] == 0, r[end] == 1
+        columns = key_columns + ['ts', 'tf', 's', 'f']
+    return pd.DataFrame(data, columns=columns)
+
+
+def _any(coverage):
+    return (coverage > 0).any(axis=0)
+
+
+def _all(coverage):
+    return (coverage > 0).all(axis=0)
+
+
+def _first_only(coverage):
+    return (coverage[0] > 0) & (coverage[1] <= 0)
+
+
+def merge(df, key_columns, discrete=False):
+    return sweep([df], key_columns, discrete, _any)
+
+
+def union(dfa, dfb, key_columns, discrete=False):
+    return sweep([dfa, dfb], key_columns, discrete, _any)
+
+
+def intersection(dfa, dfb, key_columns, discrete=False):
+    return sweep([dfa, dfb], key_columns, discrete, _all, coalesce=False)
+
+
+def difference(dfa, dfb, key_columns, discrete=False):
+    return sweep([dfa, dfb], key_columns, discrete, _first_only, coalesce=False)
+
+
+def _measure_bounds(df, discrete):
+    ts, tf = df['ts'].values, df['tf'].values
+    return ts, (tf + 1 if discrete else tf)
+
+
+def intersection_size(dfa, dfb, discrete=False):
+    """The total measure of the pairwise intersections between the intervals of two DataFrames.
+
+    Computed as the sum of the product of the active intervals of each operand over the
+    elementary segments, given by a cumulative sum over the sorted endpoints.
+
+    """
+    (tsa, tfa), (tsb, tfb) = _measure_bounds(dfa, discrete), _measure_bounds(dfb, discrete)
+    if not (len(tsa) and len(tsb)):
+        return 0
+    t = np.concatenate([tsa, tfa, tsb, tfb])
+    na, nb = len(tsa), len(tsb)
+    da = np.concatenate([np.ones(na, dtype=np.int64), -np.ones(na, dtype=np.int64), np.zeros(2 * nb, dtype=np.int64)])
+    db = np.concatenate([np.zeros(2 * na, dtype=np.int64), np.ones(nb, dtype=np.int64), -np.ones(nb, dtype=np.int64)])
+    order = np.argsort(t, kind='mergesort')
+    t, wa, wb = t[order], np.cumsum(da[order]), np.cumsum(db[order])
+    return (wa[:-1] * wb[:-1] * (t[1:] - t[:-1])).sum()
+
+
+def active_measures(df, discrete=False, powers=(1, 2)):
+    """The integrals over time of some powers of the number of active intervals.
+
+    For the power 1 this is the total measure of the intervals and for the power 2 the
+    total measure of their pairwise intersections, all obtained from a single sort.
+
+    """
+    ts, tf = _measure_bounds(df, discrete)
+    if not len(ts):
+        return [0 for _ in powers]
+    t = np.concatenate([ts, tf])
+    delta = np.concatenate([np.ones(len(ts), dtype=np.int64), -np.ones(len(ts), dtype=np.int64)])
+    order = np.argsort(t, kind='mergesort')
+    t, active = t[order], np.cumsum(delta[order])[:-1]
+    dt = t[1:] - t[:-1]
+    return [((active ** p) * dt).sum() for p in powers]
+
+
+def overlapping_pairs(df, discrete=False):
+    """Find the pairs of intervals of a DataFrame that overlap on a non-zero measure.
+
+    Intervals are sorted by their start and each one is joined with the ones that start
+    after it and before it finishes, so that every pair is reported once.
+
+    Returns
+    -------
+    i, j, size : numpy.ndarray
+        The positions of the two intervals and the measure of their intersection.
+
+    """
+    ts, tf = _measure_bounds(df, discrete)
+    order = np.argsort(ts, kind='mergesort')
+    ts, tf = ts[order], tf[order]
+    n = len(ts)
+    counts = np.maximum(np.searchsorted(ts, tf, side='left') - np.arange(1, n + 1), 0)
+    i = np.repeat(np.arange(n), counts)
+    j = i + 1 + np.arange(len(i)) - np.repeat(np.cumsum(counts) - counts, counts)
+    size = np.minimum(tf[i], tf[j]) - ts[j]
+    keep = size > 0
+    return order[i[keep]], order[j[keep]], size[keep]
+
+
+def count_at_times(df, key_columns, times, discrete=False):
+    """The number of distinct keys with an interval containing each of some times.
+
+    Intervals are merged by key, after which the count at a time is the number of starts
+    before it minus the number of ends before it, each found by a binary search.
+
+    """
+    if len(key_columns):
+        df = merge(df, key_columns, discrete)
+    times = np.asarray(times)
+    if discrete:
+        starts, ends = np.sort(df['ts'].values), np.sort(df['tf'].values)
+        return np.searchsorted(starts, times, side='right') - np.searchsorted(ends, times, side='left')
+    ts, tf, s, f = df['ts'].values, df['tf'].values, df['s'].values.astype(bool), df['f'].values.astype(bool)
+    started = np.searchsorted(np.sort(ts[s]), times, side='right') + np.searchsorted(np.sort(ts[~s]), times, side='left')
+    ended = np.searchsorted(np.sort(tf[~f]), times, side='right') + np.searchsorted(np.sort(tf[f]), times, side='left')
+    return started - ended
+
+
+_REDUCEAT = {'sum': np.add, 'max': np.maximum, 'min': np.minimum}
+
+
+def weighted_merge(df, key_columns, discrete=False, reducer='sum'):
+    """Merge weighted intervals, reducing the weights that cover each elementary segment.
+
+    Each interval is spread over the elementary segments it covers, which are reduced
+    with :code:`numpy.ufunc.reduceat` (or counted), and consecutive segments with an equal
+    weight are joined.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Should contain all :code:`key_columns`, ts, tf, w (and s, f if not discrete).
+
+    reducer : {'sum', 'max', 'min', 'mean', 'count'}
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        With columns :code:`key_columns + ['ts', 'tf']` (and :code:`['s', 'f']` if not discrete) and w.
+
+    """
+    lo, lo_r, hi, hi_r = _bounds(df, discrete)
+    n = lo.shape[0]
+    t, r = np.concatenate([lo, hi]), np.concatenate([lo_r, hi_r])
+    if len(key_columns):
+        keys = [df[c].values for c in key_columns]
+        code = np.tile(key_codes(keys), 2)
+    else:
+        keys = []
+        code = np.zeros(2 * n, dtype=np.int64)
+
+    order = np.lexsort((r, t, code))
+    t, r, code = t[order], r[order], code[order]
+    new = np.ones(2 * n, dtype=bool)
+    if n:
+        new[1:] = (t[1:] != t[:-1]) | (r[1:] != r[:-1]) | (code[1:] != code[:-1])
+    coordinate = np.cumsum(new) - 1
+    position = np.empty(2 * n, dtype=np.int64)
+    position[order] = np.arange(2 * n)
+
+    # Segment j lies between the distinct coordinates j and j + 1, of the same key
+    first, last = coordinate[position[:n]], coordinate[position[n:]]
+    counts = np.maximum(last - first, 0)
+    segment = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    weights = np.repeat(df['w'].values, counts)
+    by_segment = np.argsort(segment, kind='mergesort')
+    segment, weights = segment[by_segment], weights[by_segment]
+
+    starts = np.flatnonzero(np.concatenate([[True], segment[1:] != segment[:-1]])) if len(segment) else np.zeros(0, dtype=np.int64)
+    segment = segment[starts]
+    if reducer in _REDUCEAT:
+        w = _REDUCEAT[reducer].reduceat(weights, starts) if len(starts) else weights[:0]
+    else:
+        w = np.diff(np.append(starts, len(weights)))
+        if reducer == 'mean':
+            w = (np.add.reduceat(weights, starts) if len(starts) else weights[:0]) / w.astype(float)
+        else:
+            assert reducer == 'count'
+
+    # Join consecutive segments with an equal weight
+    joined = np.zeros(len(segment), dtype=bool)
+    joined[1:] = (segment[1:] == segment[:-1] + 1) & (w[1:] == w[:-1])
+    begin = np.flatnonzero(~joined)
+    end = (np.append(begin[1:], len(segment)) - 1)[:len(begin)]
+
+    coordinates = np.flatnonzero(new)
+    ts, ts_r = t[coordinates[segment[begin]]], r[coordinates[segment[begin]]]
+    tf, tf_r = t[coordinates[segment[end] + 1]], r[coordinates[segment[end] + 1]]
+    source = np.tile(np.arange(n), 2)[order][coordinates[segment[begin]]]
+    data = {c: k[source] for c, k in zip(key_columns, keys)}
+    if discrete:
+        data['ts'], data['tf'] = ts, tf - 1
+        columns = key_columns + ['ts', 'tf', 'w']
+    else:
+        data['ts'], data['tf'] = ts, tf
+        data['s'], data['f'] = ts_r == 0, tf_r == 1
+        columns = key_columns + ['ts', 'tf', 's', 'f', 'w']
+    data['w'] = w[begin]
+    return pd.DataFrame(data, columns=columns)
+
+
+def _segment_rows(delta, rows, last):
+    # Over disjoint intervals the running sum of signed row numbers is the active row, or -1
+    return np.cumsum(delta * (rows + 1))[last] - 1
+
+
+def weighted_operation(ia, ib, discrete, operation, function):
+    """Apply a set operation between the elementary segments of two weighted DataFrames.
+
+    The sorted boundaries of the operands are joined and on every elementary segment the
+    weights of their active intervals, if any, are combined by :code:`function`, applied
+    element-wise (a result of None drops the segment). Consecutive segments with an equal
+    weight are joined.
+
+    Parameters
+    ----------
+    ia, ib : SegmentIndex
+        The operands, whose intervals should be disjoint for each key.
+
+    operation : {'union', 'intersection', 'difference'}
+
+    function : callable
+        Combines the weights of both operands.
+
+    Returns
+    -------
+    keys, ts, tf, s, f, w : tuple
+        The key columns and the bounds and weights of the resulting intervals (s, f are None if discrete).
+
+    """
+    n, m = len(ia), len(ib)
+    t = np.concatenate([ia.lo_, ib.lo_, ia.hi_, ib.hi_])
+    r = np.concatenate([ia.lo_r_, ib.lo_r_, ia.hi_r_, ib.hi_r_])
+    keys = [np.concatenate([ka, kb]) for ka, kb in zip(ia.keys_, ib.keys_)]
+    code = (np.tile(key_codes(keys), 2) if len(keys) else np.zeros(2 * (n + m), dtype=np.int64))
+
+    order = np.lexsort((r, t, code))
+    t, r, code = t[order], r[order], code[order]
+    source = np.tile(np.arange(n + m), 2)[order]
+    delta = np.where(order < n + m, 1, -1).astype(np.int64)
+    last = np.ones(2 * (n + m), dtype=bool)
+    last[:-1] = (t[1:] != t[:-1]) | (r[1:] != r[:-1]) | (code[1:] != code[:-1])
+    last = np.flatnonzero(last)
+    in_a = source < n
+    row_a = _segment_rows(np.where(in_a, delta, 0), source, last)
+    row_b = _segment_rows(np.where(in_a, 0, delta), source - n, last)
+    t, r, source = t[last], r[last], source[last]
+
+    # Segment j lies between the coordinates j and j + 1, of the same key
+    valid = np.zeros(len(last), dtype=bool)
+    valid[:-1] = code[last[:-1]] == code[last[1:]]
+    a, b = valid & (row_a >= 0), valid & (row_b >= 0)
+    wa, wb = ia.w_[np.maximum(row_a, 0)], ib.w_[np.maximum(row_b, 0)]
+    both = a & b
+    if operation == 'union':
+        selected, w = a | b, np.where(a, wa, wb).astype(object)
+    elif operation == 'intersection':
+        selected, w = both, np.empty(len(t), dtype=object)
+    else:
+        selected, w = a, wa.astype(object)
+    if both.any():
+        w[both] = np.frompyfunc(function, 2, 1)(wa[both], wb[both])
+    selected &= np.not_equal(w, None)
+    segment = np.flatnonzero(selected)
+    w = np.array(w[segment].tolist())
+
+    joined = np.zeros(len(segment), dtype=bool)
+    joined[1:] = (segment[1:] == segment[:-1] + 1) & (w[1:] == w[:-1])
+    begin = np.flatnonzero(~joined)
+    end = (np.append(begin[1:], len(segment)) - 1)[:len(begin)]
+    start, finish = segment[begin], segment[end] + 1
+
+    rows = source[start]
+    keys = [k[rows] for k in keys]
+    if discrete:
+        return keys, t[start], t[finish] - 1, None, None, w[begin]
+    return keys, t[start], t[finish], r[start] == 0, r[finish] == 1, w[begin]
+
+
+def _before(t, r, u, ur):
+    # If the coordinates (t, r) are lexicographically smaller than (u, ur)
+    return (t < u) | ((t == u) & (r < ur))
+
+
+def _probe(index, dfb, key_columns, discrete):
+    # The group of each interval of dfb in the index (or -1) and its bounds
+    lo, lo_r, hi, hi_r = _bounds(dfb, discrete)
+    group = index.group_of([dfb[c].values for c in key_columns] if len(key_columns) else [lo])
+    return group, (lo, lo_r, hi, hi_r)
+
+
+def issuper(index, dfb, key_columns, discrete=False):
+    """If the intervals of an index cover all the intervals of a DataFrame.
+
+    The intervals of :code:`dfb` are probed at once, with a single binary search over the intervals
+    of :code:`index`, sorted by key and time.
+
+    Parameters
+    ----------
+    index : SegmentIndex
+        Over the maximal (merged) intervals of each key.
+
+    dfb : pandas.DataFrame
+        With the :code:`key_columns` and ts, tf (and s, f if not discrete).
+
+    key_columns : list
+
+    discrete : Bool, default=False
+
+    Returns
+    -------
+    issuper : Bool
+
+    """
+    group, (lo, lo_r, hi, hi_r) = _probe(index, dfb, key_columns, discrete)
+    if (group < 0).any():
+        return False
+    j = index.last_starting_before(group, lo, lo_r)
+    jj = np.maximum(j, 0)
+    return bool(((j >= 0) & ~_before(index.hi_[jj], index.hi_r_[jj], hi, hi_r)).all())
+
+
+def nonempty_intersection(index, dfb, key_columns, discrete=False):
+    """If the intervals of an index intersect any of the intervals of a DataFrame, of the same key.
+
+    The intervals of :code:`dfb` are probed at once, with a single binary search over the intervals
+    of :code:`index`, sorted by key and time.
+
+    Parameters
+    ----------
+    index : SegmentIndex
+        Over the maximal (merged) intervals of each key.
+
+    dfb : pandas.DataFrame
+        With the :code:`key_columns` and ts, tf (and s, f if not discrete).
+
+    key_columns : list
+
+    discrete : Bool, default=False
+
+    Returns
+    -------
+    nonempty_intersection : Bool
+
+    """
+    group, (lo, lo_r, hi, hi_r) = _probe(index, dfb, key_columns, discrete)
+    # Of the intervals starting before the end of an interval, the last finishes the latest
+    j = index.last_starting_before(group, hi, hi_r - 1)
+    i = np.flatnonzero(j >= 0)
+    lo, lo_r, j = lo[i], lo_r[i], j[i]
+    return bool((_before(lo, lo_r, index.hi_[j], index.hi_r_[j]) & _before(lo, lo_r, hi[i], hi_r[i])).any())
@@ -335,7 +335,7 @@ def issuper_no_key(dfa, dfb, issuper_function):
     t_max = dfb.tf.max()
 
     cache = issuper_cache_constructor()
-    for ev in events(dfa, dfb, issuper_order, reference=True, weights=True):
+    for ev in events(dfa, dfb, issuper_order, reference=True, weights=True, lazy=True):
         if update_cache_issuper(cache, ev, issuper_function):
             return False
         if ev[1] > t_max:
@@ -348,7 +348,7 @@ def issuper_by_key(dfa, dfb, issuper_function):
     t_max = dfb.tf.max()
 
     cache = defaultdict(issuper_cache_constructor)
-    for event in events(dfa, dfb, issuper_order, reference=True, weights=True):
+    for event in events(dfa, dfb, issuper_order, reference=True, weights=True, lazy=True):
         ev, key = event[:5], event[5:]
         if update_cache_issuper(cache[key], ev, issuper_function):
             return False
@@ -364,7 +364,7 @@ def issuper_on_key(df, kdf, issuper_function):
     t_max = kdf.tf.max()
 
     cache = dict()
-    for col in events(df, kdf, issuper_order, reference=True, weights=True):
+    for col in events(df, kdf, issuper_order, reference=True, weights=True, lazy=True):
         r, t, closed, s, w = col[:5]
         if r:
             k = col[5:]
@@ -402,7 +402,7 @@ def nonempty_intersection_no_key(dfa, dfb, nonempty_intersection_function):
     t_max = dfb.tf.max()
 
     cache = issuper_cache_constructor()
-    for ev in events(dfa, dfb, nei_order, reference=True, weights=True):
+    for ev in events(dfa, dfb, nei_order, reference=True, weights=True, lazy=True):
         if update_cache_nonempty_intersection(cache, ev, nonempty_intersection_function):
             return True
         if ev[1] > t_max:
@@ -415,7 +415,7 @@ def nonempty_intersection_by_key(dfa, dfb, nonempty_intersection_function):
     t_max = dfb.tf.max()
 
     cache = defaultdict(issuper_cache_constructor)
-    for event in events(dfa, dfb, nei_order, reference=True, weights=True):
+    for event in events(dfa, dfb, nei_order, reference=True, weights=True, lazy=True):
         ev, key = event[:5], event[5:]
         if update_cache_nonempty_intersection(cache[key], ev, nonempty_intersection_function):
             return True
@@ -429,7 +429,7 @@ def nonempty_intersection_on_key(dfa, dfb, nonempty_intersection_function):
     t_max = min(dfa.tf.max(), dfb.tf.max())
 
     cache = dict()
-    for event in events(dfa, dfb, nei_order, reference=True, weights=True):
+    for event in events(dfa, dfb, nei_order, reference=True, weights=True, lazy=True):
         r, t, c, s, w = event[:5]
         if r:
             if s:
@@ -321,7 +321,7 @@ def issuper_no_key(dfa, dfb, issuper_function):
     t_max = dfb.tf.max()
 
     cache = issuper_cache_constructor()
-    for ev in events(dfa, dfb, issuper_order, reference=True, weights=True):
+    for ev in events(dfa, dfb, issuper_order, reference=True, weights=True, lazy=True):
         if update_cache_issuper(cache, ev, issuper_function):
             return False
         if ev[1] > t_max:
@@ -334,7 +334,7 @@ def issuper_by_key(dfa, dfb, issuper_function):
     t_max = dfb.tf.max()
 
     cache = defaultdict(issuper_cache_constructor)
-    for event in events(dfa, dfb, issuper_order, reference=True, weights=True):
+    for event in events(dfa, dfb, issuper_order, reference=True, weights=True, lazy=True):
         ev, key = event[:4], event[4:]
         if update_cache_issuper(cache[key], ev, issuper_function):
             return False
@@ -350,7 +350,7 @@ def issuper_on_key(df, kdf, issuper_function):
     t_max = kdf.tf.max()
 
     cache = dict()
-    for col in events(df, kdf, issuper_order, reference=True, weights=True):
+    for col in events(df, kdf, issuper_order, reference=True, weights=True, lazy=True):
         r, t, s, w = col[:4]
         if r:
             k = col[4:]
@@ -387,7 +387,7 @@ def nonempty_intersection_no_key(dfa, dfb, nonempty_intersection_function):
     t_max = dfb.tf.max()
 
     cache = issuper_cache_constructor()
-    for ev in events(dfa, dfb, nonempty_intersection_order, reference=True, weights=True):
+    for ev in events(dfa, dfb, nonempty_intersection_order, reference=True, weights=True, lazy=True):
         if update_cache_nonempty_intersection(cache, ev, nonempty_intersection_function):
             return True
         if ev[1] > t_max:
@@ -400,7 +400,7 @@ def nonempty_intersection_by_key(dfa, dfb, nonempty_intersection_function):
     t_max = dfb.tf.max()
 
     cache = defaultdict(issuper_cache_constructor)
-    for event in events(dfa, dfb, nonempty_intersection_order, reference=True, weights=True):
+    for event in events(dfa, dfb, nonempty_intersection_order, reference=True, weights=True, lazy=True):
         ev, key = event[:4], event[4:]
         if update_cache_nonempty_intersection(cache[key], ev, nonempty_intersection_function):
             return True
@@ -414,7 +414,7 @@ def nonempty_intersection_on_key(dfa, dfb, nonempty_intersection_function):
     t_max = min(dfa.tf.max(), dfb.tf.max())
 
     cache = dict()
-    for event in events(dfa, dfb, nonempty_intersection_order, reference=True, weights=True):
+    for event in events(dfa, dfb, nonempty_intersection_order, reference=True, weights=True, lazy=True):
         r, t, s, w = event[:4]
         if r:
             if s:
@@ -1,4 +1,5 @@
 from __future__ import absolute_import
+import numpy as np
 import pandas as pd
 from six import string_types
 from collections import Iterable
@@ -12,9 +13,19 @@ from .algorithms.continuous_interval import nonempty_intersection_no_key, nonemp
 from .algorithms.continuous_interval import cartesian_intersection as cartesian_intersection_
 from .algorithms.continuous_interval import map_intersection as map_intersection_
 from .algorithms.continuous_interval import interval_intersection_size as interval_intersection_size_
+from .algorithms import vectorized_interval
+from .interval_index import IntervalIndex, SegmentIndex
+from .interval_index import positions_at_times as positions_at_times_
 
 
 class CIntervalDF(pd.DataFrame):
+    # Set operations by key are computed on sorted arrays, unless set to False.
+    vectorized = True
+    _interval_index = None
+    _segment_index = None
+    _merged = False
+    _sorted_by = None
+
     def __init__(self, *args, **kargs):
         disjoint_intervals = kargs.pop('disjoint_intervals', None)
         super(CIntervalDF, self).__init__(*args, **kargs)
@@ -27,23 +38,31 @@ class CIntervalDF(pd.DataFrame):
             self['f'] = True
 
         from .weighted_continuous_interval_df import CIntervalWDF
-        if len(args) and isinstance(args[0], CIntervalWDF) or (isinstance(kargs.get('data', None), CIntervalWDF)):
-            self.drop(columns=['w'], merge=True)
-        elif len(args) and isinstance(args[0], CIntervalDF) or (isinstance(kargs.get('data', None), CIntervalDF)):
+        data = (args[0] if len(args) else kargs.get('data', None))
+        if isinstance(data, CIntervalWDF):
+            if 'w' in self.columns:
+                super(CIntervalDF, self).drop(columns=['w'], inplace=True)
+            self.merge(inplace=True)
+        elif isinstance(data, CIntervalDF):
+            if set(self.columns) == set(data.columns):
+                data._inherit_invariants(self)
             if disjoint_intervals:
                 self.merge(inplace=True)
         elif disjoint_intervals is False:
             self.merge(inplace=True)
 
     def copy(self, *args, **kargs):
-        return CIntervalDF(super(CIntervalDF, self).copy(*args, **kargs))
+        return self._inherit_invariants(CIntervalDF(super(CIntervalDF, self).copy(*args, **kargs)))
 
     def drop(self, *args, **kargs):
         merge = kargs.pop('merge', True)
         out = super(CIntervalDF, self).drop(*args, **kargs)
         if isinstance(out, pd.DataFrame):
             if {'ts', 'tf', 's', 'f'}.issubset(set(out.columns)):
-                out = CIntervalDF(out, disjoint_intervals=(not merge))
+                rows = set(out.columns) == set(self.columns)
+                out = CIntervalDF(out, disjoint_intervals=(not merge or (rows and self._merged)))
+                if rows:
+                    self._inherit_invariants(out)
         return out
 
     def append(self, *args, **kargs):
@@ -65,13 +84,27 @@ class CIntervalDF(pd.DataFrame):
         out = super(CIntervalDF, self).__getitem__(index)
         if isinstance(out, pd.DataFrame):
             if 'ts' in out.columns and 'tf' in out.columns:
+                rows = set(out.columns) == set(self.columns)
                 out = CIntervalDF(out)
+                if rows:
+                    # A slice with a negative step reverses the rows.
+                    ordered = (not isinstance(index, slice) or index.step is None or index.step > 0)
+                    self._inherit_invariants(out, ordered)
         return out
 
     def sort_values(self, by, axis=0, ascending=True, inplace=False, kind='quicksort', na_position='last'):
+        by = ([by] if isinstance(by, string_types) else list(by))
+        sorted_by = (by if ascending is True and axis in [0, 'index'] else None)
+        if sorted_by is not None and self._sorted_by == sorted_by:
+            return (None if inplace else self.copy())
+        merged = self._merged
         df = super(self.__class__, self).sort_values(by, axis, ascending, inplace, kind, na_position)
-        if not inplace:
-            return self.__class__(df)
+        if inplace:
+            self._merged, self._sorted_by = merged, sorted_by
+        else:
+            df = self.__class__(df)
+            df._merged, df._sorted_by = merged, sorted_by
+            return df
 
     def get_ni_columns(self, on_column):
         if on_column is None:
@@ -107,41 +140,128 @@ class CIntervalDF(pd.DataFrame):
         return (self.tf - self.ts).sum()
 
     def df_at(self, t):
-        return self[self.index_at(t)]
+        return self.df_at_interval(t, t)
 
     def df_at_interval(self, ts, tf, it=None):
-        return self[self.index_at_interval(ts, tf, it)]
+        return self.__class__(self.iloc[self.positions_at_interval(ts, tf, it)])
 
     def count_at(self, t):
-        return self.index_at(t).sum()
+        return len(self.positions_at_interval(t, t))
 
     def index_at(self, t):
         return self.index_at_interval(t, t)
 
     def index_at_interval(self, ts, tf, it=None):
+        return self._positions_mask(self.positions_at_interval(ts, tf, it))
+
+    def positions_at_interval(self, ts, tf, it=None):
         assert ts <= tf
         l, r = (it in ['left', 'both'], it in ['right', 'both'])
-        return ((self.ts < ts) & (self.tf > tf)) | ((self.ts == ts) & (self.s | l)) | ((self.tf == tf) & (self.f | r))
+        idx = self.interval_index
+        starting, finishing = idx.starting_at(ts), idx.finishing_at(tf)
+        if not l:
+            starting = starting[self.s.values[starting]]
+        if not r:
+            finishing = finishing[self.f.values[finishing]]
+        return np.unique(np.concatenate([idx.covering(ts, tf), starting, finishing]))
+
+    def positions_at_times(self, times):
+        return positions_at_times_(times, self.ts.values, self.tf.values, self.s.values, self.f.values)
+
+    def _clear_item_cache(self, *args, **kargs):
+        # Mutations through setitem, loc/iloc and inplace updates pass from here: drop the indexes and the invariants.
+        self._interval_index = None
+        self._segment_index = None
+        self._merged, self._sorted_by = False, None
+        return super(CIntervalDF, self)._clear_item_cache(*args, **kargs)
+
+    def _set_value(self, *args, **kargs):
+        # While at/iat write on the cached columns, without clearing them.
+        self._clear_item_cache()
+        return super(CIntervalDF, self)._set_value(*args, **kargs)
+
+    def _maybe_cache_changed(self, *args, **kargs):
+        # As do chained writes on a cached column, e.g. df['tf'][0] = 9.
+        self._clear_item_cache()
+        return super(CIntervalDF, self)._maybe_cache_changed(*args, **kargs)
+
+    @property
+    def is_merged(self):
+        """If the intervals of each key are known to be disjoint and non-adjacent."""
+        return self._merged
 
-    def _save_or_return(self, df, inplace, on_column, disjoint_intervals=True):
-        if df is None:
+    @property
+    def sorted_by(self):
+        """The columns by which the rows are known to be sorted, or None."""
+        return self._sorted_by
+
+    def _inherit_invariants(self, df, ordered=True):
+        # The rows of a frame keep its invariants, but are only sorted if kept in the same order.
+        df._merged, df._sorted_by = self._merged, (self._sorted_by if ordered else None)
+        return df
+
+    @property
+    def interval_index(self):
+        """A sorted-endpoint index of the intervals, built on first use."""
+        if self._interval_index is None:
+            self._interval_index = IntervalIndex(self.ts.values, self.tf.values)
+        return self._interval_index
+
+    def segment_index(self, key_columns):
+        """The maximal intervals of each key sorted by key and time, built on first use.
+
+        Parameters
+        ----------
+        key_columns: list
+
+        Returns
+        -------
+        segment_index: SegmentIndex
+            Cached for each list of key columns, until the frame is mutated. Writes on the
+            arrays of its columns (e.g. through :code:`df.ts.values`) are not detected.
+
+        """
+        if self._segment_index is None:
+            self._segment_index = dict()
+        key = tuple(key_columns)
+        if key not in self._segment_index:
+            merged = self._merged and set(key_columns) == set(self.get_ni_columns(None))
+            df = (self if merged else vectorized_interval.merge(self, key_columns, discrete=False))
+            self._segment_index[key] = SegmentIndex(df, key_columns, False)
+        return self._segment_index[key]
+
+    def _positions_mask(self, positions):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[positions] = True
+        return pd.Series(mask, index=self.index)
+
+    def _save_or_return(self, df, inplace, on_column=None, disjoint_intervals=True, merged=False):
+        if df is self:
+            return self.merge(inplace=inplace)
+        elif df is None:
             df = self.__class__(columns=self.columns)
         else:
             df = self.__class__(df, columns=on_column + ['ts', 'tf', 's', 'f'], disjoint_intervals=disjoint_intervals)
 
-        if inplace and df is not self:
-            return self._update_inplace(df._data)
+        if inplace:
+            self._update_inplace(df._data)
+            self._merged = merged
         else:
-            return (df.copy() if df is self else df)
+            df._merged = merged
+            return df
 
     def merge(self, inplace=False):
+        if self._merged:
+            return (None if inplace else self.copy())
         on_column = self.get_ni_columns(None)
         data = (self if inplace else self.copy())
-        if not len(on_column):
+        if self.vectorized:
+            df = vectorized_interval.merge(data, on_column, discrete=False)
+        elif not len(on_column):
             df = merge_no_key(data)
         else:
             df = merge_by_key(data)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=True)
 
     def union(self, df, on_column=None, by_key=True, inplace=False):
         if df.empty:
@@ -150,13 +270,16 @@ class CIntervalDF(pd.DataFrame):
         assert not (not by_key and df is None)
         on_column = self.get_ni_columns(on_column)
 
-        if not len(on_column):
+        merged = self.vectorized and (by_key or not len(on_column))
+        if merged:
+            df = vectorized_interval.union(self, df, on_column, discrete=False)
+        elif not len(on_column):
             df = union_no_key(self, df)
         elif by_key:
             df = union_by_key(self, df)
         else:
             df = union_on_key(self, df)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=merged)
 
     def intersection(self, df=None, on_column=None, by_key=True, inplace=False):
         if df is None or df.empty:
@@ -165,30 +288,42 @@ class CIntervalDF(pd.DataFrame):
         assert not (not by_key and df is None)
         on_column = self.get_ni_columns(on_column)
 
-        if not len(on_column):
+        # Pieces of merged operands cannot touch, as intersection and difference do not coalesce
+        merged = self.vectorized and (by_key or not len(on_column))
+        if merged:
+            merged = self._merged and getattr(df, '_merged', False)
+            df = vectorized_interval.intersection(self, df, on_column, discrete=False)
+        elif not len(on_column):
             df = intersection_no_key(self, df)
         elif by_key:
             df = intersection_by_key(self, df)
         else:
             df = intersection_on_key(self, df)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=merged)
 
     def difference(self, dfb, on_column=None, by_key=True, inplace=False):
         if self.empty or dfb.empty:
             return self._save_or_return(self, inplace)
 
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        merged = self.vectorized and (by_key or not len(on_column))
+        if merged:
+            merged = self._merged and getattr(dfb, '_merged', False)
+            df = vectorized_interval.difference(self, dfb, on_column, discrete=False)
+        elif not len(on_column):
             df = difference_no_key(self, dfb)
         elif by_key:
             df = difference_by_key(self, dfb)
         else:
             df = difference_on_key(self, dfb)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=merged)
 
     def issuper(self, dfb, on_column=None, by_key=True):
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized:
+            key_columns = (on_column if by_key else [])
+            return vectorized_interval.issuper(self.segment_index(key_columns), dfb, key_columns, discrete=False)
+        elif not len(on_column):
             return issuper_no_key(self, dfb)
         elif by_key:
             return issuper_by_key(self, dfb)
@@ -198,7 +333,10 @@ class CIntervalDF(pd.DataFrame):
 
     def nonempty_intersection(self, bdf, on_column="u", by_key=True):
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized:
+            key_columns = (on_column if by_key else [])
+            return vectorized_interval.nonempty_intersection(self.segment_index(key_columns), bdf, key_columns, discrete=False)
+        elif not len(on_column):
             return nonempty_intersection_no_key(self, bdf)
         elif by_key:
             return nonempty_intersection_by_key(self, bdf)
@@ -220,7 +358,12 @@ class CIntervalDF(pd.DataFrame):
         out = map_intersection_(self[self.u.isin(nodes)], base_df)
         return self.__class__(out, columns=['u', 'ts', 'tf', 's', 'f'], disjoint_intervals=True)
 
+    def active_measures(self, powers=(1, 2)):
+        return vectorized_interval.active_measures(self, discrete=False, powers=powers)
+
     def intersection_size(self, b):
+        if self.vectorized:
+            return vectorized_interval.intersection_size(self, b, discrete=False)
         return interval_intersection_size_(self, b)
 
     @property
@@ -1,4 +1,5 @@
 from __future__ import absolute_import
+import numpy as np
 import pandas as pd
 from six import string_types
 from collections import Iterable
@@ -20,9 +21,19 @@ from .algorithms.discrete_interval import nonempty_intersection_by_key as nonemp
 from .algorithms.discrete_interval import cartesian_intersection as cartesian_intersection_
 from .algorithms.discrete_interval import map_intersection as map_intersection_
 from .algorithms.discrete_interval import interval_intersection_size as interval_intersection_size_
+from .algorithms import vectorized_interval
+from .interval_index import IntervalIndex, SegmentIndex
+from .interval_index import positions_at_times as positions_at_times_
 
 
 class DIntervalDF(pd.DataFrame):
+    # Set operations by key are computed on sorted arrays, unless set to False.
+    vectorized = True
+    _interval_index = None
+    _segment_index = None
+    _merged = False
+    _sorted_by = None
+
     def __init__(self, *args, **kargs):
         disjoint_intervals = kargs.pop('disjoint_intervals', None)
         super(DIntervalDF, self).__init__(*args, **kargs)
@@ -36,17 +47,21 @@ class DIntervalDF(pd.DataFrame):
                 assert self.tf.dtype.kind == 'i'
 
             from .weighted_discrete_interval_df import DIntervalWDF
-            if len(args) and isinstance(args[0], DIntervalWDF) or (isinstance(kargs.get('data', None), DIntervalWDF)):
-                self.drop(columns=['w'])
+            data = (args[0] if len(args) else kargs.get('data', None))
+            if isinstance(data, DIntervalWDF):
+                if 'w' in self.columns:
+                    super(DIntervalDF, self).drop(columns=['w'], inplace=True)
                 self.merge(inplace=True)
-            elif len(args) and isinstance(args[0], DIntervalDF) or (isinstance(kargs.get('data', None), DIntervalDF)):
+            elif isinstance(data, DIntervalDF):
+                if set(self.columns) == set(data.columns):
+                    data._inherit_invariants(self)
                 if disjoint_intervals:
                     self.merge(inplace=True)
             elif disjoint_intervals is False:
                 self.merge(inplace=True)
 
     def copy(self, *args, **kargs):
-        return DIntervalDF(super(DIntervalDF, self).copy(*args, **kargs))
+        return self._inherit_invariants(DIntervalDF(super(DIntervalDF, self).copy(*args, **kargs)))
 
     def drop(self, *args, **kargs):
         merge = kargs.pop('merge', True)
@@ -54,9 +69,12 @@ class DIntervalDF(pd.DataFrame):
         if isinstance(out, pd.DataFrame):
             if 'ts' in out.columns:
                 if 'tf' in out.columns:
-                    out = DIntervalDF(out, disjoint_intervals=(not merge))
+                    rows = set(out.columns) == set(self.columns)
+                    out = DIntervalDF(out, disjoint_intervals=(not merge or (rows and self._merged)))
+                    if rows:
+                        self._inherit_invariants(out)
                 else:
-                    from instantaneous_df import InstantaneousDF
+                    from .instantaneous_df import InstantaneousDF
                     out = InstantaneousDF(out, no_duplicates=(not merge))
         return out
 
@@ -68,9 +86,18 @@ class DIntervalDF(pd.DataFrame):
         return out
 
     def sort_values(self, by, axis=0, ascending=True, inplace=False, kind='quicksort', na_position='last'):
+        by = ([by] if isinstance(by, string_types) else list(by))
+        sorted_by = (by if ascending is True and axis in [0, 'index'] else None)
+        if sorted_by is not None and self._sorted_by == sorted_by:
+            return (None if inplace else self.copy())
+        merged = self._merged
         df = super(self.__class__, self).sort_values(by, axis, ascending, inplace, kind, na_position)
-        if not inplace:
-            return self.__class__(df)
+        if inplace:
+            self._merged, self._sorted_by = merged, sorted_by
+        else:
+            df = self.__class__(df)
+            df._merged, df._sorted_by = merged, sorted_by
+            return df
 
     def itertuples(self, index=False, name=None):
         columns = sorted(list(set(self.columns) - {'ts', 'tf'})) + ['ts', 'tf']
@@ -80,7 +107,12 @@ class DIntervalDF(pd.DataFrame):
         out = super(DIntervalDF, self).__getitem__(index)
         if isinstance(out, pd.DataFrame):
             if 'ts' in out.columns and 'tf' in out.columns:
+                rows = set(out.columns) == set(self.columns)
                 out = DIntervalDF(out)
+                if rows:
+                    # A slice with a negative step reverses the rows.
+                    ordered = (not isinstance(index, slice) or index.step is None or index.step > 0)
+                    self._inherit_invariants(out, ordered)
         return out
 
     def get_ni_columns(self, on_column):
@@ -108,40 +140,121 @@ class DIntervalDF(pd.DataFrame):
         return (self.tf - self.ts + 1).sum()
 
     def df_at(self, t):
-        return self[self.index_at(t)]
+        return self.df_at_interval(t, t)
 
     def df_at_interval(self, ts, tf):
-        return self[self.index_at_interval(ts, tf)]
+        return self.__class__(self.iloc[self.positions_at_interval(ts, tf)])
 
     def count_at(self, t):
-        return self.index_at(t).sum()
+        return len(self.positions_at_interval(t, t))
 
     def index_at(self, t):
-        return (self.ts <= t) & (self.tf >= t)
+        return self.index_at_interval(t, t)
 
     def index_at_interval(self, ts, tf):
+        return self._positions_mask(self.positions_at_interval(ts, tf))
+
+    def positions_at_interval(self, ts, tf):
         assert ts <= tf
-        return (self.ts <= ts) & (self.tf >= tf)
+        return np.sort(self.interval_index.covering(ts, tf, strict=False))
+
+    def positions_at_times(self, times):
+        return positions_at_times_(times, self.ts.values, self.tf.values)
+
+    def _clear_item_cache(self, *args, **kargs):
+        # Mutations through setitem, loc/iloc and inplace updates pass from here: drop the indexes and the invariants.
+        self._interval_index = None
+        self._segment_index = None
+        self._merged, self._sorted_by = False, None
+        return super(DIntervalDF, self)._clear_item_cache(*args, **kargs)
+
+    def _set_value(self, *args, **kargs):
+        # While at/iat write on the cached columns, without clearing them.
+        self._clear_item_cache()
+        return super(DIntervalDF, self)._set_value(*args, **kargs)
+
+    def _maybe_cache_changed(self, *args, **kargs):
+        # As do chained writes on a cached column, e.g. df['tf'][0] = 9.
+        self._clear_item_cache()
+        return super(DIntervalDF, self)._maybe_cache_changed(*args, **kargs)
 
-    def _save_or_return(self, df, inplace, on_column=None, disjoint_intervals=True):
+    @property
+    def is_merged(self):
+        """If the intervals of each key are known to be disjoint and non-adjacent."""
+        return self._merged
+
+    @property
+    def sorted_by(self):
+        """The columns by which the rows are known to be sorted, or None."""
+        return self._sorted_by
+
+    def _inherit_invariants(self, df, ordered=True):
+        # The rows of a frame keep its invariants, but are only sorted if kept in the same order.
+        df._merged, df._sorted_by = self._merged, (self._sorted_by if ordered else None)
+        return df
+
+    @property
+    def interval_index(self):
+        """A sorted-endpoint index of the intervals, built on first use."""
+        if self._interval_index is None:
+            self._interval_index = IntervalIndex(self.ts.values, self.tf.values)
+        return self._interval_index
+
+    def segment_index(self, key_columns):
+        """The maximal intervals of each key sorted by key and time, built on first use.
+
+        Parameters
+        ----------
+        key_columns: list
+
+        Returns
+        -------
+        segment_index: SegmentIndex
+            Cached for each list of key columns, until the frame is mutated. Writes on the
+            arrays of its columns (e.g. through :code:`df.ts.values`) are not detected.
+
+        """
+        if self._segment_index is None:
+            self._segment_index = dict()
+        key = tuple(key_columns)
+        if key not in self._segment_index:
+            merged = self._merged and set(key_columns) == set(self.get_ni_columns(None))
+            df = (self if merged else vectorized_interval.merge(self, key_columns, discrete=True))
+            self._segment_index[key] = SegmentIndex(df, key_columns, True)
+        return self._segment_index[key]
+
+    def _positions_mask(self, positions):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[positions] = True
+        return pd.Series(mask, index=self.index)
+
+    def _save_or_return(self, df, inplace, on_column=None, disjoint_intervals=True, merged=False):
         if df is None:
             df = self.__class__(columns=self.columns)
-        elif isinstance(df, list):
+        elif isinstance(df, (list, pd.DataFrame)) and not isinstance(df, self.__class__):
             assert on_column is not None
             df = self.__class__(df, columns=on_column + ['ts', 'tf'], disjoint_intervals=disjoint_intervals)
 
         if inplace and df is not self:
-            return self._update_inplace(df._data)
+            self._update_inplace(df._data)
+            self._merged = merged
+        elif df is self:
+            return df.copy()
         else:
-            return (df.copy() if df is self else df)
+            df._merged = merged
+            return df
 
     def merge(self, inplace=False):
+        if self._merged:
+            return (None if inplace else self.copy())
         on_column = self.get_ni_columns(None)
-        if not len(on_column):
+        if self.vectorized:
+            df = vectorized_interval.merge(self, on_column, discrete=True)
+        elif not len(on_column):
             df = merge_no_key_(self)
         else:
             df = merge_by_key_(self)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=True)
 
     def union(self, df, on_column=None, by_key=True, inplace=False):
         if df.empty:
@@ -150,13 +263,16 @@ class DIntervalDF(pd.DataFrame):
         assert not (not by_key and df is None)
         on_column = self.get_ni_columns(on_column)
 
-        if not len(on_column):
+        merged = self.vectorized and (by_key or not len(on_column))
+        if merged:
+            df = vectorized_interval.union(self, df, on_column, discrete=True)
+        elif not len(on_column):
             df = union_no_key_(self, df)
         elif by_key:
             df = union_by_key_(self, df)
         else:
             df = union_on_key_(self, df)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=merged)
 
     def intersection(self, df, on_column=None, by_key=True, inplace=False):
         if df is None or df.empty:
@@ -165,30 +281,42 @@ class DIntervalDF(pd.DataFrame):
         assert not (not by_key and df is None)
         on_column = self.get_ni_columns(on_column)
 
-        if not len(on_column):
+        # Pieces of merged operands cannot touch, as intersection and difference do not coalesce
+        merged = self.vectorized and (by_key or not len(on_column))
+        if merged:
+            merged = self._merged and getattr(df, '_merged', False)
+            df = vectorized_interval.intersection(self, df, on_column, discrete=True)
+        elif not len(on_column):
             df = intersection_no_key_(self, df)
         elif by_key:
             df = intersection_by_key_(self, df)
         else:
             df = intersection_on_key_(self, df)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=merged)
 
     def difference(self, dfb, on_column=None, by_key=True, inplace=False):
         if self.empty or dfb.empty:
             return self._save_or_return(self, inplace)
 
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        merged = self.vectorized and (by_key or not len(on_column))
+        if merged:
+            merged = self._merged and getattr(dfb, '_merged', False)
+            df = vectorized_interval.difference(self, dfb, on_column, discrete=True)
+        elif not len(on_column):
             df = difference_no_key_(self, dfb)
         elif by_key:
             df = difference_by_key_(self, dfb)
         else:
             df = difference_on_key_(self, dfb)
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=merged)
 
     def issuper(self, dfb, on_column=None, by_key=True):
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized:
+            key_columns = (on_column if by_key else [])
+            return vectorized_interval.issuper(self.segment_index(key_columns), dfb, key_columns, discrete=True)
+        elif not len(on_column):
             return issuper_no_key_(self, dfb)
         elif by_key:
             return issuper_by_key_(self, dfb)
@@ -198,7 +326,10 @@ class DIntervalDF(pd.DataFrame):
 
     def nonempty_intersection(self, bdf, on_column="u", by_key=True):
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized:
+            key_columns = (on_column if by_key else [])
+            return vectorized_interval.nonempty_intersection(self.segment_index(key_columns), bdf, key_columns, discrete=True)
+        elif not len(on_column):
             return nonempty_intersection_no_key_(self, bdf)
         elif by_key:
             return nonempty_intersection_by_key_(self, bdf)
@@ -217,7 +348,12 @@ class DIntervalDF(pd.DataFrame):
     def map_intersection(self, base_df):
         return self.__class__(map_intersection_(self, base_df), columns=['u', 'ts', 'tf'])
 
+    def active_measures(self, powers=(1, 2)):
+        return vectorized_interval.active_measures(self, discrete=True, powers=powers)
+
     def intersection_size(self, b):
+        if self.vectorized:
+            return vectorized_interval.intersection_size(self, b, discrete=True)
         return interval_intersection_size_(self, b)
 
     @property
@@ -5,6 +5,7 @@ from collections import defaultdict
 from six import iteritems
 from six import string_types
 from .algorithms.utils.misc import set_tuple
+from .interval_index import positions_at_times as positions_at_times_
 
 
 class InstantaneousDF(pd.DataFrame):
@@ -80,6 +81,9 @@ class InstantaneousDF(pd.DataFrame):
     def index_at(self, t):
         return (self.ts == t)
 
+    def positions_at_times(self, times):
+        return positions_at_times_(times, self.ts.values, self.ts.values)
+
     def _save_or_return(self, df, inplace, on_column=None, no_duplicates=True):
         if df is None:
             df = self.__class__(columns=self.columns)
@@ -0,0 +1,189 @@
+from __future__ import absolute_import
+import numpy as np
+import pandas as pd
+
+
+class IntervalIndex(object):
+    """A static index over the intervals of a DataFrame.
+
+    Intervals are kept sorted by their start and by their finish. Over the start order,
+    a tree of the maximum finishing times (each level halving the previous) allows to
+    retrieve the intervals that start before and finish after an interval in
+    :math:`O(\\log N + k)` vectorized steps.
+
+    Parameters
+    ----------
+    ts: numpy.ndarray
+        The starting times.
+
+    tf: numpy.ndarray
+        The finishing times.
+
+    """
+    def __init__(self, ts, tf):
+        self.by_start_ = np.argsort(ts, kind='mergesort')
+        self.ts_ = ts[self.by_start_]
+        self.by_finish_ = np.argsort(tf, kind='mergesort')
+        self.tf_ = tf[self.by_finish_]
+        levels = [tf[self.by_start_]]
+        while len(levels[-1]) > 1:
+            level = levels[-1]
+            levels.append(np.maximum.reduceat(level, np.arange(0, len(level), 2)))
+        self.levels_ = levels
+
+    def __len__(self):
+        return len(self.ts_)
+
+    def covering(self, ts, tf, strict=True):
+        """Positions of the intervals that start before ts and finish after tf.
+
+        If strict both inequalities are strict, else they also accept equality.
+
+        """
+        end = np.searchsorted(self.ts_, ts, side=('left' if strict else 'right'))
+        if not end:
+            return np.empty(0, dtype=np.intp)
+        nodes = np.arange(len(self.levels_[-1]))
+        for depth in range(len(self.levels_) - 1, -1, -1):
+            level = self.levels_[depth]
+            nodes = nodes[(nodes << depth) < end]
+            values = level[nodes]
+            nodes = nodes[(values > tf) if strict else (values >= tf)]
+            if depth:
+                nodes = np.stack([2 * nodes, 2 * nodes + 1], axis=1).ravel()
+                nodes = nodes[nodes < len(self.levels_[depth - 1])]
+        return self.by_start_[nodes]
+
+    def starting_at(self, t):
+        """Positions of the intervals that start at t."""
+        return self.by_start_[np.searchsorted(self.ts_, t, side='left'):np.searchsorted(self.ts_, t, side='right')]
+
+    def finishing_at(self, t):
+        """Positions of the intervals that finish at t."""
+        return self.by_finish_[np.searchsorted(self.tf_, t, side='left'):np.searchsorted(self.tf_, t, side='right')]
+
+
+def positions_at_times(times, ts, tf, s=None, f=None):
+    """Group the positions of the intervals that contain each of some sorted times.
+
+    Parameters
+    ----------
+    times: array_like
+        Time instants sorted in ascending order.
+
+    ts, tf: numpy.ndarray
+        The starting and finishing times of the intervals.
+
+    s, f: numpy.ndarray or None
+        If the intervals are closed on their start and finish. If None they are considered closed.
+
+    Returns
+    -------
+    offsets, positions: numpy.ndarray
+        The positions of the intervals that contain :code:`times[i]` are :code:`positions[offsets[i]:offsets[i + 1]]`.
+
+    """
+    times = np.asarray(times)
+    if len(times) > 1 and (times[1:] < times[:-1]).any():
+        raise ValueError('times should be sorted in ascending order')
+    lo = np.searchsorted(times, ts, side='left')
+    if s is not None:
+        lo = np.where(s, lo, np.searchsorted(times, ts, side='right'))
+    hi = np.searchsorted(times, tf, side='right')
+    if f is not None:
+        hi = np.where(f, hi, np.searchsorted(times, tf, side='left'))
+
+    counts = np.maximum(hi - lo, 0)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    # The i-th interval contributes to the times lo[i], lo[i] + 1, .., hi[i] - 1
+    first = np.cumsum(counts) - counts
+    sample = np.arange(len(rows)) + np.repeat(lo - first, counts)
+    order = np.argsort(sample, kind='mergesort')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(sample, minlength=len(times)))])
+    return offsets, rows[order]
+
+
+class SegmentIndex(object):
+    """The intervals of a weighted DataFrame as boundary arrays sorted by key and time.
+
+    Over a merged DataFrame the intervals of each key are disjoint, so that these sorted
+    boundaries and their weights are its decomposition into elementary segments.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        With the :code:`key_columns`, ts, tf (and s, f if not discrete) and optionally w.
+
+    key_columns: list
+
+    discrete: Bool
+
+    """
+    def __init__(self, df, key_columns, discrete):
+        from .algorithms.vectorized_interval import key_codes, _bounds
+        lo, lo_r, hi, hi_r = _bounds(df, discrete)
+        keys = [df[c].values for c in key_columns]
+        code = (key_codes(keys) if len(keys) else np.zeros(lo.shape[0], dtype=np.int64))
+        order = np.lexsort((lo_r, lo, code))
+        self.keys_, self.code_ = [k[order] for k in keys], code[order]
+        self.lo_, self.lo_r_, self.hi_, self.hi_r_ = lo[order], lo_r[order], hi[order], hi_r[order]
+        self.w_ = (df['w'].values[order] if 'w' in df.columns else np.ones(len(order), dtype=np.int64))
+        self.starts_, self.ordinals_ = None, None
+
+    def __len__(self):
+        return len(self.lo_)
+
+    def _groups(self):
+        # The first row of the intervals of each key
+        if self.starts_ is None:
+            code = self.code_
+            self.starts_ = np.flatnonzero(np.concatenate([[True], code[1:] != code[:-1]])) if len(code) else np.zeros(0, dtype=np.int64)
+        return self.starts_
+
+    def group_of(self, keys):
+        """The group of each row of some key arrays, as a position among the keys of the index, or -1 if absent."""
+        from .algorithms.vectorized_interval import key_codes
+        starts = self._groups()
+        if not len(self.keys_):
+            return np.full(len(keys[0]) if len(keys) else 0, (0 if len(starts) else -1), dtype=np.int64)
+        # Codes over the keys of the index followed by the queried ones
+        code = key_codes([pd.concat([pd.Series(k[starts]), pd.Series(q)], ignore_index=True).values for k, q in zip(self.keys_, keys)])
+        position = np.full(len(code), -1, dtype=np.int64)
+        position[code[:len(starts)]] = np.arange(len(starts))
+        return position[code[len(starts):]]
+
+    def _ordinals(self):
+        # Each interval start as an integer (group, rank of lo, lo_r), increasing along the rows
+        if self.ordinals_ is None:
+            starts = self._groups()
+            self.times_ = np.unique(self.lo_)
+            self.span_ = 4 * (len(self.times_) + 1)
+            group = np.zeros(len(self), dtype=np.int64)
+            group[starts[1:]] = 1
+            group = np.cumsum(group)
+            self.ordinals_ = group * self.span_ + 4 * np.searchsorted(self.times_, self.lo_) + 2 * self.lo_r_.astype(np.int64)
+        return self.ordinals_
+
+    def last_starting_before(self, group, t, r):
+        """The row of the last interval of each group starting at or before the coordinates :code:`(t, r)`, or -1.
+
+        Parameters
+        ----------
+        group: numpy.ndarray
+            As given by :code:`group_of`.
+
+        t, r: numpy.ndarray
+            The coordinates, where :code:`r` is in {-1, 0, 1}.
+
+        """
+        ordinals = self._ordinals()
+        rank = np.searchsorted(self.times_, t)
+        inside = rank < len(self.times_)
+        exact = np.zeros(len(t), dtype=bool)
+        exact[inside] = self.times_[rank[inside]] == t[inside]
+        # A time between two starts lies between their ordinals
+        query = group * self.span_ + np.where(exact, 4 * rank + 2 * np.asarray(r, dtype=np.int64), 4 * rank - 1)
+        j = np.searchsorted(ordinals, query, side='right') - 1
+        valid = (group >= 0) & (j >= 0)
+        valid[valid] &= j[valid] >= self._groups()[group[valid]]
+        return np.where(valid, j, -1)
@@ -1,20 +1,31 @@
 from __future__ import absolute_import
+import numpy as np
 import pandas as pd
 import operator
 from six import string_types
 from collections import Iterable
-from .algorithms.utils.misc import hinge_loss, truer, min_sumer, oner, first
+from .algorithms.utils.misc import hinge_loss, truer, min_sumer, oner, first, reducer_function, reducer_name
+from .algorithms import vectorized_interval
 from .algorithms.weighted_continuous_interval import merge_no_key, merge_by_key, union_no_key, union_on_key, union_by_key, intersection_no_key, intersection_by_key, intersection_on_key, difference_no_key, difference_by_key, difference_on_key
 from .algorithms.weighted_continuous_interval import issuper_no_key, issuper_by_key, issuper_on_key
 from .algorithms.weighted_continuous_interval import nonempty_intersection_no_key, nonempty_intersection_by_key, nonempty_intersection_on_key
 from .algorithms.weighted_continuous_interval import cartesian_intersection as cartesian_intersection_
 from .algorithms.weighted_continuous_interval import interval_intersection_size as interval_intersection_size_
+from .interval_index import IntervalIndex, SegmentIndex
+from .interval_index import positions_at_times as positions_at_times_
 
 
 class CIntervalWDF(pd.DataFrame):
+    # Merges with a named reducer and set operations by key are computed on sorted arrays, unless set to False.
+    vectorized = True
+    _interval_index = None
+    _segment_index = None
+    _merged = False
+    _sorted_by = None
+
     def __init__(self, *args, **kargs):
         disjoint_intervals = kargs.pop('disjoint_intervals', None)
-        merge_function = kargs.pop('merge_function', None)
+        merge_function = reducer_function(kargs.pop('merge_function', None))
         assert merge_function is None or callable(merge_function)
         super(CIntervalWDF, self).__init__(*args, **kargs)
         assert 'ts' in self.columns
@@ -30,29 +41,33 @@ class CIntervalWDF(pd.DataFrame):
         self.merge_function = (sum if merge_function is None else merge_function)
         if not self.empty:
             from .continuous_interval_df import CIntervalDF
-            if len(args) and isinstance(args[0], CIntervalWDF):
-                self.merge_function = args[0].merge_function
-                if disjoint_intervals is not False:
-                    self.merge(inplace=True)
-            elif isinstance(kargs.get('data', None), CIntervalWDF):
-                self.merge_function = kargs['data'].merge_function
+            data = (args[0] if len(args) else kargs.get('data', None))
+            if isinstance(data, CIntervalWDF):
+                self.merge_function = data.merge_function
+                if set(self.columns) == set(data.columns):
+                    data._inherit_invariants(self)
                 if disjoint_intervals is not False:
                     self.merge(inplace=True)
-            elif len(args) and (isinstance(args[0], CIntervalDF) or isinstance(kargs.get('data', None), CIntervalDF)):
+            elif isinstance(data, CIntervalDF):
+                if set(self.columns) == set(data.columns) | {'w'}:
+                    data._inherit_invariants(self)
                 self.merge(inplace=True)
             elif disjoint_intervals is False:
                 self.merge(inplace=True)
 
     def copy(self, *args, **kargs):
-        return CIntervalWDF(super(CIntervalWDF, self).copy(*args, **kargs))
+        return self._inherit_invariants(CIntervalWDF(super(CIntervalWDF, self).copy(*args, **kargs)))
 
     def drop(self, *args, **kargs):
         merge = kargs.pop('merge', True)
         out = super(CIntervalWDF, self).drop(*args, **kargs)
         if isinstance(out, pd.DataFrame):
             if {'ts', 'tf', 's', 'f'}.issubset(set(out.columns)):
+                rows = set(out.columns) == set(self.columns)
                 if 'w' in out.columns:
-                    out = CIntervalWDF(out, disjoint_intervals=(not merge), merge_function=self.merge_function)
+                    out = CIntervalWDF(out, disjoint_intervals=(not merge or (rows and self._merged)), merge_function=self.merge_function)
+                    if rows:
+                        self._inherit_invariants(out)
                 else:
                     from stream_graph.base.dataframes import CIntervalDF
                     out = CIntervalDF(out, disjoint_intervals=(not merge))
@@ -77,11 +92,16 @@ class CIntervalWDF(pd.DataFrame):
         out = super(CIntervalWDF, self).__getitem__(index)
         if isinstance(out, pd.DataFrame):
             if {'ts', 'tf', 's', 'f'}.issubset(set(out.columns)):
+                rows = set(out.columns) == set(self.columns)
                 if 'w' in out.columns:
                     # do you need to transfer merge_function?
-                    out = self.__class__(out, disjoint_intervals=(set(out.columns) == set(self.columns)), merge_function=self.merge_function)
+                    out = self.__class__(out, disjoint_intervals=rows, merge_function=self.merge_function)
+                    if rows:
+                        # A slice with a negative step reverses the rows.
+                        ordered = (not isinstance(index, slice) or index.step is None or index.step > 0)
+                        self._inherit_invariants(out, ordered)
                 else:
-                    from stream_graph.base.dataframe import CIntervalDF
+                    from .continuous_interval_df import CIntervalDF
                     out = CIntervalDF(out, disjoint_intervals=False)
             # else 'ts' in out.columns:
             #     if 'w' in out.columns:
@@ -123,14 +143,23 @@ class CIntervalWDF(pd.DataFrame):
 
     def measure_time(self, weights=False):
         if weights:
-            return (self.tf - self.ts) * self.w.sum()
+            return ((self.tf - self.ts) * self.w).sum()
         else:
             return (self.tf - self.ts).sum()
 
     def sort_values(self, by, axis=0, ascending=True, inplace=False, kind='quicksort', na_position='last'):
+        by = ([by] if isinstance(by, string_types) else list(by))
+        sorted_by = (by if ascending is True and axis in [0, 'index'] else None)
+        if sorted_by is not None and self._sorted_by == sorted_by:
+            return (None if inplace else self.copy())
+        merged = self._merged
         df = super(self.__class__, self).sort_values(by, axis, ascending, inplace, kind, na_position)
-        if not inplace:
-            return self.__class__(df, merge_function=self.merge_function)
+        if inplace:
+            self._merged, self._sorted_by = merged, sorted_by
+        else:
+            df = self.__class__(df, merge_function=self.merge_function)
+            df._merged, df._sorted_by = merged, sorted_by
+            return df
 
     def df_at(self, t):
         return self[self.index_at(t)]
@@ -139,43 +168,134 @@ class CIntervalWDF(pd.DataFrame):
         return self[self.index_at_interval(ts, tf)]
 
     def count_at(self, t, weights=False):
+        positions = self.interval_index.covering(t, t, strict=False)
         if weights:
-            return self.w[self.index_at(t)].sum()
+            return self.w.values[positions].sum()
         else:
-            return self.index_at(t).sum()
+            return len(positions)
 
     def index_at(self, t):
-        return (self.ts <= t) & (self.tf >= t)
+        return self._positions_mask(self.interval_index.covering(t, t, strict=False))
 
     def index_at_interval(self, ts, tf, it=None):
         assert ts <= tf
         l, r = (it in ['left', 'both'], it in ['right', 'both'])
-        return ((self.ts < ts) & (self.tf > tf)) | ((self.s | l) & (self.ts == ts)) | ((self.f | r) & (self.tf == tf))
+        idx = self.interval_index
+        starting, finishing = idx.starting_at(ts), idx.finishing_at(tf)
+        if not l:
+            starting = starting[self.s.values[starting]]
+        if not r:
+            finishing = finishing[self.f.values[finishing]]
+        return self._positions_mask(np.concatenate([idx.covering(ts, tf), starting, finishing]))
+
+    def positions_at_times(self, times):
+        return positions_at_times_(times, self.ts.values, self.tf.values)
+
+    def _clear_item_cache(self, *args, **kargs):
+        # Mutations through setitem, loc/iloc and inplace updates pass from here: drop the indexes and the invariants.
+        self._interval_index = None
+        self._segment_index = None
+        self._merged, self._sorted_by = False, None
+        return super(CIntervalWDF, self)._clear_item_cache(*args, **kargs)
+
+    def _set_value(self, *args, **kargs):
+        # While at/iat write on the cached columns, without clearing them.
+        self._clear_item_cache()
+        return super(CIntervalWDF, self)._set_value(*args, **kargs)
+
+    def _maybe_cache_changed(self, *args, **kargs):
+        # As do chained writes on a cached column, e.g. df['tf'][0] = 9.
+        self._clear_item_cache()
+        return super(CIntervalWDF, self)._maybe_cache_changed(*args, **kargs)
+
+    @property
+    def is_merged(self):
+        """If the intervals of each key are known to be disjoint, as left by a merge."""
+        return self._merged
+
+    @property
+    def sorted_by(self):
+        """The columns by which the rows are known to be sorted, or None."""
+        return self._sorted_by
 
-    def _save_or_return(self, df, inplace, on_column, disjoint_intervals=True):
+    def _inherit_invariants(self, df, ordered=True):
+        # The rows of a frame keep its invariants, but are only sorted if kept in the same order.
+        df._merged, df._sorted_by = self._merged, (self._sorted_by if ordered else None)
+        return df
+
+    @property
+    def interval_index(self):
+        """A sorted-endpoint index of the intervals, built on first use."""
+        if self._interval_index is None:
+            self._interval_index = IntervalIndex(self.ts.values, self.tf.values)
+        return self._interval_index
+
+    def segment_index(self, key_columns):
+        """The intervals sorted by key and time, as used by the weighted set operations, built on first use.
+
+        Parameters
+        ----------
+        key_columns: list
+
+        Returns
+        -------
+        segment_index: SegmentIndex
+            Cached for each list of key columns, until the frame is mutated. Writes on the
+            arrays of its columns (e.g. through :code:`df.ts.values`) are not detected.
+
+        """
+        if self._segment_index is None:
+            self._segment_index = dict()
+        key = tuple(key_columns)
+        if key not in self._segment_index:
+            self._segment_index[key] = SegmentIndex(self, key_columns, False)
+        return self._segment_index[key]
+
+    def _weighted_operation(self, dfb, on_column, operation, function):
+        ib = (dfb.segment_index(on_column) if isinstance(dfb, CIntervalWDF) else SegmentIndex(dfb, on_column, False))
+        keys, ts, tf, s, f, w = vectorized_interval.weighted_operation(self.segment_index(on_column), ib, False, operation, function)
+        return pd.DataFrame(dict(zip(on_column, keys), ts=ts, tf=tf, s=s, f=f, w=w), columns=on_column + ['ts', 'tf', 's', 'f', 'w'])
+
+    def _positions_mask(self, positions):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[positions] = True
+        return pd.Series(mask, index=self.index)
+
+    def _save_or_return(self, df, inplace, on_column=None, disjoint_intervals=True, merged=False):
         if df is None:
             df = self.__class__(columns=self.columns, merge_function=self.merge_function)
-        elif isinstance(df, list):
+        elif isinstance(df, (list, pd.DataFrame)) and not isinstance(df, self.__class__):
             df = self.__class__(df, columns=on_column + ['ts', 'tf', 's', 'f', 'w'], disjoint_intervals=disjoint_intervals, merge_function=self.merge_function)
 
         if inplace and df is not self:
-            return self._update_inplace(df._data)
+            self._update_inplace(df._data)
+            self._merged = merged
+        elif df is self:
+            return df.copy()
         else:
-            return (df.copy() if df is self else df)
+            df._merged = merged
+            return df
 
     def merge(self, inplace=False):
+        if self._merged:
+            return (None if inplace else self.copy())
         on_column = self.get_ni_columns(None)
 
-        if not len(on_column):
+        reducer = reducer_name(self.merge_function)
+        if self.vectorized and reducer is not None:
+            df = vectorized_interval.weighted_merge(self, on_column, discrete=False, reducer=reducer)
+        elif not len(on_column):
             df = merge_no_key(self, self.merge_function)
         else:
             df = merge_by_key(self, self.merge_function)
 
-        return self._save_or_return(df, inplace, on_column)
+        return self._save_or_return(df, inplace, on_column, merged=True)
 
     def union(self, df, on_column=None, by_key=True, inplace=False, union_function=None):
         if df.empty:
             return self._save_or_return(self, inplace)
+        elif self.empty:
+            return self._save_or_return(self.__class__(df, merge_function=self.merge_function), inplace)
 
         assert not (not by_key and df is None)
 
@@ -185,7 +305,10 @@ class CIntervalWDF(pd.DataFrame):
             assert callable(union_function)
 
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized and (by_key or not len(on_column)):
+            df = self._weighted_operation(df, on_column, 'union', union_function)
+            return self._save_or_return(df, inplace, on_column, merged=True)
+        elif not len(on_column):
             df = union_no_key(self, df, union_function)
         elif by_key:
             df = union_by_key(self, df, union_function)
@@ -195,7 +318,7 @@ class CIntervalWDF(pd.DataFrame):
 
     def intersection(self, dfb, on_column=None, by_key=True, inplace=False, intersection_function=None):
         # Maybe allow signalling of ignore value with None
-        if dfb.empty:
+        if self.empty or dfb.empty:
             return self._save_or_return(None, inplace)
 
         assert not (not by_key and dfb is None)
@@ -208,7 +331,10 @@ class CIntervalWDF(pd.DataFrame):
             assert callable(intersection_function)
 
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized and (by_key or not len(on_column)):
+            df = self._weighted_operation(dfb, on_column, 'intersection', intersection_function)
+            return self._save_or_return(df, inplace, on_column, merged=True)
+        elif not len(on_column):
             df = intersection_no_key(self, dfb, intersection_function)
         elif by_key:
             df = intersection_by_key(self, dfb, intersection_function)
@@ -227,7 +353,10 @@ class CIntervalWDF(pd.DataFrame):
             assert callable(difference_function)
 
         on_column = self.get_ni_columns(on_column)
-        if not len(on_column):
+        if self.vectorized and (by_key or not len(on_column)):
+            df = self._weighted_operation(dfb, on_column, 'difference', difference_function)
+            return self._save_or_return(df, inplace, on_column, merged=True)
+        elif not len(on_column):
             df = difference_no_key(self, dfb, difference_function)
         elif by_key:
             df = difference_by_key(self, dfb, difference_function)
@@ -12,13 +12,14 @@ from .algorithms.weighted_instantaneous import difference_by_key as difference_b
 from .algorithms.weighted_instantaneous import difference_on_key as difference_on_key_
 from .algorithms.weighted_instantaneous import issuper_by_key, issuper_on_key
 from .algorithms.weighted_instantaneous import nonempty_intersection_by_key, nonempty_intersection_on_key
-from .algorithms.utils.misc import hinge_loss, noner, min_sumer
+from .algorithms.utils.misc import hinge_loss, noner, min_sumer, reducer_function, reducer_name
+from .interval_index import positions_at_times as positions_at_times_
 
 
 class InstantaneousWDF(pd.DataFrame):
     def __init__(self, *args, **kargs):
         no_duplicates = kargs.pop('no_duplicates', None)
-        merge_function = kargs.pop('merge_function', None)
+        merge_function = reducer_function(kargs.pop('merge_function', None))
         assert merge_function is None or callable(merge_function)
         super(self.__class__, self).__init__(*args, **kargs)
         assert 'ts' in self.columns
@@ -113,10 +114,13 @@ class InstantaneousWDF(pd.DataFrame):
     def index_at(self, t):
         return (self.ts == t)
 
+    def positions_at_times(self, times):
+        return positions_at_times_(times, self.ts.values, self.ts.values)
+
     def _save_or_return(self, df, inplace, on_column=None, no_duplicates=True):
         if df is None:
             df = InstantaneousWDF(columns=self.columns, merge_function=self.merge_function)
-        elif isinstance(df, list):
+        elif isinstance(df, (list, pd.DataFrame)) and not isinstance(df, self.__class__):
             assert on_column is not None
             df = self.__class__(df, columns=on_column + ['ts', 'w'], no_duplicates=no_duplicates, merge_function=self.merge_function)
 
@@ -131,6 +135,11 @@ class InstantaneousWDF(pd.DataFrame):
 
         on_column, _ = self.get_ni_columns(None)
         columns = on_column + ['ts', 'w']
+        reducer = reducer_name(self.merge_function)
+        if reducer is not None:
+            df = pd.DataFrame(self[columns]).groupby(on_column + ['ts'], sort=False, observed=True)['w'].agg(reducer).reset_index()
+            return self._save_or_return(df, inplace, on_column=on_column)
+
         data = defaultdict(list)
         for key in self[columns].itertuples(weights=True):
             data[key[:-1]].append(key[-1])
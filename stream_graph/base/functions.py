@@ -1,6 +1,15 @@
+import heapq
 from collections import deque, defaultdict
+from multiprocessing import Pool, cpu_count
+
+import pandas as pd
+from six import iteritems
 from stream_graph.collections import TimeCollection
 from stream_graph.exceptions import UnrecognizedDirection
+try:
+    from stream_graph._c_functions import EgoLines, ego_c, ego_at_c
+except ImportError:
+    EgoLines, ego_c, ego_at_c = None, None, None
 
 
 def ego(e, ne, l, both, detailed, discrete):
@@ -178,154 +187,222 @@ def ego_at(e, ne, l, at, both, detailed, discrete):
     return (prev[1] if prev is not None else .0)
 
 
-def get_maximal_cliques(df, direction='both'):
-    S, S_set, R, times, nodes = deque(), set(), set(), dict(), dict()
-
-    if direction == 'out':
-        def as_link(u, v):
-            return (u, v)
-
-        def add_nodes(u, v):
-            nodes[u].add(v)
-
-        def add_element(times, l, ts, tf):
-            times[l].append((ts, tf))
-            return True
-    elif direction == 'in':
-        def as_link(u, v):
-            return (v, u)
-
-        def add_nodes(u, v):
-            nodes[v].add(u)
-
-        def add_element(times, l, ts, tf):
-            times[l].append((ts, tf))
-            return True
-    elif direction == 'both':
-        def as_link(u, v):
-            return frozenset([u, v])
-
-        def add_nodes(u, v):
-            nodes[v].add(u)
-            nodes[u].add(v)
-
-        def add_element(times, l, ts, tf):
-            if len(times[l]):
-                tsp, tfp = times[l][-1]
-                assert ts >= tsp
-                if ts <= tfp:
-                    times[l][-1] = (tsp, max(tf, tfp))
-                    return False
-            times[l].append((ts, tf))
-            return True
+_ego_lines = None
+
+
+def _ego_initializer(lines):
+    # The lines are sent once to each worker and not once per node
+    global _ego_lines
+    _ego_lines = (EgoLines(lines) if EgoLines is not None and lines is not None else lines)
+
+
+def _ego_task(args):
+    e, ne, at, both, detailed, discrete = args
+    return e, ego_of(e, ne, _ego_lines, at, both, detailed, discrete)
+
+
+def ego_of(e, ne, l, at, both, detailed, discrete):
+    """Compute the ego-betweeness of a node with the C++ implementation if available.
+
+    If :code:`l` is a list of lines it is coded as :code:`EgoLines` for the C++ implementation,
+    which should be done once when the same lines are used for many nodes.
+
+    """
+    if EgoLines is not None and not isinstance(l, EgoLines):
+        l = EgoLines(l)
+    if isinstance(l, list):
+        if at is None:
+            return ego(e, ne, l, both, detailed, discrete)
+        else:
+            return ego_at(e, ne, l, at, both, detailed, discrete)
+    elif at is None:
+        return ego_c(e, ne, l, both, detailed, discrete)
     else:
+        return ego_at_c(e, ne, l, at, both, detailed, discrete)
+
+
+def ego_all(neighbors, lines, at, both, detailed, discrete, n_jobs=None):
+    """Compute the ego-betweeness of all nodes, optionally over a pool of processes.
+
+    Parameters
+    ----------
+    neighbors : dict
+        A set of neighbors for each node.
+
+    lines : list
+        Of :code:`(u, v, ts)` tuples sorted by time.
+
+    at : Real or None
+        If not None, the ego-betweeness is computed only at this time.
+
+    n_jobs : int or None, default=None
+        The number of worker processes. If None the computation is sequential and
+        if -1 all available cpus are used.
+
+    Returns
+    -------
+    ego : dict
+        The ego-betweeness of each node.
+
+    """
+    tasks = [(u, ne, at, both, detailed, discrete) for u, ne in neighbors.items()]
+    if n_jobs == -1:
+        n_jobs = cpu_count()
+    if n_jobs is None or n_jobs <= 1 or len(tasks) <= 1:
+        _ego_initializer(lines)
+        try:
+            return dict(_ego_task(task) for task in tasks)
+        finally:
+            _ego_initializer(None)
+
+    n_jobs = min(n_jobs, len(tasks))
+    pool = Pool(n_jobs, initializer=_ego_initializer, initargs=(lines,))
+    try:
+        return dict(pool.imap_unordered(_ego_task, tasks, chunksize=max(1, len(tasks) // (4 * n_jobs))))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def get_maximal_cliques(df, direction='both'):
+    """Enumerate the maximal cliques of a link stream.
+
+    Cliques are grown from the start of each link instance, by adding nodes and by
+    extending their finishing time. A clique never changes its starting time, so the
+    cliques that start at the same time are grown together over a snapshot of the
+    links present at that time, maintained by a sweep over the link instances.
+    Nodes are coded as integers and each clique keeps its time bound and the finishing
+    time of each candidate node, which are updated incrementally as nodes are added.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        With columns u, v, ts, tf sorted by ts, tf.
+
+    direction : str, default='both'
+        One of 'out', 'in' and 'both'.
+
+    Returns
+    -------
+    cliques : set
+        Of :code:`(frozenset(nodes), (ts, tf))` tuples.
+
+    """
+    if direction not in ['out', 'in', 'both']:
         raise UnrecognizedDirection()
 
-    times, nodes = defaultdict(list), defaultdict(set)
-    for u, v, ts, tf, in df[['u', 'v', 'ts', 'tf']].itertuples(index=False, name=None):
-        # This a new instance
-        add_nodes(u, v)
-        if add_element(times, as_link(u, v), ts, tf):
-            add_clique((frozenset([u, v]), (ts, ts), set()), S, S_set)
-
-    while len(S) != 0:
-        cnds, (ts, tf), can = S.pop()
-        is_max = True
-
-        # Grow time on the right side
-        td = getTd(cnds, ts, tf, as_link, times)
-        if td != tf:
-            # nodes, (ts, tf), candidates
-            add_clique((cnds, (ts, td), can), S, S_set)
-            is_max = False
-
-        # Grow node set
-        can = set(can)
-        if ts == tf:
-            for u in cnds:
-                neighbors = nodes[u]
-                for n in neighbors:
-                    can.add(n)
-        can -= cnds
-
-        for node in can:
-            if isClique(cnds, node, ts, tf, as_link, times):
-                # Is clique!
-                Xnew = set(cnds) | set([node])
-                add_clique((frozenset(Xnew), (ts, tf), can), S, S_set)
+    n = df.shape[0]
+    codes, labels = pd.factorize(pd.concat([df['u'], df['v']], ignore_index=True))
+    us, vs = codes[:n].tolist(), codes[n:].tolist()
+    if direction == 'in':
+        us, vs = vs, us
+
+    if direction == 'both':
+        def clique_link(a, b):
+            return ((a, b) if a <= b else (b, a))
+    elif direction == 'out':
+        def clique_link(a, b):
+            return (a, b)
+    else:
+        def clique_link(a, b):
+            return (b, a)
+
+    # Link instances, where the overlapping instances of an undirected link are merged
+    links, ts, tf, last = list(), list(), list(), dict()
+    for u, v, s, f in zip(us, vs, df['ts'].values.tolist(), df['tf'].values.tolist()):
+        link = (clique_link(u, v) if direction == 'both' else (u, v))
+        i = last.get(link)
+        if direction == 'both' and i is not None and s <= tf[i]:
+            tf[i] = max(tf[i], f)
+        else:
+            last[link] = len(links)
+            links.append(link)
+            ts.append(s)
+            tf.append(f)
+
+    starting = defaultdict(list)
+    for i, s in enumerate(ts):
+        starting[s].append(i)
+    by_start = sorted(range(len(ts)), key=ts.__getitem__)
+
+    # The snapshot: the finishing time of the links present, the neighbors of each node
+    # and the nodes x for which clique_link(u, x) is present
+    active, neighbors, finish, pointer = dict(), defaultdict(set), list(), 0
+    linked = (defaultdict(set) if direction == 'in' else neighbors)
+    inf = float('inf')
+
+    def end(a, b):
+        return active.get(clique_link(a, b), -inf)
+
+    def bound_with(cnds, x, bound):
+        # The earliest finishing time of the links among the nodes, in any direction
+        for y in cnds:
+            for link in [(x, y), (y, x)]:
+                if link in active:
+                    bound = min(bound, active[link])
+        return min(bound, active.get((x, x), inf))
+
+    cliques = set()
+    for t in sorted(starting):
+        while pointer < len(by_start) and ts[by_start[pointer]] <= t:
+            i = by_start[pointer]
+            active[links[i]] = tf[i]
+            neighbors[links[i][0]].add(links[i][1])
+            if direction == 'both':
+                neighbors[links[i][1]].add(links[i][0])
+            elif direction == 'in':
+                linked[links[i][1]].add(links[i][0])
+            heapq.heappush(finish, (tf[i], i))
+            pointer += 1
+        while len(finish) and finish[0][0] < t:
+            f, i = heapq.heappop(finish)
+            if active.get(links[i]) == f:
+                del active[links[i]]
+                neighbors[links[i][0]].discard(links[i][1])
+                if direction == 'both':
+                    neighbors[links[i][1]].discard(links[i][0])
+                elif direction == 'in':
+                    linked[links[i][1]].discard(links[i][0])
+
+        # Grow the cliques that start at t in breadth first order
+        S, S_set = deque(), set()
+
+        def add_clique(cnds, f, can, bound):
+            if (cnds, f) not in S_set:
+                S.appendleft((cnds, f, can, bound))
+                S_set.add((cnds, f))
+
+        for i in starting[t]:
+            u, v = links[i]
+            add_clique(frozenset([u, v]), t, dict(), bound_with([v], u, active.get((v, v), inf)))
+
+        while len(S):
+            cnds, f, can, bound = S.pop()
+            is_max = True
+
+            # Grow time on the right side
+            if bound != f:
+                add_clique(cnds, bound, can, bound)
+                is_max = False
+
+            # Grow node set, keeping only the candidates that form a clique until f
+            can = dict(can)
+            if t == f:
+                pool = set.intersection(*[linked[u] for u in cnds]) - cnds
+                if direction == 'in':
+                    pool &= set.union(*[neighbors[u] for u in cnds])
+                for x in pool:
+                    if x not in can:
+                        can[x] = min(end(y, x) for y in cnds)
+            can = {x: e for x, e in iteritems(can) if e >= f and x not in cnds}
+
+            for x in can:
+                new_can = {y: min(e, end(x, y)) for y, e in iteritems(can) if y != x}
+                add_clique(cnds | {x}, f, {y: e for y, e in iteritems(new_can) if e >= f}, bound_with(cnds, x, bound))
                 is_max = False
 
-        if is_max:
-            R.add((cnds, (ts, tf)))
-    return R
-
-
-def getTd(can, tb, te, as_link, times):
-    min_t = None
-    for u in can:
-        for v in can:
-            link = as_link(u, v)
-            if link in times:
-                # Find min time x > te s.t. (b,x,u,v) exists in stream
-                tlist = times[link]
-                first, last = 0, len(tlist) - 1
-                middle = int((first + last) / 2.0)
-
-                while first <= last:
-                    if tlist[middle][0] > tb:
-                        last = middle - 1
-                    elif tlist[middle][1] < tb:
-                        first = middle + 1
-                    else:
-                        # found a link that contains b
-                        assert tlist[middle][0] <= tb and tlist[middle][1] >= tb
-                        assert tlist[middle][1] >= te
-                        if min_t is not None:
-                            min_t = min(min_t, tlist[middle][1])
-                        else:
-                            min_t = tlist[middle][1]
-                        break
-                    middle = (first + last) // 2
-
-                # We should not be here except for a break in the while loop above
-                if not first <= last:
-                    assert False
-    return min_t
-
-
-def isClique(cnds, node, tb, te, as_link, times):
-    """ returns True if X(c) union node is a clique over tb;te, False otherwise"""
-    for i in cnds:
-        if as_link(i, node) not in times:
-            # Check that (i, node) exists in stream.
-            return False
-        else:
-            link = as_link(i, node)
-            # Check there is a link (b, e, i, node) s.t. b <= tb and e >= te, otherwise not a clique.
-            # tlist is a list of non-overlapping couples (b,e)
-            tlist = times[link]
-            # start binary search for b in tlist
-            first, last = 0, len(tlist) - 1
-            middle = (first + last) // 2
-            while first <= last:
-                if tlist[middle][0] > tb:
-                    last = middle - 1
-                elif tlist[middle][1] < tb:
-                    first = middle + 1
-                else:
-                    # found a link that contains b
-                    assert tlist[middle][0] <= tb and tlist[middle][1] >= tb
-                    if tlist[middle][1] < te:
-                        return False
-                    break
-                middle = (first + last) // 2
-            # if we are here without having found a link that contains self._tb
-            if first > last:
-                return False
-    return True
-
-
-def add_clique(c, S, S_set):
-    if c[0:2] not in S_set:
-        S.appendleft(c)
-        S_set.add(c[0:2])
+            if is_max:
+                cliques.add((cnds, (t, f)))
+
+    labels = labels.tolist()
+    return set((frozenset(labels[u] for u in cnds), tb) for cnds, tb in cliques)
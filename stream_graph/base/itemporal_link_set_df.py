@@ -15,11 +15,14 @@ from stream_graph import ABC
 from .itemporal_node_set_df import ITemporalNodeSetDF
 from .link_set_df import LinkSetDF
 from .node_set_s import NodeSetS
+from .node_dictionary import get_node_dictionary
+from .storage import save_df, load_df
+from .windows import window_metrics as window_metrics_
 from .temporal_node_set_b import TemporalNodeSetB
 from .temporal_link_set_df import TemporalLinkSetDF
 from .itime_set_s import ITimeSetS
 from .time_set_df import TimeSetDF
-from .multi_df_utils import load_instantaneous_df, class_interval_df, weighted_iter
+from .multi_df_utils import load_instantaneous_df, init_instantaneous_df, class_interval_df, weighted_iter
 from stream_graph.collections import NodeCollection
 from stream_graph.collections import LinkCollection
 from stream_graph.collections import TimeGenerator
@@ -50,15 +53,19 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
 
     weighted : bool, or default=None.
 
-    merge_function : A function applied to a list of arguments.
+    merge_function : A function applied to a list of arguments, or one of {'sum', 'max', 'min', 'mean', 'count'}.
+        Named merge functions (as well as the builtins sum, max, min and len) are vectorized.
 
     operation_functions: dict {str: fun}
         A dictionary of names of operations, i.e. :code:`union/u`, :code:`intersection/i`, :code:`difference/d`, :code:`issuperset/s'.
         All function should be applicable between two weights.
         Default: +, min, hinge_loss (ignoring an interval on zero), operator.ge (ignoring an interval on zero)
 
+    node_dictionary: NodeDictionary, default=None
+        If given, node columns are stored as codes of this dictionary.
+
     """
-    def __init__(self, df=None, no_duplicates=True, sort_by=None, discrete=None, weighted=None, merge_function=None, operation_functions=None):
+    def __init__(self, df=None, no_duplicates=True, sort_by=None, discrete=None, weighted=None, merge_function=None, operation_functions=None, node_dictionary=None):
         if isinstance(df, self.__class__):
             # If we have an instance of the same class copy its elements.
             self.discrete_ = df.discrete
@@ -73,7 +80,7 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
             if df is not None:
                 self.df_ = df
                 self.sort_by = sort_by
-                if self.df_['ts'].dtype.kind != 'i' and self.df_['tf'].dtype.kind != 'i':
+                if self.df_['ts'].dtype.kind != 'i':
                     # If time cannot be not discrete
                     if discrete is None:
                         # Auto-assign to discrete only if not assigned.
@@ -89,10 +96,60 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
                     self.algebra = make_algebra(operation_functions)
             else:
                 self.discrete_ = True if discrete is None else discrete
+        if node_dictionary is not None and bool(self):
+            self.df_ = node_dictionary.encode_df(self.df_, ['u', 'v'])
+
+    def save(self, path):
+        """Save the temporal-link-set as a directory of numpy arrays.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        header = {'class': self.__class__.__name__, 'discrete': self.discrete, 'weighted': self.weighted}
+        if bool(self):
+            header['sort_by'], header['sorted'] = self.sort_by, self.is_sorted_
+        save_df(path, (self.df_ if bool(self) else None), **header)
+
+    @classmethod
+    def load(cls, path, mmap=True, merge_function=None, operation_functions=None):
+        """Load a temporal-link-set saved with :code:`save`.
+
+        Instants are known to be unique and sorted as they were saved, so that no check is repeated.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays are memory-mapped instead of read.
+
+        merge_function: A function applied to a list of arguments.
+
+        operation_functions: dict {str: fun}
+
+        """
+        df, header = load_df(path, mmap)
+        obj = cls(discrete=header['discrete'])
+        obj.weighted_ = header['weighted']
+        if df is not None:
+            obj.df_ = init_instantaneous_df(df, weighted=obj.weighted_, keys=['u', 'v'], merge_function=merge_function)
+            obj.sort_by, obj.sorted_ = header['sort_by'], header['sorted']
+            if obj.weighted_:
+                obj.algebra = make_algebra(operation_functions)
+        return obj
 
     def __bool__(self):
         return hasattr(self, 'df_') and not self.df_.empty
 
+    @property
+    def node_dictionary(self):
+        if bool(self):
+            return get_node_dictionary(self.df_)
+
     @property
     def weighted(self):
         return self.weighted_
@@ -211,6 +268,31 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
         else:
             return 0
 
+    def window_metrics(self, size, times=None, step=None, metrics=('m', 'n')):
+        """Compute the number of links, of nodes and other metrics over sliding windows.
+
+        Parameters
+        ----------
+        size: Real or Iterable
+            The size of the windows :math:`(t - size, t]`, or a list of them.
+
+        times: Iterable, default=None
+            The ending times of the windows. If None, from the first to the last time every :code:`step`.
+
+        step: Real, default=None
+            If None it is equal to :code:`size`.
+
+        metrics: Iterable, default=('m', 'n')
+            Any of 'm', 'n', 'interactions', 'density', 'degree'.
+
+        Returns
+        -------
+        metrics: dict
+            A TimeCollection for each metric, or if :code:`size` is a list such a dictionary for each size.
+
+        """
+        return window_metrics_((self.df if bool(self) else None), size, times, step, metrics, self.discrete)
+
     @property
     def _weighted_number_of_interactions(self):
         return self.df.w.sum()
@@ -274,7 +356,9 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
         else:
             return iter([])
 
-    def links_at(self, t=None):
+    def links_at(self, t=None, times=None):
+        if times is not None:
+            return self._links_at_times(times)
         if not bool(self):
             if t is None:
                 return iter()
@@ -318,6 +402,14 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
             else:
                 return LinkSetDF(self.df.df_at(t).drop(columns=['ts']), no_duplicates=False, weighted=self.weighted)
 
+    def _links_at_times(self, times):
+        if not bool(self):
+            return TimeCollection(((t, LinkSetDF()) for t in times), discrete=self.discrete, instantaneous=True)
+        offsets, positions = self.df.positions_at_times(times)
+        df = DF(self.df.drop(columns=['ts']))
+        return TimeCollection(((t, LinkSetDF(df.iloc[positions[offsets[i]:offsets[i + 1]]], no_duplicates=False, weighted=self.weighted))
+                               for i, t in enumerate(times)), discrete=self.discrete, instantaneous=True)
+
     def neighbors_at(self, u=None, t=None, direction='out'):
         if not bool(self):
             if u is None:
@@ -383,7 +475,7 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
             if t is None:
                 return ITemporalNodeSetDF(df[['u', 'ts']], no_duplicates=di, discrete=self.discrete).nodes_at(t=None)
             else:
-                return NodeSetS(df.df_at(t).u.values.flat)
+                return NodeSetS(df.df_at(t).u.values)
 
     def _m_at_unweighted(self, t):
         if t is None:
@@ -522,7 +614,7 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
                     dt[ts].add(u)
                 return TimeCollection(sorted(list((ts, len(us)) for ts, us in iteritems(dt))), discrete=self.discrete, instantaneous=True)
             else:
-                return len(set(df.df_at(t).u.values.flat))
+                return len(set(df.df_at(t).u.values))
 
     def _degree_at_weighted(self, u, t, direction):
         if u is None:
@@ -913,29 +1005,25 @@ class ITemporalLinkSetDF(ABC.ITemporalLinkSet):
 
         return TemporalLinkSetDF(df, disjoint_intervals=(di and not self.discrete), discrete=self.discrete, weighted=False).get_maximal_cliques(direction=direction)
 
-    def ego_betweeness(self, u=None, t=None, direction='both', detailed=False):
+    def ego_betweeness(self, u=None, t=None, direction='both', detailed=False, n_jobs=None):
         df = self.sort_df('ts')
         both = direction == 'both'
         df = (df.rename(columns={'u': 'v', 'v': 'u'}) if direction == 'in' else df)
         lines = list(key for key in df[['u', 'v', 'ts']].itertuples(index=False, name=None))
         if u is None:
             neigh = {u: n.nodes_ for u, n in self.linkset.neighbors_of(direction=direction)}
-            if t is None:
-                return NodeCollection({u: functions.ego(u, neigh.get(u, set()), lines, both, detailed, self.discrete) for u in self.nodeset})
-            else:
-                return NodeCollection({u: functions.ego_at(u, neigh.get(u, set()), lines, t, both, detailed, self.discrete) for u in self.nodeset})
-        elif t is None:
-            return functions.ego(u, self.linkset.neighbors_of(u, direction=direction).nodes_, lines, both, detailed, self.discrete)
+            neigh = {u: neigh.get(u, set()) for u in self.nodeset}
+            return NodeCollection(functions.ego_all(neigh, lines, t, both, detailed, self.discrete, n_jobs=n_jobs))
         else:
-            return functions.ego_at(u, self.linkset.neighbors_of(u, direction=direction).nodes_, lines, t, both, detailed, self.discrete)
+            return functions.ego_of(u, self.linkset.neighbors_of(u, direction=direction).nodes_, lines, t, both, detailed, self.discrete)
 
-    def closeness(self, u=None, t=None, direction='both', detailed=False):
+    def closeness(self, u=None, t=None, direction='both', detailed=False, n_jobs=None):
         from stream_graph._c_functions import closeness_c
         assert self.df_['ts'].dtype.kind == 'i'
         df = self.sort_df('ts')
         both = direction == 'both'
         df = (df.rename(columns={'u': 'v', 'v': 'u'}) if direction == 'in' else df)
-        return closeness_c(u, t, df[['u', 'v', 'ts']], both, detailed, discrete=self.discrete)
+        return closeness_c(u, t, df[['u', 'v', 'ts']], both, detailed, discrete=self.discrete, n_jobs=n_jobs)
 
     def _to_discrete(self, bins, bin_size):
         df, bins = time_discretizer_df(self.df, bins, bin_size, columns=['ts'])
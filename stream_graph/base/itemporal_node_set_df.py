@@ -6,12 +6,15 @@ from collections import Counter, Iterable
 from six import iteritems
 from itertools import combinations
 
+import numpy as np
+
 from . import utils
 from .utils import time_discretizer_df, ts_to_df, t_in
 from stream_graph import ABC
 from .multi_df_utils import init_instantaneous_df, load_instantaneous_df
 from .node_set_s import NodeSetS
 from .itime_set_s import ITimeSetS
+from .storage import save_df, load_df
 from stream_graph.exceptions import UnrecognizedTemporalNodeSet, UnrecognizedNodeSet, UnrecognizedTimeSet
 from stream_graph.collections import TimeCollection
 from stream_graph.collections import TimeGenerator
@@ -55,6 +58,42 @@ class ITemporalNodeSetDF(ABC.ITemporalNodeSet):
         # If dscrete is not initialized, set it to the default value 1.
         self.discrete_ = True if discrete is None else discrete
 
+    def save(self, path):
+        """Save the temporal-node-set as a directory of numpy arrays.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        header = {'class': self.__class__.__name__, 'discrete': self.discrete}
+        if bool(self):
+            header['sort_by'], header['sorted'] = self.sort_by, self.is_sorted_
+        save_df(path, (self.df_ if bool(self) else None), **header)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a temporal-node-set saved with :code:`save`.
+
+        Instants are known to be unique and sorted as they were saved, so that no check is repeated.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays are memory-mapped instead of read.
+
+        """
+        df, header = load_df(path, mmap)
+        obj = cls(discrete=header['discrete'])
+        if df is not None:
+            obj.df_ = init_instantaneous_df(df, keys=['u'])
+            obj.sort_by, obj.sorted_ = header['sort_by'], header['sorted']
+        return obj
+
     @property
     def discrete(self):
         return self.discrete_
@@ -231,7 +270,13 @@ class ITemporalNodeSetDF(ABC.ITemporalNodeSet):
             else:
                 return NodeSetS()
 
-    def nodes_at(self, t=None):
+    def nodes_at(self, t=None, times=None):
+        if times is not None:
+            if not bool(self):
+                return TimeCollection(((t, NodeSetS()) for t in times), discrete=self.discrete, instantaneous=True)
+            offsets, positions = self.df.positions_at_times(times)
+            nodes = self.df.u.values[positions]
+            return TimeCollection(((t, NodeSetS(nodes[offsets[i]:offsets[i + 1]])) for i, t in enumerate(times)), discrete=self.discrete, instantaneous=True)
         if bool(self):
             if t is None:
                 def generate(iter_):
@@ -337,8 +382,8 @@ class ITemporalNodeSetDF(ABC.ITemporalNodeSet):
     def _total_common_time_discrete(self):
         ct = 0
         if bool(self):
-            counter = Counter(ts for _, ts in iter(self))
-            ct = sum(((val - 1) * val) / 2 for _, val in iteritems(counter) if val > 1)
+            counts = np.unique(self.df.ts.values, return_counts=True)[1]
+            ct = ((counts - 1) * counts).sum() / 2
         return ct
 
     @property
@@ -0,0 +1,227 @@
+from __future__ import absolute_import
+
+from .utils import ts_to_df, tns_to_df, make_algebra
+from .node_set_s import NodeSetS
+from .time_set_df import TimeSetDF
+from .temporal_node_set_b import TemporalNodeSetB
+from stream_graph import ABC
+from stream_graph.exceptions import UnrecognizedTemporalLinkSet
+from stream_graph.exceptions import UnrecognizedTemporalNodeSet
+from stream_graph.exceptions import UnrecognizedNodeSet
+from stream_graph.exceptions import UnrecognizedTimeSet
+
+
+class LazyTemporalLinkSetDF(object):
+    """A lazy expression over TemporalLinkSetDF objects.
+
+    Substreams, induced substreams and set operations build a plan, which is only
+    optimized and executed when the result is needed: on :code:`collect`, :code:`df`,
+    :code:`size`, iteration or any other attribute of the resulting TemporalLinkSetDF.
+
+    The plan is optimized by pushing node filters down to the temporal-link-sets they
+    apply to, so that interval sweeps run on as few links as possible, and by fusing
+    consecutive time filters into a single intersection. Intermediate results are kept
+    as merged interval DataFrames and are never re-validated.
+
+    Parameters
+    ----------
+    tls: TemporalLinkSetDF
+
+    """
+    def __init__(self, tls=None, plan=None):
+        from .temporal_link_set_df import TemporalLinkSetDF
+        if plan is None:
+            if tls is None:
+                tls = TemporalLinkSetDF()
+            elif not isinstance(tls, TemporalLinkSetDF):
+                if not isinstance(tls, ABC.TemporalLinkSet):
+                    raise UnrecognizedTemporalLinkSet('tls')
+                tls = TemporalLinkSetDF(tls, discrete=tls.discrete, weighted=tls.weighted)
+            plan = ('scan', tls)
+            self.discrete_, self.weighted_ = tls.discrete, tls.weighted
+            # Empty weighted sets carry no algebra
+            self.algebra = (getattr(tls, 'algebra', make_algebra(None)) if tls.weighted else None)
+        else:
+            self.discrete_, self.weighted_, self.algebra = tls.discrete_, tls.weighted_, tls.algebra
+        self.plan_ = plan
+
+    @property
+    def discrete(self):
+        return self.discrete_
+
+    @property
+    def weighted(self):
+        return self.weighted_
+
+    @property
+    def plan(self):
+        """The optimized plan, as nested tuples :code:`(operation, *arguments)`."""
+        return optimize(self.plan_)
+
+    def _derive(self, plan):
+        return self.__class__(self, plan)
+
+    def _plan_of(self, tls):
+        if isinstance(tls, LazyTemporalLinkSetDF):
+            plan = tls.plan_
+        elif isinstance(tls, ABC.TemporalLinkSet):
+            plan = LazyTemporalLinkSetDF(tls).plan_
+        else:
+            raise UnrecognizedTemporalLinkSet('right operand')
+        assert tls.discrete == self.discrete
+        return plan
+
+    def substream(self, nsu=None, nsv=None, ts=None):
+        if nsu is not None:
+            try:
+                nsu = set(nsu if isinstance(nsu, ABC.NodeSet) else NodeSetS(nsu))
+            except Exception as ex:
+                raise UnrecognizedNodeSet('nsu: ' + str(ex))
+        if nsv is not None:
+            try:
+                nsv = set(nsv if isinstance(nsv, ABC.NodeSet) else NodeSetS(nsv))
+            except Exception as ex:
+                raise UnrecognizedNodeSet('nsv: ' + str(ex))
+        if ts is not None and not isinstance(ts, ABC.TimeSet):
+            try:
+                ts = TimeSetDF(ts, discrete=self.discrete)
+            except Exception as ex:
+                raise UnrecognizedTimeSet('ts: ' + str(ex))
+        plan = self.plan_
+        if nsu is not None or nsv is not None:
+            plan = ('nodes', plan, nsu, nsv)
+        if ts is not None:
+            plan = ('times', plan, ts)
+        return self._derive(plan)
+
+    def induced_substream(self, tns):
+        if not isinstance(tns, ABC.TemporalNodeSet):
+            raise UnrecognizedTemporalNodeSet('ns')
+        if not bool(tns):
+            return self._derive(('empty', ))
+        assert tns.discrete == self.discrete
+        nodes = set(tns.nodeset)
+        plan = ('nodes', self.plan_, nodes, nodes)
+        if isinstance(tns, TemporalNodeSetB):
+            return self._derive(('times', plan, tns.timeset_))
+        else:
+            return self._derive(('induced', plan, tns_to_df(tns)))
+
+    def __and__(self, tls):
+        return self._derive(('and', self.plan_, self._plan_of(tls), self.algebra))
+
+    def __or__(self, tls):
+        return self._derive(('or', self.plan_, self._plan_of(tls), self.algebra))
+
+    def __sub__(self, tls):
+        return self._derive(('sub', self.plan_, self._plan_of(tls), self.algebra))
+
+    def collect(self):
+        """Execute the plan and return a TemporalLinkSetDF."""
+        from .temporal_link_set_df import TemporalLinkSetDF
+        if not hasattr(self, 'result_'):
+            df = execute(optimize(self.plan_), self.weighted)
+            if df is None or df.empty:
+                self.result_ = TemporalLinkSetDF(discrete=self.discrete, weighted=self.weighted)
+            else:
+                self.result_ = TemporalLinkSetDF(df, discrete=self.discrete, weighted=self.weighted)
+        return self.result_
+
+    @property
+    def df(self):
+        return self.collect().df
+
+    @property
+    def size(self):
+        return self.collect().size
+
+    def __iter__(self):
+        return iter(self.collect())
+
+    def __bool__(self):
+        return bool(self.collect())
+
+    # Python2 cross-compatibility
+    __nonzero__ = __bool__
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name.endswith('_'):
+            raise AttributeError(name)
+        return getattr(self.collect(), name)
+
+
+def optimize(plan, nsu=None, nsv=None):
+    """Push the node filters :code:`nsu, nsv` down to the scans and fuse consecutive time filters."""
+    op = plan[0]
+    if op == 'nodes':
+        return optimize(plan[1], _meet(nsu, plan[2]), _meet(nsv, plan[3]))
+    elif op == 'times':
+        child = optimize(plan[1], nsu, nsv)
+        if child[0] == 'times':
+            return ('times', child[1], child[2] & plan[2])
+        return ('times', child, plan[2])
+    elif op == 'induced':
+        return ('induced', optimize(plan[1], nsu, nsv), plan[2])
+    elif op in ['and', 'or', 'sub']:
+        return (op, optimize(plan[1], nsu, nsv), optimize(plan[2], nsu, nsv), plan[3])
+    elif op == 'scan' and (nsu is not None or nsv is not None):
+        return ('nodes', plan, nsu, nsv)
+    return plan
+
+
+def execute(plan, weighted):
+    """Execute an optimized plan, returning an interval DataFrame or None if empty."""
+    op = plan[0]
+    if op == 'scan':
+        return (plan[1].df_ if bool(plan[1]) else None)
+    elif op == 'empty':
+        return None
+    elif op == 'nodes':
+        df = execute(plan[1], weighted)
+        if df is None:
+            return None
+        if plan[2] is not None and plan[3] is not None:
+            df = df[df.u.isin(plan[2]) & df.v.isin(plan[3])]
+        elif plan[2] is not None:
+            df = df[df.u.isin(plan[2])]
+        else:
+            df = df[df.v.isin(plan[3])]
+        return (None if df.empty else df)
+    elif op == 'times':
+        df = execute(plan[1], weighted)
+        if df is None or not bool(plan[2]):
+            return None
+        if weighted:
+            df = df.intersection(ts_to_df(plan[2]), by_key=False, on_column=['u', 'v'], intersection_function='unweighted')
+        else:
+            df = df.intersection(ts_to_df(plan[2]), by_key=False, on_column=['u', 'v'])
+        return (None if df.empty else df)
+    elif op == 'induced':
+        df = execute(plan[1], weighted)
+        if df is None:
+            return None
+        df = (df.cartesian_intersection(plan[2], cartesian_intersection_function='unweighted') if weighted else df.cartesian_intersection(plan[2]))
+        return (None if df.empty else df)
+
+    left = execute(plan[1], weighted)
+    if left is None and op != 'or':
+        return None
+    right = execute(plan[2], weighted)
+    if left is None or right is None:
+        return (None if op == 'and' else (right if left is None else left))
+    if op == 'and':
+        df = (left.intersection(right, intersection_function=plan[3]['i']) if weighted else left.intersection(right))
+    elif op == 'or':
+        df = (left.union(right, union_function=plan[3]['u']) if weighted else left.union(right))
+    else:
+        df = (left.difference(right, difference_function=plan[3]['d']) if weighted else left.difference(right))
+    return (None if df.empty else df)
+
+
+def _meet(a, b):
+    """Intersect two node filters, None meaning all nodes."""
+    if a is None:
+        return b
+    elif b is None:
+        return a
+    return a & b
@@ -8,12 +8,13 @@ from stream_graph.exceptions import UnrecognizedLinkSet
 from stream_graph.exceptions import UnrecognizedDirection
 from .utils import make_algebra
 from .node_set_s import NodeSetS
+from .node_dictionary import get_node_dictionary
 from stream_graph.collections import NodeCollection
 from collections import Counter
 from collections import defaultdict
 from six import iteritems
 from operator import add
-from .dataframes.algorithms.utils.misc import hinge_loss
+from .dataframes.algorithms.utils.misc import hinge_loss, reducer_function, reducer_name
 
 
 class LinkSetDF(ABC.LinkSet):
@@ -31,8 +32,14 @@ class LinkSetDF(ABC.LinkSet):
     sort_by: A non-empty subset of ['u', 'v'], default=['u', 'v']
         The order of the DataFrame elements by which they will be produced when iterated.
 
+    merge_function : A function applied to the list of weights of a link, or one of {'sum', 'max', 'min', 'mean', 'count'}.
+        Named merge functions (as well as the builtins sum, max, min and len) are vectorized.
+
+    node_dictionary: NodeDictionary, default=None
+        If given, node columns are stored as codes of this dictionary.
+
     """
-    def __init__(self, df=None, no_duplicates=True, sort_by=None, weighted=False, merge_function=None, operation_functions=None):
+    def __init__(self, df=None, no_duplicates=True, sort_by=None, weighted=False, merge_function=None, operation_functions=None, node_dictionary=None):
         # Add a check for dataframe style
         if df is None:
             not_empty = False
@@ -42,7 +49,7 @@ class LinkSetDF(ABC.LinkSet):
             not_empty = len(df) > 0
         if weighted:
             self.algebra = make_algebra(operation_functions)
-            self.algebra['m'] = (sum if merge_function is None else merge_function)
+            self.algebra['m'] = (sum if merge_function is None else reducer_function(merge_function))
             assert callable(self.algebra['m'])
         if not_empty:
             if not isinstance(df, pd.DataFrame):
@@ -92,6 +99,13 @@ class LinkSetDF(ABC.LinkSet):
                 self.merge_.reindex_
         else:
             self.weighted_ = weighted
+        if node_dictionary is not None and bool(self):
+            self.df_ = node_dictionary.encode_df(self.df_, ['u', 'v'])
+
+    @property
+    def node_dictionary(self):
+        if bool(self):
+            return get_node_dictionary(self.df_)
 
     @property
     def to_unweighted(self):
@@ -373,6 +387,9 @@ def iter_df(df):
 
 
 def merge_weights(df, merge_function):
+    reducer = reducer_name(merge_function)
+    if reducer is not None:
+        return df.groupby(['u', 'v'], sort=False, observed=True)['w'].agg(reducer).reset_index()
     data = defaultdict(list)
     for u, v, w in iter_df(df):
         data[(u, v)].append(w)
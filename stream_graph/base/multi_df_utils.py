@@ -1,6 +1,6 @@
 """This file contains a set of functions for handling multiple DF class, in a unified manner."""
 
-from itertools import tee
+from itertools import tee, groupby
 from warnings import warn
 
 import pandas as pd
@@ -69,12 +69,12 @@ def load_interval_wdf(df, discrete, weighted, disjoint_intervals, default_closed
         weighted = (False if weighted is None else weighted)
         discrete = (True if discrete is None else discrete)
         if isinstance(df, (InstantaneousDF, InstantaneousWDF)):
-            obj = init_interval_df(data=df, discrete=discrete, weighted=weighted, keys=keys, disjoint_intervals=disjoint_intervals)
+            obj = init_interval_df(data=df, discrete=discrete, weighted=weighted, keys=keys, merge_function=merge_function, disjoint_intervals=disjoint_intervals)
         elif isinstance(df, pd.DataFrame):
             if 'tf' not in df.columns:
                 df['tf'] = df['ts']
             if discrete:
-                obj = init_interval_df(data=df, discrete=True, weighted=weighted, keys=keys, disjoint_intervals=disjoint_intervals)
+                obj = init_interval_df(data=df, discrete=True, weighted=weighted, keys=keys, merge_function=merge_function, disjoint_intervals=disjoint_intervals)
             else:
                 s, f = ((True, True) if default_closed is None else _closed_to_tuple(default_closed))
                 if 'itype' in df.columns:
@@ -395,11 +395,15 @@ def itertuples_aw_(df, discrete, weighted, add_weights=True, direction='out'):
         return (o for i in iter_ for o in [(True, (i[-4], i[-2]), i[:-4]), (False, (i[-3], i[-1]), i[:-4])])
 
 
-def build_time_generator(df, cache_constructor, calculate, value_inequality_condition=None, add_weights=False, get_key=None, direction='out', sparse=False):
+def build_time_generator(df, cache_constructor, calculate, value_inequality_condition=None, add_weights=False, get_key=None, direction='out', sparse=False, delta=False):
     # Make iterator
     discrete, weighted = isinstance(df, (DIntervalDF, DIntervalWDF)), isinstance(df, (DIntervalWDF, CIntervalWDF))
     iter_ = itertuples_aw_(df, discrete, weighted, add_weights, direction)
 
+    if delta:
+        # calculate should return the element an event refers to
+        return build_delta_generator_(iter_, cache_constructor, calculate, discrete)
+
     # Sort based on discrete and not-discrete
     if discrete:
         def key(k):
@@ -568,6 +572,49 @@ def build_time_generator_skey(iter_, get_key, cache_constructor, calculate, time
         yield a
 
 
+def build_delta_generator_(iter_, cache_constructor, get_element, discrete):
+    """Yield the changes of the active elements as `(t, added, removed)` records.
+
+    The cache counts the multiplicity of each active element, so that no state is ever copied.
+    An element ending at a time is removed from the next instant (discrete) or,
+    for a closed bound, from just after it (continuous).
+
+    """
+    if discrete:
+        def coordinate(i):
+            return (i[1] if i[0] else i[1] + 1)
+
+        def key(e):
+            return e[0]
+    else:
+        def coordinate(i):
+            # an interval is active from (ts, s) and until (tf, not f)
+            return (i[1][0], i[1][1] == i[0])
+
+        def key(e):
+            return (e[0][0], not e[0][1])
+
+    cache = cache_constructor()
+    events = sorted(((coordinate(i), i[0], get_element(i)) for i in iter_), key=key)
+    for t, group in groupby(events, key=lambda e: e[0]):
+        before = dict()
+        for _, start, element in group:
+            before.setdefault(element, cache[element] > 0)
+            cache[element] += (1 if start else -1)
+        added, removed = set(), set()
+        for element, active in iteritems(before):
+            if cache[element] > 0:
+                if not active:
+                    added.add(element)
+            else:
+                if active:
+                    removed.add(element)
+                if cache[element] == 0:
+                    cache.pop(element, None)
+        if len(added) or len(removed):
+            yield (t, added, removed)
+
+
 def set_weighted_links_(cache, i):
     if i[0]:
         cache.add(i[2] + (i[3],))
@@ -654,5 +701,21 @@ def sum_counter_n(cache, i):
     return sum(itervalues(cache))
 
 
+def element_weighted_links_(i):
+    return i[2] + (i[3],)
+
+
+def element_unweighted_links_(i):
+    return i[2]
+
+
+def element_unweighted_n(i):
+    return i[2][1]
+
+
+def element_nodes(i):
+    return i[2][0]
+
+
 def get_key_first(key):
     return key[2][0]
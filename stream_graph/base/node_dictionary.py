@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+
+class NodeDictionary(object):
+    """A dictionary between node labels and integer codes.
+
+    DataFrames encoded through the same dictionary store their node columns as
+    :code:`pandas.Categorical` sharing a single dtype: only the integer codes are kept
+    per row and labels are decoded when elements are accessed.
+    Set operations between such DataFrames work directly on the codes.
+
+    Parameters
+    ----------
+    labels: Iterable, default=None
+        The initial node labels.
+
+    """
+    def __init__(self, labels=None):
+        self.dtype_ = CategoricalDtype([])
+        if labels is not None:
+            self.update(labels)
+
+    @classmethod
+    def from_dtype(cls, dtype):
+        nd = cls()
+        nd.dtype_ = dtype
+        return nd
+
+    @property
+    def dtype(self):
+        return self.dtype_
+
+    @property
+    def labels(self):
+        return self.dtype_.categories
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __contains__(self, u):
+        return u in self.labels
+
+    def __eq__(self, obj):
+        return isinstance(obj, NodeDictionary) and self.dtype_ == obj.dtype_
+
+    def __ne__(self, obj):
+        return not self.__eq__(obj)
+
+    def update(self, labels):
+        """Add the labels that are not yet contained in the dictionary.
+
+        Codes of existing labels are preserved, yet DataFrames encoded before the update
+        keep the previous dtype and should be re-encoded to share the new one.
+
+        """
+        if isinstance(labels, pd.Categorical):
+            labels = labels.categories
+        elif not isinstance(labels, (np.ndarray, pd.Index, pd.Series)):
+            labels = list(labels)
+        new = pd.Index(labels).unique()
+        if len(self.labels):
+            new = new[~new.isin(self.labels)]
+        if len(new):
+            self.dtype_ = CategoricalDtype(self.labels.append(new))
+        return self
+
+    def encode(self, values):
+        """Return the values as a Categorical over the dictionary, adding unseen labels."""
+        if isinstance(values, pd.Series):
+            values = values.values
+        if isinstance(values, pd.Categorical) and values.dtype == self.dtype_:
+            return values
+        self.update(values)
+        return pd.Categorical(values, dtype=self.dtype_)
+
+    def codes(self, values):
+        """Return the integer codes of some labels, -1 for the unknown ones."""
+        return self.labels.get_indexer(pd.Index(values))
+
+    def decode(self, codes):
+        """Return the labels of some integer codes."""
+        return self.labels.take(codes)
+
+    def encode_df(self, df, columns):
+        """Return a copy of the df with the node columns encoded."""
+        columns = [c for c in columns if c in df.columns]
+        for c in columns:
+            self.update(df[c].values)
+        out = df.copy()
+        for c in columns:
+            out[c] = self.encode(out[c])
+        return out
+
+    def decode_df(self, df, columns):
+        """Return a copy of the df with the node columns as labels."""
+        out = df.copy()
+        for c in columns:
+            if c in out.columns and isinstance(out[c].dtype, CategoricalDtype):
+                out[c] = np.asarray(out[c].values)
+        return out
+
+
+def get_node_dictionary(df, column='u'):
+    """Retrieve the dictionary of an encoded df or None."""
+    if df is not None and column in df.columns and isinstance(df[column].dtype, CategoricalDtype):
+        return NodeDictionary.from_dtype(df[column].dtype)
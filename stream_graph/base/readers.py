@@ -0,0 +1,144 @@
+from __future__ import absolute_import
+import os
+
+import numpy as np
+import pandas as pd
+
+from .node_dictionary import NodeDictionary
+from .multi_df_utils import _closed_to_tuple
+from .dataframes.algorithms import vectorized_interval
+
+
+def read_link_stream(path, columns=None, file_format=None, chunksize=1000000, discrete=None, weighted=False,
+                     default_closed=None, merge_function=None, node_dictionary=None, **kargs):
+    """Read a link stream from a CSV or Parquet file, chunk by chunk.
+
+    Each chunk is encoded on a common node dictionary and reduced on its own, merging
+    its intervals (or dropping its duplicate instants). Reduced chunks are then merged pairwise
+    as they come, as in a merge sort, so that at most a logarithmic number of runs are kept and
+    redundant intervals are dropped early. Memory is thus a small multiple of the reduced link
+    stream plus a chunk, instead of that of the whole file.
+
+    Parameters
+    ----------
+    path: str
+        The path of the file.
+
+    columns: list, default=None
+        The columns of the file holding :code:`u, v, ts` (and :code:`tf` for intervals), followed by
+        the column of weights if weighted. If None, they are named as such in the file.
+
+    file_format: {'csv', 'parquet'}, default=None
+        If None it is inferred from the extension of the file.
+
+    chunksize: int, default=1000000
+        The number of rows read at once.
+
+    discrete: Bool, default=None
+        If None it is True if timestamps are integers.
+
+    weighted: Bool, default=False
+        Weighted chunks are kept as they are and merged once, by the :code:`merge_function`.
+
+    default_closed: {'left', 'right', 'both', 'neither'}, default=None
+        The bounds of continuous intervals. If None they are closed.
+
+    merge_function: A function applied to a list of arguments.
+
+    node_dictionary: NodeDictionary, default=None
+        The dictionary on which nodes are encoded. If None a new one is created.
+
+    kargs: dict
+        Passed to :code:`pandas.read_csv`.
+
+    Returns
+    -------
+    link_stream: TemporalLinkSetDF or ITemporalLinkSetDF
+        An ITemporalLinkSetDF if no finishing time is given.
+
+    """
+    from .temporal_link_set_df import TemporalLinkSetDF
+    from .itemporal_link_set_df import ITemporalLinkSetDF
+    if node_dictionary is None:
+        node_dictionary = NodeDictionary()
+
+    runs, instantaneous = [], None
+    for chunk in read_chunks(path, columns, file_format, chunksize, weighted, **kargs):
+        if instantaneous is None:
+            instantaneous = 'tf' not in chunk.columns
+            if discrete is None:
+                discrete = chunk['ts'].dtype.kind == 'i'
+            if not (discrete or instantaneous):
+                s, f = ((True, True) if default_closed is None else _closed_to_tuple(default_closed))
+        for c in ['u', 'v']:
+            node_dictionary.update(chunk[c].values)
+            chunk[c] = node_dictionary.codes(chunk[c].values).astype(np.int32)
+        if not (discrete or instantaneous):
+            chunk['s'], chunk['f'] = s, f
+        level, run = 0, reduce_chunk(chunk, instantaneous, discrete, weighted)
+        while runs and runs[-1][0] == level:
+            level, run = level + 1, merge_runs(runs.pop()[1], run, instantaneous, discrete, weighted)
+        runs.append((level, run))
+
+    if not runs:
+        return ITemporalLinkSetDF(discrete=discrete, weighted=weighted)
+    df = runs.pop()[1]
+    while runs:
+        df = merge_runs(runs.pop()[1], df, instantaneous, discrete, weighted)
+    for c in ['u', 'v']:
+        df[c] = pd.Categorical.from_codes(df[c].values, dtype=node_dictionary.dtype)
+
+    if instantaneous:
+        return ITemporalLinkSetDF(df, no_duplicates=not weighted, discrete=discrete, weighted=weighted,
+                                  merge_function=merge_function, node_dictionary=node_dictionary)
+    else:
+        return TemporalLinkSetDF(df, disjoint_intervals=not weighted, discrete=discrete, weighted=weighted,
+                                 merge_function=merge_function, node_dictionary=node_dictionary)
+
+
+def read_chunks(path, columns=None, file_format=None, chunksize=1000000, weighted=False, **kargs):
+    """Iterate over a CSV or Parquet file as DataFrames with columns u, v, ts (, tf) (, w)."""
+    if file_format is None:
+        file_format = ('parquet' if os.path.splitext(path)[1] in ['.parquet', '.pq'] else 'csv')
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(path)
+        if columns is None:
+            columns = [c for c in ['u', 'v', 'ts', 'tf', 'w'] if c in pf.schema.names and (weighted or c != 'w')]
+        chunks = (batch.to_pandas() for batch in pf.iter_batches(batch_size=chunksize, columns=list(columns)))
+    elif file_format == 'csv':
+        chunks = pd.read_csv(path, chunksize=chunksize, usecols=(None if columns is None else list(columns)), **kargs)
+    else:
+        raise ValueError('Unrecognized file format: ' + str(file_format))
+
+    names = None
+    for chunk in chunks:
+        if names is None:
+            if columns is None:
+                columns = [c for c in ['u', 'v', 'ts', 'tf', 'w'] if c in chunk.columns and (weighted or c != 'w')]
+            keys = ['u', 'v', 'ts'] + (['tf'] if len(columns) - int(weighted) == 4 else [])
+            names = dict(zip(columns, keys + (['w'] if weighted else [])))
+        yield chunk[list(columns)].rename(columns=names)
+
+
+def merge_runs(a, b, instantaneous, discrete, weighted):
+    """Merge two reduced chunks into a reduced chunk."""
+    return reduce_chunk(pd.concat([a, b], ignore_index=True), instantaneous, discrete, weighted)
+
+
+def reduce_chunk(df, instantaneous, discrete, weighted):
+    """Sort a chunk by u, v, ts and merge its intervals, or drop its duplicate instants, unless weighted.
+
+    As the reduced chunks are sorted, sorting their concatenation with a stable sort merges them as runs.
+
+    """
+    if not (weighted or instantaneous):
+        df = vectorized_interval.merge(df, ['u', 'v'], discrete=discrete)
+    u, v, ts = df['u'].values, df['v'].values, df['ts'].values
+    order = np.lexsort((ts, v, u))
+    if instantaneous and not weighted and len(order):
+        u, v, ts = u[order], v[order], ts[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1]) | (ts[1:] != ts[:-1])
+        order = order[first]
+    return pd.DataFrame({c: df[c].values[order] for c in df.columns}, columns=df.columns)
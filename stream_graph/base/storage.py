@@ -0,0 +1,132 @@
+from __future__ import absolute_import
+import os
+import json
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+HEADER = 'header.json'
+FORMAT = 1
+# Python2 cross-compatibility
+_replace = getattr(os, 'replace', os.rename)
+
+
+def save_df(path, df, **header):
+    """Save a DataFrame as a directory of numpy arrays, along with a json header.
+
+    Consecutive columns sharing a dtype are stored as a single 2-d array, the layout in
+    which pandas keeps them in memory, so that they can be loaded without a copy.
+    Categorical and object columns are stored as integer codes, their labels being saved
+    once per distinct set of categories. Each file is written aside and then moved into place,
+    so that a DataFrame memory-mapped from :code:`path` can be saved back to it.
+
+    Parameters
+    ----------
+    path: str
+        The directory, created if it does not exist.
+
+    df: pandas.DataFrame or None
+        If None, only the header is written.
+
+    header: dict
+        Json serializable information stored along with the DataFrame.
+
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    blocks = None
+    if df is not None:
+        blocks, categories = [], []
+        for c in df.columns:
+            values = df[c].values
+            if isinstance(df[c].dtype, CategoricalDtype) or values.dtype == object:
+                if isinstance(df[c].dtype, CategoricalDtype):
+                    codes, labels, decode = values.codes, values.categories, False
+                else:
+                    codes, labels = pd.factorize(values)
+                    labels, decode = pd.Index(labels), True
+                for i, l in enumerate(categories):
+                    if l.equals(labels):
+                        break
+                else:
+                    i = len(categories)
+                    categories.append(labels)
+                    _save(os.path.join(path, 'categories%d.npy' % i), np.asarray(labels))
+                blocks.append({'file': '%d.npy' % len(blocks), 'columns': [c], 'categories': 'categories%d.npy' % i, 'decode': decode})
+                _save(os.path.join(path, blocks[-1]['file']), codes)
+            elif len(blocks) and 'categories' not in blocks[-1] and df[blocks[-1]['columns'][0]].dtype == values.dtype:
+                blocks[-1]['columns'].append(c)
+            else:
+                blocks.append({'file': '%d.npy' % len(blocks), 'columns': [c]})
+        for block in blocks:
+            if 'categories' not in block:
+                values = np.stack([df[c].values for c in block['columns']])
+                _save(os.path.join(path, block['file']), values)
+
+    header = dict(header, format=FORMAT, blocks=blocks)
+    with open(os.path.join(path, HEADER), 'w') as f:
+        json.dump(header, f)
+
+
+def _save(filename, values):
+    # The file may be memory-mapped by the values being saved: write a new one instead of truncating it.
+    with open(filename + '.tmp', 'wb') as f:
+        np.save(f, values)
+    _replace(filename + '.tmp', filename)
+
+
+def load_df(path, mmap=True):
+    """Load a DataFrame saved with :code:`save_df`.
+
+    Parameters
+    ----------
+    path: str
+        The directory.
+
+    mmap: Bool, default=True
+        If True arrays are memory-mapped (copy on write) instead of read, so that loading
+        does not depend on the size of the data. Node labels are always read.
+
+    Returns
+    -------
+    df: pandas.DataFrame or None
+        None if no DataFrame was saved.
+
+    header: dict
+        The header saved along with the DataFrame.
+
+    Notes
+    -----
+    Labels of object dtype are pickled: only load directories from a trusted source.
+
+    """
+    header = read_header(path)
+    if header['blocks'] is None:
+        return None, header
+
+    dtypes, parts = dict(), []
+    for block in header['blocks']:
+        values = np.load(os.path.join(path, block['file']), mmap_mode=('c' if mmap else None))
+        if 'categories' in block:
+            name = block['categories']
+            if name not in dtypes:
+                dtypes[name] = CategoricalDtype(np.load(os.path.join(path, name), allow_pickle=True))
+            if block['decode']:
+                values = np.asarray(dtypes[name].categories, dtype=object)[values]
+            else:
+                values = pd.Categorical.from_codes(values, dtype=dtypes[name])
+            parts.append(pd.DataFrame({block['columns'][0]: values}, columns=block['columns']))
+        else:
+            parts.append(pd.DataFrame(values.T, columns=block['columns'], copy=False))
+    df = (parts[0] if len(parts) == 1 else pd.concat(parts, axis=1, copy=False))
+    return df, header
+
+
+def read_header(path):
+    """Read the header of a directory written by :code:`save_df`."""
+    with open(os.path.join(path, HEADER)) as f:
+        header = json.load(f)
+    if header.get('format', None) != FORMAT:
+        raise ValueError('Unrecognized format of ' + str(path))
+    return header
@@ -1,6 +1,11 @@
 from __future__ import absolute_import
+import os
 from warnings import warn
+import numpy as np
+import pandas as pd
 from .node_set_s import NodeSetS
+from .node_dictionary import NodeDictionary
+from .storage import save_df, load_df
 from collections import Iterable
 from stream_graph import ABC
 from stream_graph.exceptions import UnrecognizedStreamGraph, UnrecognizedNodeSet, UnrecognizedTimeSet
@@ -28,8 +33,12 @@ class StreamGraph(object):
 
     temporal_linkset: ABC.TemporalLinkSet or ABC.ITemporalLinkSet
 
+    node_dictionary: NodeDictionary or Bool, default=None
+        If given (or True, for a new one) the DataFrames of the temporal-node-set and
+        the temporal-link-set store their nodes as codes of a common dictionary.
+
     """
-    def __init__(self, nodeset=None, timeset=None, temporal_nodeset=None, temporal_linkset=None, discrete=None, weighted=False):
+    def __init__(self, nodeset=None, timeset=None, temporal_nodeset=None, temporal_linkset=None, discrete=None, weighted=False, node_dictionary=None):
         if not isinstance(nodeset, ABC.NodeSet):
             from . import NodeSetS
             self.nodeset_ = NodeSetS(nodeset)
@@ -55,6 +64,83 @@ class StreamGraph(object):
         else:
             self.temporal_linkset_ = temporal_linkset
             assert self.timeset_.discrete is None or self.timeset_.discrete == self.temporal_linkset_.discrete
+        if node_dictionary is not None and node_dictionary is not False:
+            self._encode_nodes(NodeDictionary() if node_dictionary is True else node_dictionary)
+
+    def _encode_nodes(self, nd):
+        # Collect all labels first, so that every DataFrame shares the same codes.
+        nd.update(self.nodeset_)
+        sets = []
+        for name in ['temporal_nodeset_', 'temporal_linkset_']:
+            obj = getattr(self, name)
+            if hasattr(obj, 'node_dictionary') and bool(obj):
+                for c in ['u', 'v']:
+                    if c in obj.df_.columns:
+                        nd.update(obj.df_[c].values)
+                sets.append(name)
+        for name in sets:
+            obj = getattr(self, name)
+            setattr(self, name, obj.__class__(obj, node_dictionary=nd))
+        self.node_dictionary_ = nd
+
+    @property
+    def node_dictionary(self):
+        return getattr(self, 'node_dictionary_', None)
+
+    def save(self, path):
+        """Save the stream-graph as a directory of numpy arrays.
+
+        Each of its sets is saved in a sub-directory with its own :code:`save` method.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        nodes = pd.DataFrame({'u': list(self.nodeset_)})
+        if self.node_dictionary is not None:
+            nodes['u'] = self.node_dictionary.encode(nodes['u'])
+        sets = []
+        for name in ['timeset_', 'temporal_nodeset_', 'temporal_linkset_']:
+            obj = getattr(self, name)
+            if not hasattr(obj, 'save'):
+                raise ValueError(name.rstrip('_') + ' of type ' + obj.__class__.__name__ + ' cannot be saved')
+            obj.save(os.path.join(path, name.rstrip('_')))
+            sets.append(obj.__class__.__name__)
+        save_df(path, nodes, **{'class': self.__class__.__name__, 'sets': sets, 'node_dictionary': self.node_dictionary is not None})
+
+    @classmethod
+    def load(cls, path, mmap=True, merge_function=None, operation_functions=None):
+        """Load a stream-graph saved with :code:`save`.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays are memory-mapped instead of read.
+
+        merge_function: A function applied to a list of arguments.
+            Used for a weighted temporal-link-set.
+
+        operation_functions: dict {str: fun}
+            Used for a weighted temporal-link-set.
+
+        """
+        from . import TimeSetDF, TemporalNodeSetDF, TemporalNodeSetB, ITemporalNodeSetDF, TemporalLinkSetDF, ITemporalLinkSetDF
+        classes = {c.__name__: c for c in [TimeSetDF, TemporalNodeSetDF, TemporalNodeSetB, ITemporalNodeSetDF, TemporalLinkSetDF, ITemporalLinkSetDF]}
+        nodes, header = load_df(path, mmap=False)
+        timeset_class, temporal_nodeset_class, temporal_linkset_class = (classes[c] for c in header['sets'])
+        timeset = timeset_class.load(os.path.join(path, 'timeset'), mmap)
+        temporal_nodeset = temporal_nodeset_class.load(os.path.join(path, 'temporal_nodeset'), mmap)
+        temporal_linkset = temporal_linkset_class.load(os.path.join(path, 'temporal_linkset'), mmap, merge_function, operation_functions)
+        obj = cls(NodeSetS(nodes['u'].tolist()), timeset, temporal_nodeset, temporal_linkset)
+        if header['node_dictionary']:
+            obj.node_dictionary_ = (temporal_linkset.node_dictionary or temporal_nodeset.node_dictionary or
+                                    NodeDictionary.from_dtype(nodes['u'].dtype))
+        return obj
 
     def __bool__(self):
         return ((hasattr(self, 'nodeset_') and bool(self.nodeset_)) and
@@ -130,8 +216,11 @@ class StreamGraph(object):
     def empty(self):
         return not bool(self)
 
-    def graph_at(self, t=None):
+    def graph_at(self, t=None, times=None):
         from .graph import Graph
+        if times is not None:
+            nodes, links = self.temporal_nodeset_.nodes_at(times=times), self.temporal_linkset_.links_at(times=times)
+            return TimeCollection(((t, Graph(ns, ls)) for (t, ns), (_, ls) in zip(nodes, links)), discrete=self.discrete, instantaneous=True)
         if t is None:
             def fun(nodes, links):
                 return Graph(nodes, links)
@@ -333,9 +422,8 @@ class StreamGraph(object):
             ns, ms = self.temporal_nodeset_.n_at(t=None), self.temporal_linkset_.m_at(t=None, weights=weights)
 
             def fun(x, y):
-                denom = float(x * (x - 1))
-                return ((y / denom) if denom != .0 else .0)
-            return ns.merge(ms, fun, missing_value=.0)
+                return divide_(y, x * (x - 1.))
+            return ns.merge(ms, fun, missing_value=.0, vectorized=True)
         else:
             denom = float(self.temporal_nodeset_.n_at(t))
             denom = denom * (denom - 1)
@@ -410,10 +498,10 @@ class StreamGraph(object):
                 neighbors = self.temporal_linkset_.degree_at(None, None, direction, weights)
 
                 def fun(x, y):
-                    return y.merge(n, coverage)
+                    return y.merge(n, divide_, vectorized=True)
                 return neighbors.map(fun)
             else:
-                return self.temporal_linkset_.degree_at(u, None, direction, weights).merge(n, coverage)
+                return self.temporal_linkset_.degree_at(u, None, direction, weights).merge(n, divide_, vectorized=True)
         else:
             denom = float(self.temporal_nodeset_.n_at(t))
             if u is None:
@@ -444,9 +532,9 @@ class StreamGraph(object):
             if bool(self):
                 ns, ms = self.temporal_nodeset_.n_at(t=None), self.temporal_linkset_.m_at(t=None, weights=weights)
 
-                def fun(x=.0, y=.0):
-                    return (y / x if x != .0 and y != .0 else .0)
-                return ns.merge(ms, fun, missing_value=.0)
+                def fun(x, y):
+                    return divide_(y, x)
+                return ns.merge(ms, fun, missing_value=.0, vectorized=True)
             return list()
         else:
             denom = float(self.temporal_nodeset_.n_at(t))
@@ -532,6 +620,36 @@ class StreamGraph(object):
         else:
             return .0
 
+    def summary(self):
+        """Calculate the basic measures of the stream-graph at once.
+
+        The size and the total common time of the temporal-node-set are computed together,
+        so that all the measures share the same pass over its intervals.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        summary : dict
+            With keys 'n', 'm', 'coverage', 'density' and 'weighted_density' if the stream-graph is weighted.
+
+        """
+        def ratio(x, y):
+            return (x / y if y > .0 else .0)
+
+        total_time, nodes = float(self.timeset_.size), float(self.nodeset_.size)
+        size, total_common_time = self.temporal_nodeset_.measures
+        links_size, total_common_time = self.temporal_linkset_.size, float(total_common_time)
+        summary = {'n': ratio(size, total_time),
+                   'm': ratio(links_size, total_time),
+                   'coverage': ratio(size, total_time * nodes),
+                   'density': ratio(links_size, total_common_time)}
+        if self.weighted:
+            summary['weighted_density'] = ratio(self.temporal_linkset_.weighted_size, total_common_time)
+        return summary
+
     def induced_substream(self, tns):
         """Calculate the induced substream of the stream-graph from a TemporalNodeSet.
 
@@ -654,3 +772,9 @@ class StreamGraph(object):
             return DataCube(iter_, columns=['u', 'v', 'ts'], column_sizes=column_sizes)
         else:
             raise ValueError('Stream-Graph should be discrete to be convertible to a data-cube')
+
+
+def divide_(x, y):
+    """Elementwise division of arrays, zero where the divisor is zero."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    return np.divide(x, y, out=np.zeros(np.broadcast(x, y).shape), where=(y != .0))
@@ -0,0 +1,253 @@
+from __future__ import absolute_import
+import heapq
+from numbers import Integral
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .node_set_s import NodeSetS
+from stream_graph.exceptions import UnrecognizedDirection
+
+
+class TemporalLinkSetBuilder(object):
+    """Build a link stream online, from batches of events ordered by time.
+
+    Intervals (or instants) are added as they arrive and only the last, open, interval of each
+    link is ever merged: all previous ones are final. Along with them the links, degrees and
+    neighbors at the current time, that is the latest starting time received, are kept up to date,
+    so that they are queried in constant time instead of rebuilding the link stream.
+
+    Parameters
+    ----------
+    instantaneous: Bool, default=False
+        If True events are instants :code:`(u, v, ts)`, else intervals :code:`(u, v, ts, tf)`.
+
+    discrete: Bool, default=None
+        If None it is True if the first timestamp is an integer.
+
+    weighted: Bool, default=False
+        Weighted events are kept as they arrive and merged by the :code:`merge_function` on :code:`build`.
+
+    merge_function: A function applied to a list of arguments.
+
+    operation_functions: dict {str: fun}
+
+    node_dictionary: NodeDictionary, default=None
+        If given, node columns of the built link stream are stored as codes of this dictionary.
+
+    Notes
+    -----
+    Continuous intervals are closed.
+
+    """
+    def __init__(self, instantaneous=False, discrete=None, weighted=False, merge_function=None, operation_functions=None, node_dictionary=None):
+        self.instantaneous_, self.discrete_, self.weighted_ = instantaneous, discrete, weighted
+        self.merge_function, self.operation_functions, self.node_dictionary = merge_function, operation_functions, node_dictionary
+        self.now_ = None
+        # Final intervals or instants, as columns u, v, ts (, tf) (, w)
+        self.columns_ = [[] for _ in range(3 + int(not instantaneous) + int(weighted))]
+        # The last interval of each link, with a heap of finishing times to expire them.
+        # If weighted all intervals are final as received and the tails only track the active links.
+        self.tails_, self.heap_ = dict(), []
+        self.active_, self.out_, self.in_, self.both_ = set(), dict(), dict(), dict()
+
+    @property
+    def discrete(self):
+        return self.discrete_
+
+    @property
+    def weighted(self):
+        return self.weighted_
+
+    @property
+    def instantaneous(self):
+        return self.instantaneous_
+
+    @property
+    def now(self):
+        """The current time, that is the latest starting time received, or None."""
+        return self.now_
+
+    def add(self, u, v, ts, tf=None, w=None):
+        """Add an event starting at the current time or later.
+
+        Parameters
+        ----------
+        u, v: NodeId
+
+        ts: Real
+
+        tf: Real, default=None
+            If None it is :code:`ts`. Ignored for instants.
+
+        w: Real, default=None
+            The weight of the event, 1 if None.
+
+        """
+        if self.now_ is None:
+            if self.discrete_ is None:
+                self.discrete_ = isinstance(ts, Integral)
+        elif ts < self.now_:
+            raise ValueError('Events should be added in time order: ' + str(ts) + ' < ' + str(self.now_))
+        if self.now_ is None or ts > self.now_:
+            self._advance(ts)
+
+        key = (u, v)
+        if self.instantaneous_:
+            if self.weighted_:
+                self.columns_[3].append((1 if w is None else w))
+            elif key in self.active_:
+                return
+            for column, value in zip(self.columns_, key + (ts, )):
+                column.append(value)
+            if key not in self.active_:
+                self._activate(key)
+            return
+
+        tf = (ts if tf is None else tf)
+        assert tf >= ts
+        if self.weighted_:
+            for column, value in zip(self.columns_, key + (ts, tf, (1 if w is None else w))):
+                column.append(value)
+        tail = self.tails_.get(key, None)
+        if tail is not None and ts <= tail[1] + int(self.discrete_):
+            if tf > tail[1]:
+                tail[1] = tf
+                heapq.heappush(self.heap_, (tf, key))
+        else:
+            if tail is not None and not self.weighted_:
+                for column, value in zip(self.columns_, key + tuple(tail)):
+                    column.append(value)
+            self.tails_[key] = [ts, tf]
+            heapq.heappush(self.heap_, (tf, key))
+        if key not in self.active_:
+            self._activate(key)
+
+    def extend(self, events):
+        """Add a batch of events, starting at the current time or later.
+
+        Parameters
+        ----------
+        events: pandas.DataFrame or Iterable
+            If a DataFrame it should contain the columns u, v, ts (, tf) (, w).
+            If an Iterable it should produce :code:`(u, v, ts (, tf) (, w))` tuples.
+            Events of a batch are ordered by their starting time before being added.
+
+        """
+        if isinstance(events, pd.DataFrame):
+            columns = ['u', 'v', 'ts'] + ([] if self.instantaneous_ else ['tf']) + (['w'] if self.weighted_ else [])
+            order = np.argsort(events['ts'].values, kind='mergesort')
+            events = zip(*(events[c].values[order].tolist() for c in columns))
+        else:
+            events = sorted(events, key=lambda e: e[2])
+        if self.instantaneous_ and self.weighted_:
+            for u, v, ts, w in events:
+                self.add(u, v, ts, w=w)
+        else:
+            for e in events:
+                self.add(*e)
+
+    def _advance(self, t):
+        if self.instantaneous_:
+            for key in list(self.active_):
+                self._deactivate(key)
+        else:
+            while len(self.heap_) and self.heap_[0][0] < t:
+                tf, key = heapq.heappop(self.heap_)
+                if self.tails_[key][1] == tf and key in self.active_:
+                    self._deactivate(key)
+        self.now_ = t
+
+    def _activate(self, key):
+        u, v = key
+        self.active_.add(key)
+        self.out_.setdefault(u, set()).add(v)
+        self.in_.setdefault(v, set()).add(u)
+        self.both_.setdefault(u, Counter())[v] += 1
+        self.both_.setdefault(v, Counter())[u] += 1
+
+    def _deactivate(self, key):
+        u, v = key
+        self.active_.discard(key)
+        self.out_[u].discard(v)
+        self.in_[v].discard(u)
+        for a, b in [(u, v), (v, u)]:
+            self.both_[a][b] -= 1
+            if not self.both_[a][b]:
+                del self.both_[a][b]
+
+    def _neighbors(self, u, direction):
+        if direction == 'out':
+            return self.out_.get(u, ())
+        elif direction == 'in':
+            return self.in_.get(u, ())
+        elif direction == 'both':
+            return self.both_.get(u, ())
+        else:
+            raise UnrecognizedDirection()
+
+    def m_at(self):
+        """The number of links at the current time."""
+        return len(self.active_)
+
+    def links_at(self):
+        """The links at the current time, as a set of :code:`(u, v)` tuples."""
+        return set(self.active_)
+
+    def degree_at(self, u, direction='out'):
+        """The degree of a node at the current time.
+
+        Parameters
+        ----------
+        u: NodeId
+
+        direction: string={'in', 'out', 'both'}, default='out'
+
+        """
+        return len(self._neighbors(u, direction))
+
+    def neighbors_at(self, u, direction='out'):
+        """The neighbors of a node at the current time, as a NodeSetS.
+
+        Parameters
+        ----------
+        u: NodeId
+
+        direction: string={'in', 'out', 'both'}, default='out'
+
+        """
+        return NodeSetS(set(self._neighbors(u, direction)))
+
+    def build(self):
+        """Build the link stream of all events received so far.
+
+        Returns
+        -------
+        link_stream: TemporalLinkSetDF or ITemporalLinkSetDF
+
+        """
+        from .temporal_link_set_df import TemporalLinkSetDF
+        from .itemporal_link_set_df import ITemporalLinkSetDF
+        if self.instantaneous_:
+            columns = ['u', 'v', 'ts'] + (['w'] if self.weighted_ else [])
+            df = pd.DataFrame(dict(zip(columns, self.columns_)), columns=columns)
+            return ITemporalLinkSetDF((df if len(df) else None), no_duplicates=not self.weighted_, discrete=self.discrete_, weighted=self.weighted_,
+                                      merge_function=self.merge_function, operation_functions=self.operation_functions, node_dictionary=self.node_dictionary)
+
+        if self.weighted_:
+            if not len(self.columns_[0]):
+                return TemporalLinkSetDF(discrete=self.discrete_, weighted=True)
+            df = pd.DataFrame(dict(zip(['u', 'v', 'ts', 'tf', 'w'], self.columns_)), columns=['u', 'v', 'ts', 'tf', 'w'])
+            return TemporalLinkSetDF(df, disjoint_intervals=False, discrete=self.discrete_, weighted=True, merge_function=self.merge_function,
+                                     operation_functions=self.operation_functions, node_dictionary=self.node_dictionary)
+
+        tails = list(self.tails_.items())
+        columns = [c + [t[i][j] for t in tails] for c, (i, j) in zip(self.columns_, [(0, 0), (0, 1), (1, 0), (1, 1)])]
+        if not len(columns[0]):
+            return TemporalLinkSetDF(discrete=self.discrete_, weighted=False)
+        df = pd.DataFrame(dict(zip(['u', 'v', 'ts', 'tf'], columns)), columns=['u', 'v', 'ts', 'tf'])
+        tls = TemporalLinkSetDF(df, disjoint_intervals=True, discrete=self.discrete_, weighted=False,
+                                operation_functions=self.operation_functions, node_dictionary=self.node_dictionary)
+        tls.df_._merged = True
+        return tls
@@ -8,8 +8,12 @@ from six import iteritems
 
 from .utils import ts_to_df, tns_to_df, make_algebra, time_discretizer_df
 from .multi_df_utils import load_interval_wdf, init_interval_df, build_time_generator, itertuples_pretty, itertuples_raw
-from .multi_df_utils import set_unweighted_n_sparse, set_weighted_links_, set_unweighted_links_, get_key_first, len_set_n, len_set_, sum_counter_, sum_counter_n
+from .multi_df_utils import set_unweighted_n_sparse, element_weighted_links_, element_unweighted_links_, get_key_first, len_set_n, len_set_, sum_counter_, sum_counter_n
 from .functions import get_maximal_cliques as get_maximal_cliques_
+from .node_dictionary import get_node_dictionary
+from .storage import save_df, load_df
+from .windows import window_metrics as window_metrics_
+from .lazy_temporal_link_set_df import LazyTemporalLinkSetDF
 
 from stream_graph import ABC
 from .link_set_df import LinkSetDF
@@ -19,9 +23,9 @@ from .temporal_node_set_df import TemporalNodeSetDF
 from .temporal_node_set_b import TemporalNodeSetB
 from stream_graph.collections import NodeCollection
 from stream_graph.collections import LinkCollection
-from stream_graph.collections import TimeGenerator
 from stream_graph.collections import TimeCollection
 from stream_graph.collections import TimeSparseCollection
+from stream_graph.collections import TimeDeltaGenerator
 from stream_graph.exceptions import UnrecognizedTemporalLinkSet
 from stream_graph.exceptions import UnrecognizedTemporalNodeSet
 from stream_graph.exceptions import UnrecognizedNodeSet
@@ -50,18 +54,24 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
 
     default_closed : {'left', 'right', 'both', 'neither'}, default=None
 
-    merge_function : A function applied to a list of arguments.
+    merge_function : A function applied to a list of arguments, or one of {'sum', 'max', 'min', 'mean', 'count'}.
+        Named merge functions (as well as the builtins sum, max, min and len) are vectorized.
 
     operation_functions: dict {str: fun}
         A dictionary of names of operations, i.e. :code:`union/u`, :code:`intersection/i`, :code:`difference/d`, :code:`issuperset/s'.
         All function should be applicable between two weights.
         Default: +, min, hinge_loss (ignoring an interval on zero), operator.ge (ignoring an interval on zero)
 
+    node_dictionary: NodeDictionary, default=None
+        If given, node columns are stored as codes of this dictionary.
+
     """
-    def __init__(self, df=None, disjoint_intervals=True, sort_by=None, discrete=None, weighted=False, default_closed=None, merge_function=None, operation_functions=None):
+    def __init__(self, df=None, disjoint_intervals=True, sort_by=None, discrete=None, weighted=False, default_closed=None, merge_function=None, operation_functions=None, node_dictionary=None):
         if isinstance(df, self.__class__):
             if bool(df):
-                self.df_, self.discrete_, self.weighted_, self.sort_by, self.algebra = df.df, df.discrete, df.weighted, df.sort_by, df.algebra
+                self.df_, self.discrete_, self.weighted_, self.sort_by = df.df, df.discrete, df.weighted, df.sort_by
+                if self.weighted_:
+                    self.algebra = df.algebra
         elif df is not None:
             if isinstance(df, ABC.TemporalLinkSet):
                 from .itemporal_link_set_df import ITemporalLinkSetDF
@@ -75,6 +85,56 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
                 self.algebra = make_algebra(operation_functions)
         else:
             self.discrete_, self.weighted_ = (True if discrete is None else discrete), weighted
+        if node_dictionary is not None and bool(self):
+            self.df_ = node_dictionary.encode_df(self.df_, ['u', 'v'])
+
+    def save(self, path):
+        """Save the temporal-link-set as a directory of numpy arrays.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        header = {'class': self.__class__.__name__, 'discrete': self.discrete, 'weighted': self.weighted}
+        if bool(self):
+            header['sort_by'], header['sorted'] = self.sort_by, self.is_sorted_
+            header['merged'], header['sorted_by'] = self.df_.is_merged, self.df_.sorted_by
+        save_df(path, (self.df_ if bool(self) else None), **header)
+
+    @classmethod
+    def load(cls, path, mmap=True, merge_function=None, operation_functions=None):
+        """Load a temporal-link-set saved with :code:`save`.
+
+        Intervals are known to be merged and sorted as they were saved, so that no check is repeated.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays are memory-mapped instead of read.
+
+        merge_function: A function applied to a list of arguments.
+
+        operation_functions: dict {str: fun}
+
+        """
+        df, header = load_df(path, mmap)
+        if df is None:
+            return cls(discrete=header['discrete'], weighted=header['weighted'])
+        df = init_interval_df(df, discrete=header['discrete'], weighted=header['weighted'], keys=['u', 'v'], merge_function=merge_function)
+        obj = cls(df, sort_by=header['sort_by'], operation_functions=operation_functions)
+        obj.sorted_ = header['sorted']
+        obj.df_._merged, obj.df_._sorted_by = header.get('merged', False), header.get('sorted_by', None)
+        return obj
+
+    @property
+    def node_dictionary(self):
+        if bool(self):
+            return get_node_dictionary(self.df_)
 
     @property
     def weighted(self):
@@ -239,7 +299,9 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
         return ['w'] if self.weighted else []
 
     # Maybe turn TimeCollection to boundy
-    def links_at(self, t=None):
+    def links_at(self, t=None, times=None):
+        if times is not None:
+            return self._links_at_times(times)
         if not bool(self):
             if t is None:
                 return iter()
@@ -247,13 +309,25 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
                 return LinkSetDF()
         mf = (self.df_.merge_function if self.weighted else None)
         if t is None:
-            calculate = (set_weighted_links_ if self.weighted else set_unweighted_links_)
-            return TimeGenerator(((e, LinkSetDF(s, weighted=self.weighted, merge_function=mf)) for e, s in self._build_time_generator(set, calculate, add_weights=False)), discrete=self.discrete)
+            get_element = (element_weighted_links_ if self.weighted else element_unweighted_links_)
+
+            def caster(s):
+                return LinkSetDF(s, weighted=self.weighted, merge_function=mf)
+            return TimeDeltaGenerator(self._build_time_generator(Counter, get_element, add_weights=False, delta=True), caster=caster, discrete=self.discrete)
         elif isinstance(t, tuple):
             return LinkSetDF(self.df.df_at_interval(*t)[['u', 'v'] + self._wc], weighted=self.weighted, merge_function=mf, no_duplicates=False)
         else:
             return LinkSetDF(self.df.df_at(t)[['u', 'v'] + self._wc], weighted=self.weighted, merge_function=mf, no_duplicates=False)
 
+    def _links_at_times(self, times):
+        if not bool(self):
+            return TimeCollection(((t, LinkSetDF()) for t in times), discrete=self.discrete, instantaneous=True)
+        mf = (self.df_.merge_function if self.weighted else None)
+        offsets, positions = self.df.positions_at_times(times)
+        df = self.df[['u', 'v'] + self._wc]
+        return TimeCollection(((t, LinkSetDF(df.iloc[positions[offsets[i]:offsets[i + 1]]], weighted=self.weighted, merge_function=mf, no_duplicates=False))
+                               for i, t in enumerate(times)), discrete=self.discrete, instantaneous=True)
+
     def times_of(self, l=None, direction='out'):
         if not bool(self):
             if l is None:
@@ -369,7 +443,7 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
             if t is None:
                 return TemporalNodeSetDF(df).nodes_at(t=None)
             else:
-                return NodeSetS(df[df.index_at(t)].u.values.flat)
+                return NodeSetS(df[df.index_at(t)].u.values)
 
     def _degree_at_weighted(self, u, t, direction):
         if u is None:
@@ -426,7 +500,7 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
             if t is None:
                 return TemporalNodeSetDF(df).n_at(t=None)
             else:
-                return len(set(df.df_at(t).u.values.flat))
+                return len(set(df.df_at(t).u.values))
 
     def neighbors_of(self, u=None, direction='out'):
         if not bool(self):
@@ -510,6 +584,42 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
                 df = (df.drop(columns=['w'], merge=False) if self.weighted else df)
                 return TemporalNodeSetDF(df, disjoint_intervals=False, discrete=self.discrete).size
 
+    def window_metrics(self, size, times=None, step=None, metrics=('m', 'n')):
+        """Compute the number of links, of nodes and other metrics over sliding windows.
+
+        Parameters
+        ----------
+        size: Real or Iterable
+            The size of the windows :math:`(t - size, t]`, or a list of them.
+
+        times: Iterable, default=None
+            The ending times of the windows. If None, from the first to the last time every :code:`step`.
+
+        step: Real, default=None
+            If None it is equal to :code:`size`.
+
+        metrics: Iterable, default=('m', 'n')
+            Any of 'm', 'n', 'interactions', 'density', 'degree'.
+
+        Returns
+        -------
+        metrics: dict
+            A TimeCollection for each metric, or if :code:`size` is a list such a dictionary for each size.
+
+        """
+        return window_metrics_((self.df if bool(self) else None), size, times, step, metrics, self.discrete)
+
+    def lazy(self):
+        """Start a lazy expression of substreams and set operations on the temporal-link-set.
+
+        Returns
+        -------
+        lazy : LazyTemporalLinkSetDF
+            Executed only when its result is needed.
+
+        """
+        return LazyTemporalLinkSetDF(self)
+
     def substream(self, nsu=None, nsv=None, ts=None):
         if nsu is not None:
             if not isinstance(nsu, ABC.NodeSet):
@@ -668,9 +778,9 @@ class TemporalLinkSetDF(ABC.TemporalLinkSet):
                 if isinstance(tns, TemporalNodeSetB):
                     tdf = self.df_[self.df_['v'].isin(tns.nodeset_) & self.df_['u'].isin(tns.nodeset_)]
                     if self.weighted:
-                        tdf = tdf.intersection(ts_to_df(tns.timeset_), on_columns=['u', 'v'], by_key=False)
+                        tdf = tdf.intersection(ts_to_df(tns.timeset_), on_column=['u', 'v'], by_key=False, intersection_function='unweighted')
                     else:
-                        tdf = tdf.intersection(ts_to_df(tns.timeset_), on_columns=['u', 'v'], by_key=False, intersection='unweighted')
+                        tdf = tdf.intersection(ts_to_df(tns.timeset_), on_column=['u', 'v'], by_key=False)
                     if not tdf.empty:
                         return TemporalLinkSetDF(tdf, discrete=self.discrete, weighted=self.weighted)
                 else:
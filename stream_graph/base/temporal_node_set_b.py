@@ -1,14 +1,18 @@
 from __future__ import absolute_import
+import os
 from itertools import chain
 from itertools import permutations
 from itertools import combinations
 from collections import Iterable
 from warnings import warn
 
+import pandas as pd
+
 from .multi_df_utils import _closed_to_tuple
 from .node_set_s import NodeSetS
 from .time_set_df import TimeSetDF
 from .temporal_node_set_df import TemporalNodeSetDF
+from .storage import save_df, load_df
 from stream_graph import ABC
 from stream_graph.collections import NodeCollection
 from stream_graph.collections import LinkCollection
@@ -176,7 +180,9 @@ class TemporalNodeSetB(ABC.TemporalNodeSet):
             raise UnrecognizedTemporalNodeSet('ns')
         return False
 
-    def nodes_at(self, t=None):
+    def nodes_at(self, t=None, times=None):
+        if times is not None:
+            return TimeCollection(((t, self.nodes_at(t)) for t in times), discrete=self.discrete, instantaneous=True)
         if t is None:
             if bool(self):
                 return constant_time_generator(self.timeset, self.nodeset, NodeSetS(), self.discrete, self.instantaneous)
@@ -218,6 +224,41 @@ class TemporalNodeSetB(ABC.TemporalNodeSet):
                 for key in self.timeset_:
                     yield (a, ) + key
 
+    def save(self, path):
+        """Save the temporal-node-set as a directory of numpy arrays.
+
+        The time-set is saved in a sub-directory with its own :code:`save` method.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        if bool(self):
+            self.timeset_.save(os.path.join(path, 'timeset'))
+            save_df(path, pd.DataFrame({'u': list(self.nodeset_)}), **{'class': self.__class__.__name__})
+        else:
+            save_df(path, None, **{'class': self.__class__.__name__})
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a temporal-node-set saved with :code:`save`.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays of the time-set are memory-mapped instead of read.
+
+        """
+        nodes, _ = load_df(path, mmap=False)
+        if nodes is None:
+            return cls()
+        return cls(NodeSetS(nodes['u'].tolist()), TimeSetDF.load(os.path.join(path, 'timeset'), mmap))
+
     def __bool__(self):
         return hasattr(self, 'nodeset_') and hasattr(self, 'timeset_') and bool(self.nodeset_) and bool(self.timeset_)
 
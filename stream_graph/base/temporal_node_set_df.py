@@ -3,19 +3,24 @@ from numbers import Real
 from collections import defaultdict
 from collections import Counter
 from six import iteritems
-from itertools import combinations
 
+import numpy as np
+import pandas as pd
 import stream_graph as sg
 from .utils import ts_to_df, tns_to_df
 from .time_set_df import TimeSetDF
 from .node_set_s import NodeSetS
 from .multi_df_utils import load_interval_df, itertuples_pretty, init_interval_df, build_time_generator, itertuples_raw
-from .multi_df_utils import len_set_nodes, set_nodes
+from .multi_df_utils import len_set_nodes, element_nodes
 from .utils import time_discretizer_df
+from .node_dictionary import get_node_dictionary
+from .storage import save_df, load_df
+from .dataframes.algorithms.vectorized_interval import overlapping_pairs as overlapping_pairs_
 from stream_graph import ABC
 from stream_graph.exceptions import UnrecognizedTemporalNodeSet, UnrecognizedNodeSet, UnrecognizedTimeSet
 from stream_graph.collections import TimeCollection
 from stream_graph.collections import TimeGenerator
+from stream_graph.collections import TimeDeltaGenerator
 from stream_graph.collections import NodeCollection
 from stream_graph.collections import LinkCollection
 
@@ -35,8 +40,11 @@ class TemporalNodeSetDF(ABC.TemporalNodeSet):
     sort_by: Any non-empty subset of ['u', 'ts', 'tf'].
         The order of the DataFrame elements by which they will be produced when iterated.
 
+    node_dictionary: NodeDictionary, default=None
+        If given, node columns are stored as codes of this dictionary.
+
     """
-    def __init__(self, df=None, disjoint_intervals=True, sort_by=None, discrete=None, default_closed='both'):
+    def __init__(self, df=None, disjoint_intervals=True, sort_by=None, discrete=None, default_closed='both', node_dictionary=None):
         if df is not None:
             if isinstance(df, (TemporalNodeSetDF)):
                 if bool(df):
@@ -52,6 +60,51 @@ class TemporalNodeSetDF(ABC.TemporalNodeSet):
                 self.df_, self.discrete_ = load_interval_df(df, disjoint_intervals=disjoint_intervals, default_closed=default_closed, discrete=discrete, keys=['u'])
         else:
             self.discrete_ = (True if discrete is None else discrete)
+        if node_dictionary is not None and bool(self):
+            self.df_ = node_dictionary.encode_df(self.df_, ['u'])
+
+    def save(self, path):
+        """Save the temporal-node-set as a directory of numpy arrays.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        header = {'class': self.__class__.__name__, 'discrete': self.discrete}
+        if bool(self):
+            header['sort_by'], header['sorted'] = self.sort_by, self.is_sorted_
+            header['merged'], header['sorted_by'] = self.df_.is_merged, self.df_.sorted_by
+        save_df(path, (self.df_ if bool(self) else None), **header)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a temporal-node-set saved with :code:`save`.
+
+        Intervals are known to be merged and sorted as they were saved, so that no check is repeated.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays are memory-mapped instead of read.
+
+        """
+        df, header = load_df(path, mmap)
+        if df is None:
+            return cls(discrete=header['discrete'])
+        obj = cls(init_interval_df(df, discrete=header['discrete'], keys=['u']), sort_by=header['sort_by'])
+        obj.sorted_ = header['sorted']
+        obj.df_._merged, obj.df_._sorted_by = header.get('merged', False), header.get('sorted_by', None)
+        return obj
+
+    @property
+    def node_dictionary(self):
+        if bool(self):
+            return get_node_dictionary(self.df_)
 
     @property
     def discrete(self):
@@ -127,7 +180,7 @@ class TemporalNodeSetDF(ABC.TemporalNodeSet):
     def nodeset(self):
         if not bool(self):
             return NodeSetS()
-        return NodeSetS(self.df.u.drop_duplicates().values.flat)
+        return NodeSetS(self.df.u.drop_duplicates().values)
 
     @property
     def total_common_time(self):
@@ -144,6 +197,13 @@ class TemporalNodeSetDF(ABC.TemporalNodeSet):
         else:
             return 0
 
+    @property
+    def measures(self):
+        if bool(self):
+            return tuple(self.df.active_measures())
+        else:
+            return 0, 0
+
     def __iter__(self):
         if bool(self):
             return itertuples_pretty(self.df, self.discrete)
@@ -292,48 +352,39 @@ class TemporalNodeSetDF(ABC.TemporalNodeSet):
 
     def common_time_pair(self, l=None):
         if l is None or self._common_time_pair__list_input(l):
-            if not bool(self):
-                return LinkCollection(dict())
-            df = self.df.events
-            active_nodes = set()
-            e = df.t.iloc[0]
-            if l is None:
-                common_times = Counter()
-
-                def add_item(active_nodes, ct):
-                    for u, v in combinations(active_nodes, 2):
-                        common_times[(u, v)] += ct
-            else:
+            if l is not None:
                 links = set(l)
                 common_times = {l: 0 for l in links}
                 allowed_nodes = set(c for a, b in links for c in [a, b])
+                df = (self.df[self.df.u.isin(allowed_nodes)] if bool(self) else None)
+            else:
+                df = (self.df if bool(self) else None)
+            if df is None or not df.shape[0]:
+                return LinkCollection(common_times if l is not None else dict())
+
+            # Join the overlapping intervals and sum their intersection by unordered pair of node codes
+            i, j, size = overlapping_pairs_(df, discrete=self.discrete)
+            try:
+                codes, labels = pd.factorize(df.u.values, sort=True)
+            except TypeError:
+                codes, labels = pd.factorize(df.u.values)
+            labels, a, b = pd.Index(labels), codes[i], codes[j]
+            idx = (a != b)
+            a, b, size = np.minimum(a[idx], b[idx]), np.maximum(a[idx], b[idx]), size[idx]
+            n = len(labels)
+            pairs = pd.Series(size).groupby(a.astype(np.int64) * n + b).sum()
 
-                def add_item(active_nodes, ct):
-                    active_set = active_nodes & allowed_nodes
-                    if len(common_times) <= (len(active_set) * (len(active_set) - 1)) / 2:
-                        for (u, v) in common_times.keys():
-                            if u in active_set and v in active_set:
-                                common_times[(u, v)] += ct
-                    else:
-                        for u, v in combinations(active_set, 2):
-                            if (u, v) in common_times:
-                                common_times[(u, v)] += ct
-                            if (v, u) in common_times:
-                                common_times[(v, u)] += ct
-
-            dc = (1 if self.discrete else 0)
-            for u, t, f in df.itertuples(index=False, name=None):
-                ct = (len(active_nodes) - 1) * (t - e + dc)
-                if ct > .0:
-                    add_item(active_nodes, ct)
-                if f:
-                    # start
-                    active_nodes.add(u)
-                else:
-                    # finish
-                    active_nodes.remove(u)
-                e = t
-            return LinkCollection(common_times)
+            if l is None:
+                labels = labels.tolist()
+                return LinkCollection({(labels[k // n], labels[k % n]): ct for k, ct in zip(pairs.index.tolist(), pairs.tolist())})
+            else:
+                links = list(links)
+                la, lb = labels.get_indexer([u for u, _ in links]), labels.get_indexer([v for _, v in links])
+                idx = np.flatnonzero((la >= 0) & (lb >= 0) & (la != lb))
+                keys = np.minimum(la[idx], lb[idx]).astype(np.int64) * n + np.maximum(la[idx], lb[idx])
+                for k, ct in zip(idx.tolist(), pairs.reindex(keys, fill_value=0).tolist()):
+                    common_times[links[k]] += ct
+                return LinkCollection(common_times)
         else:
             u, v = l
             if bool(self):
@@ -359,16 +410,22 @@ class TemporalNodeSetDF(ABC.TemporalNodeSet):
             else:
                 return 0
 
-    def nodes_at(self, t=None):
+    def nodes_at(self, t=None, times=None):
+        if times is not None:
+            if not bool(self):
+                return TimeCollection(((t, NodeSetS()) for t in times), discrete=self.discrete, instantaneous=True)
+            offsets, positions = self.df.positions_at_times(times)
+            nodes = self.df.u.values[positions]
+            return TimeCollection(((t, NodeSetS(nodes[offsets[i]:offsets[i + 1]])) for i, t in enumerate(times)), discrete=self.discrete, instantaneous=True)
         if bool(self):
             if t is None:
-                return self._build_time_generator(set, set_nodes, TimeGenerator)
+                return TimeDeltaGenerator(build_time_generator(self.df, Counter, element_nodes, delta=True), discrete=self.discrete)
 
             elif isinstance(t, tuple) and len(t) in [2, 3] and isinstance(t[0], Real) and isinstance(t[1], Real) and t[0] <= t[1]:
                 assert len(t) == 2 or t[2] in ['neither', 'both', 'left', 'right']
-                return NodeSetS(self.df.df_at_interval(*t).u.values.flat)
+                return NodeSetS(self.df.df_at_interval(*t).u.values)
             elif isinstance(t, Real):
-                return NodeSetS(self.df.df_at(t).u.values.flat)
+                return NodeSetS(self.df.df_at(t).u.values)
             else:
                 raise ValueError('Input can either be a real number or an ascending interval of two real numbers')
         else:
@@ -3,6 +3,7 @@ from warnings import warn
 from numbers import Real
 from .utils import time_discretizer_df
 from .multi_df_utils import load_interval_df, itertuples_pretty, init_interval_df
+from .storage import save_df, load_df
 from stream_graph import ABC
 from stream_graph.exceptions import UnrecognizedTimeSet
 from stream_graph.exceptions import UnrecognizedTemporalNodeSet
@@ -87,6 +88,43 @@ class TimeSetDF(ABC.TimeSet):
         else:
             return self._empty_base_class()
 
+    def save(self, path):
+        """Save the time-set as a directory of numpy arrays.
+
+        Parameters
+        ----------
+        path: str
+            The directory, created if it does not exist.
+
+        """
+        header = {'class': self.__class__.__name__, 'discrete': self.discrete, 'sorted': self.is_sorted_}
+        if bool(self):
+            header['merged'], header['sorted_by'] = self.df_.is_merged, self.df_.sorted_by
+        save_df(path, (self.df_ if bool(self) else None), **header)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a time-set saved with :code:`save`.
+
+        Intervals are known to be merged and sorted as they were saved, so that no check is repeated.
+
+        Parameters
+        ----------
+        path: str
+            The directory.
+
+        mmap: Bool, default=True
+            If True the arrays are memory-mapped instead of read.
+
+        """
+        df, header = load_df(path, mmap)
+        if df is None:
+            return cls(discrete=header['discrete'])
+        obj = cls(init_interval_df(df, discrete=header['discrete']), discrete=header['discrete'])
+        obj.sorted_ = header['sorted']
+        obj.df_._merged, obj.df_._sorted_by = header.get('merged', False), header.get('sorted_by', None)
+        return obj
+
     def __bool__(self):
         return hasattr(self, 'df_') and not self.df_.empty
 
@@ -0,0 +1,85 @@
+from __future__ import absolute_import
+from collections import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .dataframes.algorithms import vectorized_interval
+from stream_graph.collections import TimeCollection
+
+METRICS = ('m', 'n', 'interactions', 'density', 'degree')
+
+
+def window_metrics(df, size, times=None, step=None, metrics=('m', 'n'), discrete=False):
+    """Compute metrics of a link stream over sliding windows.
+
+    The window of size :code:`size` ending at :code:`t` is :math:`(t - size, t]`. A link occurrence
+    :code:`[ts, tf]` overlaps it as long as :math:`ts \\leq t < tf + size`, so that it enters the windows
+    at :code:`ts` and leaves them at :code:`tf + size`. These presence intervals are merged by link
+    (or by node) and counted at all sampling times with a binary search, in a single sorted pass
+    for each metric and window size, instead of a substream for each window.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame or None
+        With columns u, v, ts (and tf for intervals). The bounds of continuous intervals are ignored.
+
+    size: Real or Iterable
+        The size of the windows, or a list of them.
+
+    times: Iterable, default=None
+        The ending times of the windows. If None, from the first starting time to the last finishing time
+        every :code:`step`.
+
+    step: Real, default=None
+        If None it is equal to :code:`size`.
+
+    metrics: Iterable, default=('m', 'n')
+        Any of 'm' (distinct links), 'n' (distinct nodes), 'interactions' (link occurrences),
+        'density' (:math:`\\frac{m}{n(n-1)}`) and 'degree' (the average degree :math:`\\frac{m}{n}`).
+
+    discrete: Bool, default=False
+
+    Returns
+    -------
+    metrics: dict
+        A TimeCollection of instants for each metric, or if :code:`size` is a list such a dictionary for each size.
+
+    """
+    if isinstance(size, Iterable):
+        return {s: window_metrics(df, s, times, step, metrics, discrete) for s in size}
+    assert size > 0 and all(m in METRICS for m in metrics)
+    if df is None or df.empty:
+        return {m: TimeCollection(discrete=discrete, instantaneous=True) for m in metrics}
+
+    ts = df['ts'].values
+    tf = (df['tf'].values if 'tf' in df.columns else ts)
+    if times is None:
+        step = (size if step is None else step)
+        times = ts.min() + step * np.arange(int((tf.max() - ts.min()) // step) + 1)
+    times = np.asarray(times)
+
+    # The presence of each occurrence in the windows, as closed discrete or right-open continuous intervals
+    if discrete:
+        presence = pd.DataFrame({'ts': ts, 'tf': tf + (size - 1)})
+    else:
+        presence = pd.DataFrame({'ts': ts, 'tf': tf + size, 's': True, 'f': False})
+
+    counts = dict()
+    if 'interactions' in metrics:
+        counts['interactions'] = vectorized_interval.count_at_times(presence, [], times, discrete)
+    if {'m', 'density', 'degree'} & set(metrics):
+        links = presence.assign(u=df['u'].values, v=df['v'].values)
+        counts['m'] = vectorized_interval.count_at_times(links, ['u', 'v'], times, discrete)
+    if {'n', 'density', 'degree'} & set(metrics):
+        nodes = pd.concat([presence, presence], ignore_index=True)
+        nodes['u'] = pd.concat([df['u'], df['v']], ignore_index=True).values
+        counts['n'] = vectorized_interval.count_at_times(nodes, ['u'], times, discrete)
+    if 'density' in metrics:
+        n = counts['n'].astype(float)
+        counts['density'] = np.where(n > 1, counts['m'] / np.maximum(n * (n - 1), 1.), .0)
+    if 'degree' in metrics:
+        n = counts['n'].astype(float)
+        counts['degree'] = np.where(n > 0, counts['m'] / np.maximum(n, 1.), .0)
+
+    return {m: TimeCollection(zip(times.tolist(), counts[m].tolist()), discrete=discrete, instantaneous=True) for m in metrics}
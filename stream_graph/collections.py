@@ -1,8 +1,9 @@
 from __future__ import absolute_import
 import warnings
+import numpy as np
 import pandas as pd
-import operator
 from collections import defaultdict
+from numbers import Number
 from six import iteritems
 
 
@@ -104,11 +105,25 @@ class TimeGenerator(object):
     def instants(self):
         return self.instantaneous
 
-    def merge(self, b, measure, ignore_value=None, missing_value=None):
-        """Merge two generator objects."""
+    def merge(self, b, measure, ignore_value=None, missing_value=None, vectorized=False):
+        """Merge two generator objects.
+
+        Collections of the same kind with numeric values are merged on arrays,
+        else events are consumed lazily through a queue.
+        If vectorized, :code:`measure` is a function of arrays (as a ufunc) and is called once.
+
+        """
         assert isinstance(b, (TimeGenerator))
         assert self.discrete == b.discrete
         instants = b.instants and self.instants
+        if b.instants == self.instants and isinstance(self, TimeCollection) and isinstance(b, TimeCollection):
+            arrays = [TimeArrayCollection(x, discrete=x.discrete, instantaneous=x.instants) for x in [self, b]]
+            if all(x.numeric for x in arrays) and _array_mergeable(arrays):
+                out = merge_arrays(arrays, measure, ignore_value, missing_value, vectorized)
+                return TimeGenerator(iter(out), discrete=self.discrete, instantaneous=instants)
+        if vectorized:
+            measure = _elementwise(measure)
+
         if b.instants and self.instants:
             assert isinstance(b, (TimeCollection, TimeGenerator))
 
@@ -143,7 +158,9 @@ class TimeGenerator(object):
             def addq(queue, obj):
                 queue.append(obj)
                 if len(queue) > 1:
-                    queue = sorted(queue, key=operator.itemgetter(0), reverse=True)
+                    # The queue holds at most one event of each generator
+                    if queue[0][0] < queue[1][0]:
+                        queue.reverse()
                     if queue[0][0] == queue[1][0]:
                         # Always from a different category:
                         if queue[0][2]:
@@ -224,7 +241,7 @@ class TimeGenerator(object):
                 obj = generate(iter_a, iter_b, measure, ignore_value, missing_value)
             else:
                 obj = generate(iter(self), iter(b), measure, ignore_value, missing_value)
-        return TimeGenerator(obj, instantaneous=instants)
+        return TimeGenerator(obj, discrete=self.discrete, instantaneous=instants)
 
     def map(self, fun, unsafe=True):
         if unsafe:
@@ -339,14 +356,154 @@ class TimeCollection(TimeGenerator):
     def __nonzero__(self):
         return self.__bool__()
 
-    def merge(self, b, measure, ignore_value=None, missing_value=None):
-        return TimeCollection(super(TimeCollection, self).merge(b, measure, ignore_value, missing_value),
+    def merge(self, b, measure, ignore_value=None, missing_value=None, vectorized=False):
+        return TimeCollection(super(TimeCollection, self).merge(b, measure, ignore_value, missing_value, vectorized),
                               instantaneous=self.instants, discrete=self.discrete)
 
     def map(self, fun):
         return TimeCollection(super(TimeCollection, self).map(fun), instantaneous=self.instantaneous, discrete=self.discrete)
 
 
+class TimeArrayCollection(TimeCollection):
+    """A TimeCollection stored in parallel numpy arrays.
+
+    Times, bound flags (for keys of the form :code:`(t, closed)`) and values are kept
+    in arrays and lookups are done with :code:`numpy.searchsorted`. It is built from any
+    TimeCollection or iterable in its list form and converted back with :code:`TimeCollection(obj)`.
+
+    Parameters
+    ----------
+    it: Iterable
+        Of :code:`(t, value)` in ascending time.
+
+    discrete: Bool, default=False
+
+    instantaneous: Bool, default=False
+
+    """
+    def __init__(self, it=[], discrete=False, instantaneous=False):
+        self.discrete = discrete
+        self.instantaneous = instantaneous
+        if isinstance(it, TimeArrayCollection):
+            self.times_, self.closed_, self.values_ = it.times_, it.closed_, it.values_
+        else:
+            it = list(it)
+            if len(it) and isinstance(it[0][0], tuple):
+                self.times_ = np.array([k[0] for k, _ in it])
+                self.closed_ = np.array([k[1] for k, _ in it], dtype=bool)
+            else:
+                self.times_, self.closed_ = np.array([k for k, _ in it]), None
+            self.values_ = _as_values([v for _, v in it])
+
+    @classmethod
+    def from_arrays(cls, times, values, closed=None, discrete=False, instantaneous=False):
+        """Build a collection directly from its arrays."""
+        obj = cls(discrete=discrete, instantaneous=instantaneous)
+        obj.times_, obj.values_ = np.asarray(times), _as_values(values)
+        obj.closed_ = (None if closed is None else np.asarray(closed, dtype=bool))
+        return obj
+
+    @property
+    def numeric(self):
+        """If the values are stored as a numeric array."""
+        return self.values_.dtype.kind in 'biuf'
+
+    def __str__(self):
+        if bool(self):
+            return "stream_graph.TimeArrayCollection" + ("[instantaneous]" if self.instantaneous else "") + ": " + str(list(self))
+        else:
+            return "stream_graph.TimeArrayCollection: Empty"
+
+    def _key(self, i):
+        t = _as_scalar(self.times_[i])
+        return (t if self.closed_ is None else (t, bool(self.closed_[i])))
+
+    def append(self, obj):
+        t, v = obj
+        if isinstance(t, tuple):
+            t, closed = t
+            self.closed_ = np.append((np.ones(len(self), dtype=bool) if self.closed_ is None else self.closed_), closed)
+        elif self.closed_ is not None:
+            self.closed_ = np.append(self.closed_, True)
+        self.times_ = (np.append(self.times_, t) if len(self) else np.array([t]))
+        self.values_ = (np.append(self.values_, _as_values([v])) if len(self) else _as_values([v]))
+
+    def __iter__(self):
+        times, values = self.times_.tolist(), self.values_.tolist()
+        if self.closed_ is not None:
+            times = zip(times, self.closed_.tolist())
+        return iter(zip(times, values))
+
+    def __len__(self):
+        return self.times_.shape[0]
+
+    def __getitem__(self, i):
+        return (self._key(i), _as_scalar(self.values_[i]))
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def _positions(self, times, closed=None):
+        times = np.asarray(times)
+        if self.instantaneous:
+            idx = np.searchsorted(self.times_, times, side='left')
+            found = idx < len(self)
+            found[found] = (self.times_[idx[found]] == times[found])
+            return np.where(found, idx, -1)
+        hi = np.searchsorted(self.times_, times, side='right')
+        if self.discrete or self.closed_ is None or closed is None:
+            return np.maximum(hi - 1, 0)
+        # Keys are sorted on (t, closed): at an equal time the open bounds come first
+        lo = np.searchsorted(self.times_, times, side='left')
+        n_open = np.concatenate([[0], np.cumsum(~self.closed_)])
+        return np.maximum(np.where(closed, hi, lo + n_open[hi] - n_open[lo]) - 1, 0)
+
+    def search_time(self, t):
+        closed = None
+        if not (self.discrete or self.instantaneous) and isinstance(t, tuple):
+            t, closed = t
+        idx = self._positions([t], (None if closed is None else [closed]))[0]
+        return (None if idx < 0 else int(idx))
+
+    def search_times(self, times):
+        """Vectorized :code:`search_time`, with -1 for the times not found in an instantaneous collection."""
+        return self._positions(times)
+
+    def get_at(self, t, not_found=None):
+        idx = self.search_time(t)
+        if idx is None:
+            return not_found
+        return self[idx][1]
+
+    def get_at_times(self, times, not_found=None):
+        """Vectorized :code:`get_at`, returning an array of values."""
+        idx = self._positions(times)
+        return _take(self.values_, idx, idx >= 0, not_found)
+
+    def map(self, fun, vectorized=False):
+        """Map a function :code:`fun(t, v)` on the collection.
+
+        If vectorized, :code:`fun` is called once on the times and values arrays.
+
+        """
+        if vectorized:
+            values = fun(self.times_, self.values_)
+        else:
+            values = [fun(t, v) for t, v in self]
+        return self.from_arrays(self.times_, values, self.closed_, self.discrete, self.instantaneous)
+
+    def merge(self, b, measure, ignore_value=None, missing_value=None, vectorized=False):
+        """Merge two collections, on their arrays if both are array backed and of the same kind.
+
+        If vectorized, :code:`measure` is called once on the arrays of values.
+
+        """
+        if not (isinstance(b, TimeArrayCollection) and _array_mergeable([self, b])):
+            tc = super(TimeArrayCollection, self).merge(b, measure, ignore_value, missing_value, vectorized)
+            return TimeArrayCollection(tc, discrete=self.discrete, instantaneous=tc.instantaneous)
+        return merge_arrays([self, b], measure, ignore_value, missing_value, vectorized)
+
+
 class TimeSparseCollection(TimeCollection):
     def __init__(self, it=[], caster=set, discrete=False):
         self.it = [(t, obj, f) for t, obj, f in it]
@@ -374,6 +531,64 @@ class TimeSparseCollection(TimeCollection):
             yield (t, self.caster(holder))
 
 
+class TimeDeltaGenerator(TimeGenerator):
+    """A generator of states over time, encoded as change records.
+
+    Parameters
+    ----------
+    it: Iterable
+        Of :code:`(t, added, removed)` records in ascending time.
+
+    caster: callable, default=set
+        Builds the state yielded at each time, from the set of active elements.
+
+    discrete: Bool, default=False
+
+    """
+    def __init__(self, it=iter([]), caster=set, discrete=False):
+        super(TimeDeltaGenerator, self).__init__(it, discrete, False)
+        self.caster = caster
+
+    def __iter__(self):
+        for t, holder in self.accumulate():
+            yield (t, self.caster(holder))
+
+    @property
+    def deltas(self):
+        """Iterate the :code:`(t, added, removed)` records."""
+        return iter(self.it)
+
+    def accumulate(self, accumulator=None, add=None, remove=None):
+        """Apply the changes in place to an accumulator, yielding it after each time.
+
+        Parameters
+        ----------
+        accumulator: object, default=None
+            If None an empty set is used.
+
+        add, remove: callable, default=None
+            Called as :code:`add(accumulator, added)` and :code:`remove(accumulator, removed)`.
+            If None, the :code:`update` and :code:`difference_update` methods of the accumulator are used.
+
+        Returns
+        -------
+        out: Iterator
+            Of :code:`(t, accumulator)`. The accumulator is shared between iterations
+            and should be copied if it needs to be kept.
+
+        """
+        if accumulator is None:
+            accumulator = set()
+        if add is None:
+            add = type(accumulator).update
+        if remove is None:
+            remove = type(accumulator).difference_update
+        for t, added, removed in self.it:
+            remove(accumulator, removed)
+            add(accumulator, added)
+            yield (t, accumulator)
+
+
 class DataCube(object):
     def __init__(self, cube=None, columns=None, weight_column_name=None, column_sizes=None):
         if cube is None:
@@ -607,3 +822,132 @@ def instantize_continuous(it, ignore_value):
     for t, v in it:
         yield ((t, True), v)
         yield ((t, False), ignore_value)
+
+
+def merge_arrays(collections, measure, ignore_value=None, missing_value=None, vectorized=False):
+    """Merge array backed collections of the same kind in one pass.
+
+    The change points of all collections are sorted together with :code:`numpy.lexsort`.
+    For step functions the value of each collection at every change point is
+    forward-filled from its running count of events, while instantaneous collections
+    are matched on equal times.
+
+    Parameters
+    ----------
+    collections: list of TimeArrayCollection
+
+    measure: callable
+        Called as :code:`measure(v_1, .., v_k)`, on arrays of values if vectorized.
+
+    ignore_value: object, default=None
+        Values of the measure that are not kept: on changes of the step functions or
+        for instants where some collection is missing.
+
+    missing_value: object, default=None
+        The value of a collection before its first change point or at instants where it is missing.
+        If None, only the points where all collections are defined are kept.
+
+    vectorized: Bool, default=False
+
+    Returns
+    -------
+    out: TimeArrayCollection
+
+    """
+    assert _array_mergeable(collections)
+    base = collections[0]
+    k, sizes = len(collections), [len(c) for c in collections]
+    closed = any(c.closed_ is not None for c in collections)
+    t = np.concatenate([c.times_ for c in collections])
+    c = np.concatenate([(np.ones(n, dtype=bool) if x.closed_ is None else x.closed_) for x, n in zip(collections, sizes)])
+    source = np.repeat(np.arange(k), sizes)
+    # Bounds at an equal time are ordered as (t, False) < (t, True), unless a collection
+    # is ordered the other way, as the ones built from DataFrames are
+    order = np.lexsort((source, (~c if any(_closed_first(x) for x in collections) else c), t))
+    t, c, source = t[order], c[order], source[order]
+
+    # Reduce each distinct key to its last event
+    last = np.ones(len(t), dtype=bool)
+    last[:-1] = (t[1:] != t[:-1]) | (c[1:] != c[:-1])
+    first = np.flatnonzero(np.roll(last, 1))
+    idx, has = [], []
+    for i in range(k):
+        events = (source == i)
+        idx.append((np.cumsum(events) - 1)[last])
+        if base.instantaneous:
+            has.append(np.add.reduceat(events.astype(np.int64), first) > 0 if len(t) else np.zeros(0, dtype=bool))
+        else:
+            has.append(idx[-1] >= 0)
+    t, c = t[last], c[last]
+    every = np.logical_and.reduce(has)
+    keep = (every if missing_value is None else np.ones(len(t), dtype=bool))
+    t, c, every = t[keep], c[keep], every[keep]
+    values = [_take(x.values_, j[keep], h[keep], missing_value) for x, j, h in zip(collections, idx, has)]
+    m = _apply(measure, values, vectorized)
+
+    if base.instantaneous:
+        keep = every | _not_equal(m, ignore_value)
+    else:
+        keep = np.ones(len(m), dtype=bool)
+        if len(m):
+            keep[0] = bool(m[0] != ignore_value)
+            keep[1:] = _not_equal(m[1:], m[:-1])
+    return TimeArrayCollection.from_arrays(t[keep], m[keep], (c[keep] if closed else None), base.discrete, base.instantaneous)
+
+
+def _closed_first(collection):
+    if collection.closed_ is None or len(collection) < 2:
+        return False
+    times, closed = collection.times_, collection.closed_
+    return bool(((times[1:] == times[:-1]) & closed[:-1] & ~closed[1:]).any())
+
+
+def _array_mergeable(collections):
+    return (len(set(c.instantaneous for c in collections)) == 1 and len(set(c.discrete for c in collections)) == 1 and
+            len(set(c.closed_ is None for c in collections if len(c))) <= 1)
+
+
+def _as_values(values):
+    if isinstance(values, np.ndarray):
+        return values
+    values = list(values)
+    if all(isinstance(v, Number) for v in values):
+        return np.array(values)
+    array = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        array[i] = v
+    return array
+
+
+def _as_scalar(x):
+    return (x.item() if isinstance(x, np.generic) else x)
+
+
+def _take(values, idx, present, missing_value):
+    if len(values):
+        out = values[np.where(present, idx, 0)]
+    else:
+        out = np.empty(len(idx), dtype=object)
+    if not present.all():
+        if not isinstance(missing_value, Number) or out.dtype.kind not in 'biuf':
+            out = out.astype(object)
+        out[~present] = missing_value
+    return out
+
+
+def _apply(measure, values, vectorized):
+    if vectorized:
+        return np.asarray(measure(*values))
+    return _as_values([measure(*v) for v in zip(*[x.tolist() for x in values])])
+
+
+def _elementwise(measure):
+    def fun(*values):
+        return _as_scalar(np.asarray(measure(*[np.array([v]) for v in values]))[0])
+    return fun
+
+
+def _not_equal(a, b):
+    if isinstance(b, np.ndarray) and a.dtype.kind in 'biuf' and b.dtype.kind in 'biuf':
+        return a != b
+    return np.array([x != y for x, y in zip(a.tolist(), (b.tolist() if isinstance(b, np.ndarray) else [b] * len(a)))], dtype=bool)
@@ -1,6 +1,8 @@
 """Test file for stream graph."""
 from nose.tools import assert_equal
 from stream_graph.collections import TimeCollection
+from stream_graph.collections import TimeArrayCollection
+from stream_graph.collections import merge_arrays
 
 
 def add(x, y):
@@ -64,6 +66,52 @@ def test_search():
         assert_equal(a.search_time(i), v1)
 
 
+def test_time_array_collection():
+    cases = [([((1, True), 4), ((2, True), 3), ((4, False), 5), ((5, False), 0), ((6, False), 1), ((7, True), 0)],
+              [((1.5, False), 1), ((2, False), 2), ((3, False), 1), ((5.5, True), 0), ((8, True), 1)], dict()),
+             ([(2, 4), (4, 3), (8, 5), (10, 0), (12, 1), (14, 0)], [(3, 1), (4, 2), (6, 1), (11, 0), (16, 1)], dict(discrete=True)),
+             ([(2, 4), (4, 3), (8, 5), (10, 0), (12, 1), (14, 0)], [(3, 1), (4, 2), (6, 1), (11, 0), (16, 1)], dict(discrete=True, instantaneous=True))]
+    for a, b, kargs in cases:
+        tc_a, tc_b = TimeArrayCollection(a, **kargs), TimeArrayCollection(b, **kargs)
+        assert tc_a.numeric
+        assert_equal(list(tc_a), a)
+        assert_equal(list(TimeCollection(tc_a)), a)
+        ref = list(TimeCollection(a, **kargs).merge(TimeCollection(b, **kargs), add, missing_value=0))
+        assert_equal(list(tc_a.merge(tc_b, add, missing_value=0)), ref)
+        assert_equal(list(tc_a.merge(tc_b, add, missing_value=0, vectorized=True)), ref)
+        assert_equal(list(tc_a.map(lambda t, v: 2 * v)), [(t, 2 * v) for t, v in a])
+        assert_equal(list(tc_a.map(lambda t, v: 2 * v, vectorized=True)), [(t, 2 * v) for t, v in a])
+
+    a = TimeArrayCollection([((1, False), 3), ((4, True), 4)], discrete=False)
+    for i, v1, v2 in zip(range(6), 4 * [0] + 2 * [1], 5 * [0] + [1]):
+        assert_equal(a.search_time(i), v1)
+        assert_equal(a.search_time((i, False)), v2)
+    assert_equal(list(a.get_at_times(range(6))), 4 * [3] + 2 * [4])
+
+    a = TimeArrayCollection([(1, 3), (4, 4)], instantaneous=True)
+    for i, v1 in zip(range(6), [None, 0, None, None, 1, None]):
+        assert_equal(a.search_time(i), v1)
+    assert_equal(list(a.search_times(range(6))), [-1, 0, -1, -1, 1, -1])
+    assert_equal(list(a.get_at_times(range(6), not_found=0)), [0, 3, 0, 0, 4, 0])
+
+
+def test_merge_arrays():
+    tcs = [TimeArrayCollection([(2, 4), (4, 3), (8, 5)], discrete=True),
+           TimeArrayCollection([(3, 1), (4, 2), (9, 0)], discrete=True),
+           TimeArrayCollection([(1, 1), (8, 2)], discrete=True)]
+    assert_equal(list(merge_arrays(tcs, lambda x, y, z: x + y + z, missing_value=0)),
+                 [(1, 1), (2, 5), (3, 6), (8, 9), (9, 7)])
+    assert_equal(list(merge_arrays(tcs, lambda x, y, z: x + y + z)), [(3, 6), (8, 9), (9, 7)])
+
+    # Collections built from DataFrames order the closed bound of a time first
+    tc_a = TimeCollection([((0, True), 1), ((2, True), 2), ((7, True), 3), ((7, False), 1)])
+    tc_b = TimeCollection([((1, True), 1), ((7, False), 2)])
+    assert_equal(list(tc_a.merge(tc_b, add)), [((1, True), 2), ((2, True), 3), ((7, True), 4), ((7, False), 3)])
+    assert_equal(list(tc_a.merge(tc_b, lambda x, y: x * y, vectorized=True)), [((1, True), 1), ((2, True), 2), ((7, True), 3), ((7, False), 2)])
+
+
 if __name__ == "__main__":
     test_search()
     test_merge()
+    test_time_array_collection()
+    test_merge_arrays()
@@ -400,6 +400,277 @@ def test_time_generators_builders():
     assert_equal(list(build_time_generator(df, Counter, sum_counter_)), [(1, 1), (2, 3), (3, 2), (5, 3), (7, 1), (8, 0)])
 
 
+def test_time_generators_delta():
+    from collections import Counter
+    from stream_graph.base.multi_df_utils import build_time_generator, set_nodes, element_nodes
+    from stream_graph.collections import TimeDeltaGenerator
+
+    df = CIntervalDF([(1, 1, 3, True, False), (1, 4, 6, False, False), (2, 2, 3, False, True), (2, 5, 7, True, True)], columns=['u', 'ts', 'tf', 's', 'f'])
+    assert_equal(list(build_time_generator(df, Counter, element_nodes, delta=True)), [((1, True), {1}, set()), ((2, False), {2}, set()), ((3, True), set(), {1}), ((3, False), set(), {2}), ((4, False), {1}, set()), ((5, True), {2}, set()), ((6, True), set(), {1}), ((7, False), set(), {2})])
+    assert_equal(list(TimeDeltaGenerator(build_time_generator(df, Counter, element_nodes, delta=True))), list(build_time_generator(df, set, set_nodes)))
+
+    df = DIntervalDF([(1, 1, 3), (1, 5, 6), (2, 2, 2), (2, 4, 7)], columns=['u', 'ts', 'tf'])
+    assert_equal(list(build_time_generator(df, Counter, element_nodes, delta=True)), [(1, {1}, set()), (2, {2}, set()), (3, set(), {2}), (4, {2}, {1}), (5, {1}, set()), (7, set(), {1}), (8, set(), {2})])
+    assert_equal(list(TimeDeltaGenerator(build_time_generator(df, Counter, element_nodes, delta=True), discrete=True)), list(build_time_generator(df, set, set_nodes)))
+    tg = TimeDeltaGenerator(build_time_generator(df, Counter, element_nodes, delta=True), discrete=True)
+    assert_equal([(t, len(acc)) for t, acc in tg.accumulate()], [(1, 1), (2, 2), (3, 1), (4, 1), (5, 2), (7, 1), (8, 0)])
+
+
+def test_interval_df_engines():
+    # The sweeps on sorted arrays should agree with the event based implementation.
+    try:
+        CIntervalDF.vectorized, DIntervalDF.vectorized = False, False
+        test_cinterval_df()
+        test_dinterval_df()
+    finally:
+        CIntervalDF.vectorized, DIntervalDF.vectorized = True, True
+
+    for k in [[], [1]]:
+        assert_equal(op_([k + [3, 5], k + [7, 7]], o='m', cx=DIntervalDF, oc=len(k)), [tuple(k) + (3, 5), tuple(k) + (7, 7)])
+        assert_equal(op_([k + [3, 5, True, False], k + [7, 7, True, True]], o='m', cx=CIntervalDF, oc=len(k)), [tuple(k) + (3, 5, True, False), tuple(k) + (7, 7, True, True)])
+        assert_equal(op_([k + [3, 5], k + [8, 9]], y=[k + [4, 8]], o='i', cx=DIntervalDF, oc=len(k)), [tuple(k) + (4, 5), tuple(k) + (8, 8)])
+
+
+def test_interval_index():
+    data = [(1, 2, 5, True, False), (1, 5, 8, False, True), (2, 1, 3, True, True), (2, 3, 9, False, False), (3, 4, 4, True, True)]
+    df = CIntervalDF(data, columns=['u', 'ts', 'tf', 's', 'f'])
+    for ts, tf in product(range(0, 11), range(0, 11)):
+        if ts <= tf:
+            for it in [None, 'left', 'right', 'both']:
+                l, r = (it in ['left', 'both'], it in ['right', 'both'])
+                mask = ((df.ts < ts) & (df.tf > tf)) | ((df.ts == ts) & (df.s | l)) | ((df.tf == tf) & (df.f | r))
+                assert_equal(list(df.index_at_interval(ts, tf, it)), list(mask))
+    assert_equal(df.count_at(5), 1)
+    assert_equal(sorted(dump_iter_(df.df_at(4))), [(1, 2, 5, True, False), (2, 3, 9, False, False), (3, 4, 4, True, True)])
+
+    # Mutations invalidate the index
+    df.loc[4, 'tf'] = 6
+    assert_equal(df.count_at(6), 3)
+    df.at[0, 'tf'] = 7
+    assert_equal(df.count_at(6), 4)
+    df.iat[2, 2] = 6
+    assert_equal(df.count_at(6), 5)
+
+    data = [(1, 2, 5), (1, 7, 8), (2, 1, 3), (2, 4, 9), (3, 4, 4)]
+    df = DIntervalDF(data, columns=['u', 'ts', 'tf'])
+    for ts, tf in product(range(0, 11), range(0, 11)):
+        if ts <= tf:
+            assert_equal(list(df.index_at_interval(ts, tf)), list((df.ts <= ts) & (df.tf >= tf)))
+    assert_equal(df.count_at(4), 3)
+    assert_equal(sorted(dump_iter_(df.df_at(8))), [(1, 7, 8), (2, 4, 9)])
+    df['tf'] = df['tf'] + 1
+    assert_equal(df.count_at(10), 1)
+    df.at[1, 'tf'] = 10
+    assert_equal(df.count_at(10), 2)
+    df.iat[0, 2] = 10
+    assert_equal(df.count_at(10), 3)
+
+    df = DIntervalWDF([(1, 2, 5, 1), (2, 4, 9, 2)], columns=['u', 'ts', 'tf', 'w'])
+    assert_equal(df.count_at(7), 1)
+    df.at[0, 'tf'] = 8
+    assert_equal(df.count_at(7), 2)
+
+
+def test_interval_df_invariants():
+    for cx, data in [(CIntervalDF, [(2, 4, 6, True, True), (1, 1, 3, True, True), (1, 2, 5, True, True)]),
+                     (CIntervalWDF, [(2, 4, 6, True, True, 1), (1, 1, 3, True, True, 2), (1, 2, 5, True, True, 1)]),
+                     (DIntervalDF, [(2, 4, 6), (1, 1, 3), (1, 2, 5)]),
+                     (DIntervalWDF, [(2, 4, 6, 1), (1, 1, 3, 2), (1, 2, 5, 1)])]:
+        columns = ['u', 'ts', 'tf'] + (['s', 'f'] if cx in [CIntervalDF, CIntervalWDF] else []) + (['w'] if cx in [CIntervalWDF, DIntervalWDF] else [])
+        df = cx(data, columns=columns)
+        assert not df.is_merged and df.sorted_by is None
+        df = df.merge().sort_values(by=['u', 'ts'])
+        assert df.is_merged and df.sorted_by == ['u', 'ts']
+
+        # Row subsets, copies and re-sorts on the same columns keep the invariants
+        assert_equal(df.merge().values.tolist(), df.values.tolist())
+        for out in [df.copy(), df[df.u == 1], df.sort_values(by=['u', 'ts'])]:
+            assert out.is_merged and out.sorted_by == ['u', 'ts']
+        assert df.sort_values(by='ts').sorted_by == ['ts']
+        assert df.drop(columns=['u']).is_merged and not df.drop(columns=['u'], merge=False).is_merged
+
+        # Reordered rows stay merged, but are no longer sorted
+        sdf = df.sort_values(by='ts')
+        for out in [sdf[::-1], cx(sdf.iloc[list(range(1, len(sdf))) + [0]])]:
+            assert out.sorted_by is None
+            assert_equal(out.sort_values(by='ts').ts.tolist(), sorted(sdf.ts.tolist()))
+        assert sdf[::-1].is_merged and sdf[::2].sorted_by == ['ts']
+
+        # While mutations drop them, including those through at/iat
+        df.loc[df.index[0], 'tf'] = 7
+        assert not df.is_merged and df.sorted_by is None
+        for setter in [lambda df: df.at.__setitem__((df.index[-1], 'ts'), 0), lambda df: df.iat.__setitem__((-1, 1), 0)]:
+            df = cx(data, columns=columns).merge().sort_values(by=['ts'])
+            setter(df)
+            assert not df.is_merged and df.sorted_by is None
+            assert_equal(df.sort_values(by=['ts']).ts.tolist(), sorted(df.ts.tolist()))
+
+        df = cx(data, columns=columns).merge()
+        df.at[df.index[df.u == 2][0], 'u'] = 1
+        assert_equal(sorted(dump_iter_(df.merge())), sorted(dump_iter_(cx(df.values.tolist(), columns=columns).merge())))
+
+    # A weighted frame becomes an unweighted one by dropping its weights
+    df = CIntervalDF(CIntervalWDF([(1, 1, 3, True, True, 2), (1, 2, 5, True, True, 1)], columns=['u', 'ts', 'tf', 's', 'f', 'w']))
+    assert_equal(sorted(dump_iter_(df)), [(1, 1, 5, True, True)])
+    df = DIntervalDF(DIntervalWDF([(1, 1, 3, 2), (1, 2, 5, 1)], columns=['u', 'ts', 'tf', 'w']))
+    assert_equal(sorted(dump_iter_(df)), [(1, 1, 5)])
+
+
+def test_weighted_merge_reducers():
+    try:
+        CIntervalWDF.vectorized, DIntervalWDF.vectorized = False, False
+        test_cinterval_wdf()
+        test_dinterval_wdf()
+    finally:
+        CIntervalWDF.vectorized, DIntervalWDF.vectorized = True, True
+
+    data = [(1, 1, 4, 2), (1, 3, 6, 5), (2, 0, 1, 1), (2, 2, 3, 1)]
+    expected = {'sum': [(1, 1, 2, 2), (1, 3, 4, 7), (1, 5, 6, 5), (2, 0, 3, 1)],
+                'max': [(1, 1, 2, 2), (1, 3, 6, 5), (2, 0, 3, 1)],
+                'min': [(1, 1, 4, 2), (1, 5, 6, 5), (2, 0, 3, 1)],
+                'mean': [(1, 1, 2, 2.), (1, 3, 4, 3.5), (1, 5, 6, 5.), (2, 0, 3, 1.)],
+                'count': [(1, 1, 2, 1), (1, 3, 4, 2), (1, 5, 6, 1), (2, 0, 3, 1)]}
+    for reducer in ['sum', 'max', 'min', 'mean', 'count']:
+        df = DIntervalWDF(data, columns=['u', 'ts', 'tf', 'w'], disjoint_intervals=False, merge_function=reducer)
+        assert_equal(sorted(df.itertuples(weights=True)), expected[reducer])
+
+    df = CIntervalWDF([(1, 1., 4., True, True, 2), (1, 4., 6., True, False, 5)], columns=['u', 'ts', 'tf', 's', 'f', 'w'], disjoint_intervals=False, merge_function='max')
+    assert_equal(sorted(df.itertuples(bounds=True, weights=True)), [(1, 1., 4., True, False, 2), (1, 4., 6., True, False, 5)])
+
+
+def test_weighted_set_operations():
+    dfa = DIntervalWDF([(1, 2, 2, 1), (1, 3, 3, 2), (1, 4, 5, 1), (2, 1, 3, 1)], columns=['u', 'ts', 'tf', 'w'], disjoint_intervals=True)
+    dfb = DIntervalWDF([(1, 1, 4, 1), (2, 2, 3, 1), (3, 0, 1, 4)], columns=['u', 'ts', 'tf', 'w'], disjoint_intervals=True)
+
+    index = dfa.segment_index(['u'])
+    assert index is dfa.segment_index(['u'])
+    assert_equal(len(index), 4)
+
+    assert_equal(sorted(dfa.union(dfb).itertuples(weights=True)), [(1, 1, 1, 1), (1, 2, 2, 2), (1, 3, 3, 3), (1, 4, 4, 2), (1, 5, 5, 1), (2, 1, 1, 1), (2, 2, 3, 2), (3, 0, 1, 4)])
+    assert_equal(sorted(dfa.intersection(dfb).itertuples(weights=True)), [(1, 2, 4, 1), (2, 2, 3, 1)])
+    assert_equal(sorted(dfa.difference(dfb).itertuples(weights=True)), [(1, 3, 3, 1), (1, 5, 5, 1), (2, 1, 1, 1)])
+    assert_equal(sorted(dfa.union(dfb, union_function=max).itertuples(weights=True)), [(1, 1, 2, 1), (1, 3, 3, 2), (1, 4, 5, 1), (2, 1, 3, 1), (3, 0, 1, 4)])
+
+    dfa.loc[0, 'w'] = 3
+    assert dfa.segment_index(['u']) is not index
+    assert_equal(sorted(dfa.intersection(dfb).itertuples(weights=True)), [(1, 2, 4, 1), (2, 2, 3, 1)])
+    assert_equal(sorted(dfa.difference(dfb).itertuples(weights=True)), [(1, 2, 2, 2), (1, 3, 3, 1), (1, 5, 5, 1), (2, 1, 1, 1)])
+
+    index = dfa.segment_index(['u'])
+    dfa.at[1, 'w'] = 5
+    assert dfa.segment_index(['u']) is not index
+    dfa.iat[3, 3] = 4
+    assert_equal(sorted(dfa.union(dfb).itertuples(weights=True)), [(1, 1, 1, 1), (1, 2, 2, 4), (1, 3, 3, 6), (1, 4, 4, 2), (1, 5, 5, 1), (2, 1, 1, 4), (2, 2, 3, 5), (3, 0, 1, 4)])
+
+    dfa = CIntervalWDF([(1, 1., 3., True, False, 2), (1, 3., 5., True, True, 1)], columns=['u', 'ts', 'tf', 's', 'f', 'w'], disjoint_intervals=True)
+    dfb = CIntervalWDF([(1, 2., 3., False, True, 1)], columns=['u', 'ts', 'tf', 's', 'f', 'w'], disjoint_intervals=True)
+    assert_equal(sorted(dfa.union(dfb).itertuples(bounds=True, weights=True)), [(1, 1., 2., True, True, 2), (1, 2., 3., False, False, 3), (1, 3., 3., True, True, 2), (1, 3., 5., False, True, 1)])
+    assert_equal(sorted(dfa.intersection(dfb).itertuples(bounds=True, weights=True)), [(1, 2., 3., False, True, 1)])
+    assert_equal(sorted(dfa.difference(dfb).itertuples(bounds=True, weights=True)), [(1, 1., 2., True, True, 2), (1, 2., 3., False, False, 1), (1, 3., 5., False, True, 1)])
+
+    # An empty left operand
+    for cx, columns, data in [(DIntervalWDF, ['u', 'ts', 'tf', 'w'], [(3, 6, 7, 1)]),
+                              (CIntervalWDF, ['u', 'ts', 'tf', 's', 'f', 'w'], [(3, 6., 7., True, False, 1)])]:
+        dfb = cx(data, columns=columns)
+        for dfa in [cx([], columns=columns), dfb[dfb.ts > 6]]:
+            assert_equal(list(dump_iter_(dfa.union(dfb))), data)
+            assert dfa.intersection(dfb).empty
+
+
+def test_event_orderings():
+    import inspect
+    import numpy as np
+    from stream_graph.base.dataframes.algorithms.utils import orderings
+    rng = np.random.RandomState(0)
+    for name, key in inspect.getmembers(orderings, inspect.isfunction):
+        if 'order_' not in name or name.startswith('key_') or name.startswith('print_'):
+            continue
+        # The prefix tells if events have a reference (r) and bounds (b)
+        prefix = ('' if name.startswith('order') else name.split('_order')[0])
+        n_flags, time_position = 1 + len(prefix), int('r' in prefix)
+        times = rng.randint(0, 4, 200)
+        flags = [rng.rand(200) < .5 for _ in range(n_flags)]
+        events = [tuple(f[i] for f in flags[:time_position]) + (times[i], ) + tuple(f[i] for f in flags[time_position:]) + (i, ) for i in range(200)]
+        assert orderings.flag_ranks(key, n_flags, time_position) is not None
+        assert_equal(orderings.sort_events(events, key, times, flags, time_position), sorted(events, key=key))
+
+
+def test_streamed_events():
+    from stream_graph.base.dataframes.algorithms import continuous_interval
+    from stream_graph.base.dataframes.algorithms import discrete_interval
+    from stream_graph.base.dataframes.algorithms.utils import bounds
+    from stream_graph.base.dataframes.algorithms.utils import no_bounds
+    from stream_graph.base.dataframes.algorithms.utils.orderings import stream_events, presorted
+    from stream_graph.base.dataframes.algorithms.utils.orderings import r_order_1_n2_0n2, rb_order_1_n3_0n3_2n3
+    a = [(1, 480, 500), (2, 460, 540), (1, 560, 580), (2, 520, 540), (1, 580, 600), (2, 620, 660), (1, 480, 500)]
+    b = [(2, 470, 490), (1, 540, 560), (1, 500, 620), (2, 600, 600)]
+
+    def bounded(l):
+        return [e + (i % 2 == 0, i % 3 != 0) for i, e in enumerate(l)]
+
+    for discrete in [True, False]:
+        if discrete:
+            dfa, dfb = DIntervalDF(a, columns=['u', 'ts', 'tf']), DIntervalDF(b, columns=['u', 'ts', 'tf'])
+            module, key, generate = no_bounds, r_order_1_n2_0n2, no_bounds.events_not_sorted
+        else:
+            dfa, dfb = CIntervalDF(bounded(a), columns=['u', 'ts', 'tf', 's', 'f']), CIntervalDF(bounded(b), columns=['u', 'ts', 'tf', 's', 'f'])
+            module, key, generate = bounds, rb_order_1_n3_0n3_2n3, bounds.events_ns
+        expected = list(module.events(dfa, dfb, key, reference=True))
+        sa, sb = dfa.sort_values(by='ts'), dfb.sort_values(by='ts')
+        assert presorted([sa, sb]) and not presorted([dfa, sb])
+        # Only sweeps that may exit early stream the events: full sweeps sort them at once
+        assert isinstance(module.events(sa, sb, key, reference=True), list)
+        assert_equal(sorted(module.events(sa, sb, key, reference=True, lazy=True)), sorted(expected))
+        for block in [1, 2, 100]:
+            streamed = stream_events([sa, sb], lambda p: list(generate(p[0], p[1], reference=True)), lambda p: module.event_fields(p, True), key, 1, block=block)
+            assert_equal(list(streamed), sorted(generate(sa, sb, reference=True), key=key))
+        assert_equal(sorted(sa.intersection(sb).itertuples()), sorted(dfa.intersection(dfb).itertuples()))
+        assert_equal(sorted(sa.difference(sb).itertuples()), sorted(dfa.difference(dfb).itertuples()))
+        algorithms = (discrete_interval if discrete else continuous_interval)
+        sa, sb = sa.merge().sort_values(by='ts'), sb.merge().sort_values(by='ts')
+        for name in ['issuper_by_key', 'issuper_no_key', 'nonempty_intersection_by_key', 'nonempty_intersection_no_key']:
+            for x, y in [(sa, sb), (sb, sa), (sa, sa[sa.ts < 540])]:
+                assert presorted([x, y])
+                unsorted = [df.__class__(df.values.tolist(), columns=df.columns) for df in [x, y]]
+                assert_equal(getattr(algorithms, name)(x, y), getattr(algorithms, name)(*unsorted))
+
+
+def test_indexed_predicates():
+    dfa = DIntervalDF([(1, 0, 5), (1, 6, 8), (2, 3, 3), (2, 10, 12)], columns=['u', 'ts', 'tf'])
+    assert dfa.segment_index(['u']) is dfa.segment_index(['u'])
+    assert dfa.issuper(DIntervalDF([(1, 2, 8), (2, 11, 12)], columns=['u', 'ts', 'tf']))
+    assert not dfa.issuper(DIntervalDF([(1, 2, 8), (2, 3, 4)], columns=['u', 'ts', 'tf']))
+    assert not dfa.issuper(DIntervalDF([(3, 0, 0)], columns=['u', 'ts', 'tf']))
+    assert dfa.issuper(DIntervalDF([(10, 12), (3, 3)], columns=['ts', 'tf']), by_key=False)
+    assert not dfa.issuper(DIntervalDF([(2, 12)], columns=['ts', 'tf']), by_key=False)
+    assert dfa.nonempty_intersection(DIntervalDF([(3, 0, 1), (2, 0, 3)], columns=['u', 'ts', 'tf']))
+    assert not dfa.nonempty_intersection(DIntervalDF([(2, 4, 9)], columns=['u', 'ts', 'tf']))
+
+    # Assignments through at/iat rebuild the index, merging the intervals again
+    dfa = dfa.merge()
+    assert not dfa.issuper(DIntervalDF([(2, 3, 4)], columns=['u', 'ts', 'tf']))
+    dfa.at[dfa.index[(dfa.u == 2) & (dfa.ts == 3)][0], 'tf'] = 9
+    assert dfa.issuper(DIntervalDF([(2, 3, 12)], columns=['u', 'ts', 'tf']))
+    dfa.iat[0, 2] = 1
+    assert not dfa.issuper(DIntervalDF([(1, 2, 3)], columns=['u', 'ts', 'tf']))
+
+    # As do chained writes on a column
+    dfa['tf'][dfa.index[0]] = 3
+    assert dfa.issuper(DIntervalDF([(1, 2, 3)], columns=['u', 'ts', 'tf']))
+
+    dfa = CIntervalDF([(1, 0., 2., True, False), (1, 2., 3., False, True), (2, 5., 6., False, False)], columns=['u', 'ts', 'tf', 's', 'f'])
+    assert dfa.issuper(CIntervalDF([(1, 0., 1., True, True), (2, 5.5, 6., True, False)], columns=['u', 'ts', 'tf', 's', 'f']))
+    assert not dfa.issuper(CIntervalDF([(1, 1., 3., True, True)], columns=['u', 'ts', 'tf', 's', 'f']))
+    assert not dfa.issuper(CIntervalDF([(2, 5., 6., True, False)], columns=['u', 'ts', 'tf', 's', 'f']))
+    assert dfa.nonempty_intersection(CIntervalDF([(2, 4., 5.5, True, False)], columns=['u', 'ts', 'tf', 's', 'f']), on_column=None)
+    assert not dfa.nonempty_intersection(CIntervalDF([(1, 2., 2., True, True), (2, 6., 7., True, True)], columns=['u', 'ts', 'tf', 's', 'f']), on_column=None)
+
+    index = dfa.segment_index(['u'])
+    dfa.drop(index=1, inplace=True)
+    assert dfa.segment_index(['u']) is not index
+    assert not dfa.issuper(CIntervalDF([(1, 2.5, 3., True, True)], columns=['u', 'ts', 'tf', 's', 'f']))
+
+
 if __name__ == "__main__":
     test_cinterval_df()
     test_cinterval_wdf()
@@ -408,3 +679,12 @@ if __name__ == "__main__":
     test_instantaneous_df()
     test_instantaneous_wdf()
     test_time_generators_builders()
+    test_time_generators_delta()
+    test_interval_df_engines()
+    test_interval_index()
+    test_interval_df_invariants()
+    test_weighted_merge_reducers()
+    test_weighted_set_operations()
+    test_event_orderings()
+    test_streamed_events()
+    test_indexed_predicates()
@@ -0,0 +1,65 @@
+"""Test file for the node dictionary."""
+from stream_graph import TemporalLinkSetDF
+from stream_graph import TemporalNodeSetDF
+from stream_graph import ITemporalLinkSetDF
+from stream_graph import LinkSetDF
+from stream_graph import StreamGraph
+from stream_graph import NodeDictionary
+from nose.tools import assert_equal
+
+
+def test_node_dictionary():
+    nd = NodeDictionary(['a', 'b'])
+    assert_equal(len(nd), 2)
+    assert 'a' in nd
+    assert 'c' not in nd
+    assert_equal(list(nd.encode(['b', 'c', 'a']).codes), [1, 2, 0])
+    assert_equal(len(nd), 3)
+    assert_equal(list(nd.codes(['c', 'd'])), [2, -1])
+    assert_equal(list(nd.decode([2, 0])), ['c', 'a'])
+    assert_equal(nd, NodeDictionary(['a', 'b', 'c']))
+
+
+def test_node_dictionary_sets():
+    for d in [False, True]:
+        dfa = [('a', 'b', 1, 3), ('b', 'c', 2, 5), ('a', 'c', 6, 8)]
+        dfb = [('a', 'b', 2, 4), ('c', 'a', 1, 2), ('a', 'c', 7, 9)]
+        nd = NodeDictionary('abc')
+        la, lb = TemporalLinkSetDF(dfa, discrete=d), TemporalLinkSetDF(dfb, discrete=d)
+        ea, eb = TemporalLinkSetDF(dfa, discrete=d, node_dictionary=nd), TemporalLinkSetDF(dfb, discrete=d, node_dictionary=nd)
+        assert ea.df_.u.dtype == eb.df_.v.dtype
+        assert_equal(ea.node_dictionary, nd)
+        assert_equal(set(ea), set(la))
+        assert_equal(set(ea & eb), set(la & lb))
+        assert_equal(set(ea | eb), set(la | lb))
+        assert_equal(set(ea - eb), set(la - lb))
+        assert_equal(set(ea.links_at(2)), set(la.links_at(2)))
+        assert_equal(set(ea.neighbors_at('a', 2)), set(la.neighbors_at('a', 2)))
+        assert_equal(dict(ea.degree_of()), dict(la.degree_of()))
+        assert_equal(set(ea.nodeset), set(la.nodeset))
+        assert_equal(set(ea.linkset), set(la.linkset))
+        assert_equal(set(ea.minimal_temporal_nodeset), set(la.minimal_temporal_nodeset))
+
+        dfn = [('a', 1, 3), ('b', 2, 5), ('c', 6, 8)]
+        assert_equal(set(TemporalNodeSetDF(dfn, discrete=d, node_dictionary=nd)), set(TemporalNodeSetDF(dfn, discrete=d)))
+
+    dfi = [('a', 'b', 1), ('b', 'c', 2)]
+    assert_equal(set(ITemporalLinkSetDF(dfi, node_dictionary=nd)), set(ITemporalLinkSetDF(dfi)))
+    assert_equal(set(LinkSetDF([('a', 'b'), ('b', 'c')], node_dictionary=nd)), {('a', 'b'), ('b', 'c')})
+
+
+def test_node_dictionary_stream_graph():
+    sg = TemporalLinkSetDF([('a', 'b', 2, 3), ('b', 'a', 1, 3), ('b', 'c', 4, 6)]).as_stream_graph_minimal
+    sge = StreamGraph(sg.nodeset_, sg.timeset_, sg.temporal_nodeset_, sg.temporal_linkset_, node_dictionary=True)
+    assert sg.node_dictionary is None
+    assert_equal(set(sge.node_dictionary), {'a', 'b', 'c'})
+    assert_equal(sge.temporal_nodeset_.node_dictionary, sge.temporal_linkset_.node_dictionary)
+    assert_equal(sge.density, sg.density)
+    assert_equal(sge.coverage, sg.coverage)
+    assert_equal(set(sge.graph_at(2).linkset), set(sg.graph_at(2).linkset))
+
+
+if __name__ == "__main__":
+    test_node_dictionary()
+    test_node_dictionary_sets()
+    test_node_dictionary_stream_graph()
@@ -76,5 +76,71 @@ def test_stream_graph():
                 assert_equal(list(sga.mean_degree_at(weights=w)), [((1, True), 0.5), ((2, True), 1.0), ((3, w), 0.5), ((5, w), 0.0), ((6, True), 0.5), ((8, False), 0.0)])
 
 
+def test_graph_at_times():
+    for d in [False, True]:
+        sg = TemporalLinkSetDF([(1, 2, 2, 3), (1, 2, 3, 5), (2, 1, 6, 8), (2, 1, 1, 3)], discrete=d).as_stream_graph_basic
+        times = [1, 3, 7]
+        for (t, g), ta in zip(sg.graph_at(times=times), times):
+            assert_equal(t, ta)
+            assert_equal(set(g.nodeset), set(sg.graph_at(ta).nodeset))
+            assert_equal(set(g.linkset), set(sg.graph_at(ta).linkset))
+
+
+def test_stream_graph_summary():
+    for d in [False, True]:
+        for w in [False, True]:
+            df = [(1, 2, 2, 3, 2), (1, 3, 3, 5, 1), (2, 1, 6, 8, 1), (3, 1, 1, 3, 3)]
+            tls = TemporalLinkSetDF([l if w else l[:4] for l in df], disjoint_intervals=False, weighted=w, discrete=d)
+            for sg in ([tls.as_stream_graph_basic] + ([] if w else [tls.as_stream_graph_minimal])):
+                summary = sg.summary()
+                assert_equal(set(summary), {'n', 'm', 'coverage', 'density'} | ({'weighted_density'} if w else set()))
+                for key, value in summary.items():
+                    assert abs(getattr(sg, key) - value) < 1e-9
+    assert_equal(StreamGraph().summary(), {'n': .0, 'm': .0, 'coverage': .0, 'density': .0})
+
+
+def test_save_load():
+    import os
+    import tempfile
+    from stream_graph import NodeDictionary
+    from stream_graph import ITemporalLinkSetDF
+    path = tempfile.mkdtemp()
+    for d in [False, True]:
+        for w in [False, True]:
+            for nd in [None, True]:
+                df = [(1, 2, 2, 3, 2), (1, 3, 3, 5, 1), (2, 1, 6, 8, 1), (3, 1, 1, 3, 3), (1, 2, 3, 4, 1)]
+                tls = TemporalLinkSetDF([l if w else l[:4] for l in df], disjoint_intervals=False, weighted=w, discrete=d)
+                sg = tls.as_stream_graph_basic
+                sg = StreamGraph(sg.nodeset_, sg.timeset_, sg.temporal_nodeset_, sg.temporal_linkset_, node_dictionary=nd)
+                sg.save(os.path.join(path, 'sg'))
+                for mmap in [False, True]:
+                    sgl = StreamGraph.load(os.path.join(path, 'sg'), mmap=mmap)
+                    assert_equal(sgl.discrete, d)
+                    assert_equal(sgl.weighted, w)
+                    assert_equal(sgl.node_dictionary, sg.node_dictionary)
+                    assert_equal(set(sgl.nodeset), set(sg.nodeset))
+                    assert_equal(list(sgl.timeset), list(sg.timeset))
+                    assert_equal(sorted(sgl.temporal_nodeset), sorted(sg.temporal_nodeset))
+                    assert_equal(sorted(sgl.temporal_linkset), sorted(sg.temporal_linkset))
+                    assert_equal(sgl.summary(), sg.summary())
+
+    ils = ITemporalLinkSetDF([(1, 2, 3), (2, 3, 1), (1, 2, 4)], node_dictionary=NodeDictionary())
+    ils.save(os.path.join(path, 'ils'))
+    assert_equal(sorted(ITemporalLinkSetDF.load(os.path.join(path, 'ils'))), sorted(ils))
+
+    # Memory-mapped sets can be saved back to the directory they are loaded from
+    tls = TemporalLinkSetDF([(i % 7, i % 5, i, i + 2) for i in range(2000)], discrete=True, node_dictionary=NodeDictionary())
+    tls.save(os.path.join(path, 'tls'))
+    tlsl = TemporalLinkSetDF.load(os.path.join(path, 'tls'))
+    tlsl.save(os.path.join(path, 'tls'))
+    assert_equal(sorted(tlsl), sorted(tls))
+    assert_equal(sorted(TemporalLinkSetDF.load(os.path.join(path, 'tls'))), sorted(tls))
+    TemporalLinkSetDF().save(os.path.join(path, 'empty'))
+    assert not bool(TemporalLinkSetDF.load(os.path.join(path, 'empty')))
+
+
 if __name__ == "__main__":
     test_stream_graph()
+    test_graph_at_times()
+    test_stream_graph_summary()
+    test_save_load()
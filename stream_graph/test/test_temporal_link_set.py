@@ -266,10 +266,10 @@ def test_temporal_link_set_df():
 
         assert isinstance(lsa | lsb, TemporalLinkSetDF)
         if d:
-            assert_equal(set((lsb | lsa)), {(2, 1, 1, 1, 1), (1, 2, 2, 2, 2), (1, 2, 5, 7, 1), (2, 1, 2, 3, 2), (1, 2, 3, 4, 3), (2, 1, 4, 5, 1), (1, 2, 1, 1, 1), (2, 1, 6, 8, 2)})
+            assert_equal(set((lsb | lsa)), {(2, 1, 1, 1, 1), (1, 2, 2, 2, 2), (1, 2, 5, 7, 1), (2, 1, 2, 3, 2), (1, 2, 3, 3, 3), (1, 2, 4, 4, 2), (1, 2, 1, 1, 1), (2, 1, 6, 8, 1)})
         else:
             assert_equal(set((lsb | lsa)), {(1, 2, 4.0, 5.0, 'left', 1), (2, 1, 2.6, 3.0, 'left', 1), (2, 1, 6.0, 8.0, 'left', 1), (1, 2, 2.0, 4.0, 'left', 2), (2, 1, 2.5, 2.6, 'left', 2), (1, 2, 6.0, 7.0, 'left', 1), (1, 2, 1.0, 2.0, 'left', 1), (2, 1, 1.0, 2.5, 'left', 1)})
-        assert_equal((lsb | lsa).size, 6 * int(d) + 9)
+        assert_equal((lsb | lsa).size, 4 * int(d) + 9)
         assert_equal(set(lsb | lsa), set(lsa | lsb))
 
         if d:
@@ -512,6 +512,13 @@ def test_itemporal_link_set_df():
         else:
             assert_equal(list(ITemporalLinkSetDF(df, discrete=d).ego_betweeness(3, direction='both')), [((2, True), 0.0), ((3, True), 1.0)])
             assert_equal(list(ITemporalLinkSetDF(df, discrete=d).closeness(2, direction='both')), [((2, True), 1.3333333333333333), ((3, True), 1.5), ((4, True), 1.0), ((5, True), 0.0)])
+        ego = ITemporalLinkSetDF(df, discrete=d).ego_betweeness(direction='both')
+        assert_equal(list(ego[3]), list(ITemporalLinkSetDF(df, discrete=d).ego_betweeness(3, direction='both')))
+        assert_equal({u: list(v) for u, v in ITemporalLinkSetDF(df, discrete=d).ego_betweeness(direction='both', n_jobs=2)}, {u: list(v) for u, v in ego})
+        assert_equal(dict(ITemporalLinkSetDF(df, discrete=d).ego_betweeness(t=3, direction='both', n_jobs=2)), dict(ITemporalLinkSetDF(df, discrete=d).ego_betweeness(t=3, direction='both')))
+        ls = ITemporalLinkSetDF(df, discrete=d)
+        assert_equal({u: list(v) for u, v in ls.closeness(n_jobs=2)}, {u: list(ls.closeness(u)) for u in ls.nodeset})
+        assert_equal(dict(ls.closeness(t=3, n_jobs=-1)), {u: ls.closeness(u, t=3) for u in ls.nodeset})
 
         df = [(1, 2, 4), (1, 2, 8), (2, 3, 4), (1, 3, 6), (3, 4, 2), (2, 4, 3)]
         if d:
@@ -665,6 +672,206 @@ def test_itemporal_link_set_df():
             assert_equal(list(ITemporalLinkSetDF(df, discrete=d).closeness(2, direction='both')), [((2, True), 1.3333333333333333), ((3, True), 1.5), ((4, True), 1.0), ((5, True), 0.0)])
 
 
+def test_links_at_times():
+    times = [0, 1, 2, 2.5, 3, 5, 6, 9]
+    for d in [False, True]:
+        for w in [False, True]:
+            if w:
+                df = [(1, 2, 1, 3, 1), (1, 2, 5, 8, 2), (2, 3, 2, 5, 1), (3, 1, 3, 3, 1)]
+            else:
+                df = [(1, 2, 1, 3), (1, 2, 5, 8), (2, 3, 2, 5), (3, 1, 3, 3)]
+            times_ = ([t for t in times if float(t).is_integer()] if d else times)
+            tls = TemporalLinkSetDF(df, discrete=d, weighted=w)
+            tc = tls.links_at(times=times_)
+            assert isinstance(tc, TimeCollection)
+            assert tc.instantaneous
+            assert_equal([(t, set(ls)) for t, ls in tc], [(t, set(tls.links_at(t))) for t in times_])
+            assert_equal(set(tc.get_at(3)), set(tls.links_at(3)))
+
+            itls = ITemporalLinkSetDF([l[:3] + l[4:] for l in df], discrete=d, weighted=w)
+            assert_equal([(t, set(ls)) for t, ls in itls.links_at(times=times_)], [(t, set(itls.links_at(t))) for t in times_])
+    assert_equal([(t, set(ls)) for t, ls in TemporalLinkSetDF().links_at(times=[1, 2])], [(1, set()), (2, set())])
+
+
+def test_merge_reducers():
+    import pandas as pd
+    data = [(1, 2, 1, 4, 2), (1, 2, 3, 6, 5)]
+    expected = {True: {'max': [(1, 2, 1, 2, 2), (1, 2, 3, 6, 5)], 'min': [(1, 2, 1, 4, 2), (1, 2, 5, 6, 5)]},
+                False: {'max': [(1, 2, 1, 3, 'left', 2), (1, 2, 3, 6, 'both', 5)], 'min': [(1, 2, 1, 4, 'both', 2), (1, 2, 4, 6, 'right', 5)]}}
+    for d in [True, False]:
+        for merge_function in ['max', 'min']:
+            df = pd.DataFrame(data, columns=['u', 'v', 'ts', 'tf', 'w'])
+            tls = TemporalLinkSetDF(df, disjoint_intervals=False, weighted=True, merge_function=merge_function, discrete=d)
+            assert_equal(sorted(tls), expected[d][merge_function])
+
+
+def test_ego_native():
+    from stream_graph.base import functions
+    if functions.EgoLines is None:
+        return
+    lines = [(1, 2, 1), (2, 3, 1), (1, 3, 2), (3, 4, 2), (2, 4, 3), (4, 5, 3), (1, 4, 4), (5, 1, 5), (2, 5, 6), (3, 1, 6), (4, 2, 7)]
+    el = functions.EgoLines(lines)
+    for both in [False, True]:
+        neigh = {u: set() for u in range(1, 6)}
+        for u, v, _ in lines:
+            neigh[u].add(v)
+            if both:
+                neigh[v].add(u)
+        for u, ne in neigh.items():
+            for d in [False, True]:
+                for detailed in [False, True]:
+                    ref, out = list(functions.ego(u, ne, lines, both, detailed, d)), list(functions.ego_c(u, ne, el, both, detailed, d))
+                    assert_equal([t for t, _ in ref], [t for t, _ in out])
+                    for (_, a), (_, b) in zip(ref, out):
+                        assert abs(a - b) < 1e-9
+            for t in range(8):
+                assert abs(functions.ego_at(u, ne, lines, t, both, False, True) - functions.ego_at_c(u, ne, el, t, both, False, True)) < 1e-9
+
+
+def test_maximal_cliques_directions():
+    df = [('a', 'b', 1, 6), ('b', 'c', 2, 8), ('c', 'a', 3, 5), ('a', 'c', 4, 9), ('c', 'b', 5, 7), ('b', 'a', 2, 4)]
+    for d in [False, True]:
+        ls = TemporalLinkSetDF(df, discrete=d)
+        assert_equal(ls.get_maximal_cliques(),
+                     {(frozenset({'a', 'b'}), (1, 6)),
+                      (frozenset({'b', 'c'}), (2, 8)),
+                      (frozenset({'a', 'c'}), (3, 9)),
+                      (frozenset({'a', 'b', 'c'}), (3, 6))})
+        directed = {(frozenset({'a', 'b'}), (1, 6)), (frozenset({'a', 'b'}), (2, 4)),
+                    (frozenset({'a', 'c'}), (3, 5)), (frozenset({'a', 'c'}), (4, 5)),
+                    (frozenset({'b', 'c'}), (2, 8)), (frozenset({'b', 'c'}), (5, 7))}
+        assert_equal(ls.get_maximal_cliques(direction='out'), directed)
+        assert_equal(ls.get_maximal_cliques(direction='in'), directed)
+
+
+def test_read_link_stream():
+    import os
+    import tempfile
+    import pandas as pd
+    from stream_graph import read_link_stream
+    path = os.path.join(tempfile.mkdtemp(), 'links.csv')
+    for d in [False, True]:
+        df = [('a', 'b', 1, 3), ('b', 'c', 2, 5), ('a', 'b', 2, 4), ('c', 'a', 1, 2), ('b', 'c', 6, 9), ('a', 'b', 8, 9)]
+        if not d:
+            df = [(u, v, ts / 2., tf / 2.) for u, v, ts, tf in df]
+        pd.DataFrame(df, columns=['u', 'v', 'ts', 'tf']).to_csv(path, index=False)
+        for chunksize in [1, 2, 5]:
+            ls = read_link_stream(path, chunksize=chunksize)
+            assert isinstance(ls, TemporalLinkSetDF)
+            assert_equal(ls.discrete, d)
+            assert_equal(set(ls.node_dictionary), {'a', 'b', 'c'})
+            assert_equal(set(ls), set(TemporalLinkSetDF(df, disjoint_intervals=False, discrete=d)))
+
+        pd.DataFrame([l[:3] for l in df] * 2, columns=['source', 'target', 'time']).to_csv(path, index=False)
+        ls = read_link_stream(path, columns=['source', 'target', 'time'], chunksize=4)
+        assert isinstance(ls, ITemporalLinkSetDF)
+        assert_equal(sorted(ls), sorted(set(l[:3] for l in df)))
+
+    # Weighted chunks are merged by the merge_function
+    pd.DataFrame([('a', 'b', 1, 4, 2), ('a', 'b', 3, 6, 5), ('b', 'c', 2, 3, 1)], columns=['u', 'v', 'ts', 'tf', 'w']).to_csv(path, index=False)
+    for chunksize in [1, 2, 5]:
+        ls = read_link_stream(path, weighted=True, merge_function=max, chunksize=chunksize)
+        assert_equal(sorted(ls), [('a', 'b', 1, 2, 2), ('a', 'b', 3, 6, 5), ('b', 'c', 2, 3, 1)])
+
+
+def test_lazy():
+    from stream_graph import TimeSetDF
+    from stream_graph import TemporalNodeSetB
+    from stream_graph import LazyTemporalLinkSetDF
+    dfa = [(1, 2, 1, 8), (2, 3, 2, 6), (1, 3, 5, 9), (3, 4, 0, 4), (4, 1, 3, 7)]
+    dfb = [(1, 2, 3, 10), (2, 3, 1, 3), (3, 4, 2, 5), (4, 1, 6, 9)]
+    dfc = [(1, 2, 0, 2), (2, 4, 4, 6), (1, 3, 1, 2)]
+    for d in [False, True]:
+        a, b, c = (TemporalLinkSetDF(df, disjoint_intervals=False, discrete=d) for df in [dfa, dfb, dfc])
+        tnb = TemporalNodeSetB([1, 2, 3], TimeSetDF([(2, 8)], discrete=d))
+        tns = TemporalNodeSetDF([(1, 0, 6), (2, 2, 9), (3, 1, 8)], discrete=d)
+
+        lazy = ((a.lazy().substream([1, 2, 3], None, [(1, 9)]) & b) | c).substream(None, [2, 3], [(0, 7)])
+        assert isinstance(lazy, LazyTemporalLinkSetDF)
+        assert_equal(lazy.plan[0], 'times')
+        assert_equal(lazy.plan[1][2][0], 'nodes')
+        eager = ((a.substream([1, 2, 3], None, [(1, 9)]) & b) | c).substream(None, [2, 3], [(0, 7)])
+        assert_equal(sorted(lazy), sorted(eager))
+        assert_equal(lazy.size, eager.size)
+
+        assert_equal(sorted(lazy.induced_substream(tnb)), sorted(eager.induced_substream(tnb)))
+        assert_equal(sorted((a.lazy() - b).induced_substream(tns)), sorted((a - b).induced_substream(tns)))
+        assert not bool(a.lazy().substream([5]))
+
+        # Empty weighted sets
+        w = TemporalLinkSetDF([l + (2, ) for l in dfa], disjoint_intervals=False, discrete=d, weighted=True)
+        empty = TemporalLinkSetDF(discrete=d, weighted=True)
+        assert not bool(empty.lazy())
+        assert_equal(sorted(empty.lazy() | w), sorted(w))
+        assert not bool(empty.lazy() & w)
+
+
+def test_builder():
+    from stream_graph import TemporalLinkSetBuilder
+    dfa = [(1, 2, 1, 3), (2, 3, 2, 6), (1, 2, 3, 5), (3, 1, 4, 4), (1, 2, 7, 9), (2, 3, 8, 8)]
+    for d in [False, True]:
+        builder = TemporalLinkSetBuilder(discrete=d)
+        for i, (u, v, ts, tf) in enumerate(dfa):
+            builder.add(u, v, ts, tf)
+            eager = TemporalLinkSetDF(dfa[:i + 1], disjoint_intervals=False, discrete=d)
+            assert_equal(builder.m_at(), eager.m_at(ts))
+            for x in [1, 2, 3]:
+                for direction in ['out', 'in', 'both']:
+                    assert_equal(set(builder.neighbors_at(x, direction)), set(eager.neighbors_at(x, ts, direction)))
+                    assert_equal(builder.degree_at(x, direction), eager.neighbors_at(x, ts, direction).size)
+        assert_equal(sorted(builder.build()), sorted(TemporalLinkSetDF(dfa, disjoint_intervals=False, discrete=d)))
+
+    # Weighted intervals are merged on build
+    import pandas as pd
+    dfw = pd.DataFrame([l + (w, ) for l, w in zip(dfa, [2, 1, 4, 1, 1, 3])], columns=['u', 'v', 'ts', 'tf', 'w'])
+    for d in [False, True]:
+        for merge_function in [None, 'max']:
+            builder = TemporalLinkSetBuilder(discrete=d, weighted=True, merge_function=merge_function)
+            builder.extend(dfw)
+            assert_equal(builder.links_at(), {(1, 2), (2, 3)})
+            eager = TemporalLinkSetDF(dfw.copy(), disjoint_intervals=False, discrete=d, weighted=True, merge_function=merge_function)
+            assert_equal(sorted(builder.build()), sorted(eager))
+
+    builder = TemporalLinkSetBuilder(instantaneous=True)
+    builder.extend([(1, 2, 3), (2, 1, 2), (1, 2, 3)])
+    builder.extend([(1, 3, 5)])
+    assert_equal(builder.now, 5)
+    assert_equal(builder.links_at(), {(1, 3)})
+    assert_equal(sorted(builder.build()), [(1, 2, 3), (1, 3, 5), (2, 1, 2)])
+    try:
+        builder.add(1, 2, 4)
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_window_metrics():
+    dfa = [(1, 2, 1, 3), (2, 3, 2, 6), (1, 3, 5, 9), (3, 1, 8, 8)]
+    tls = TemporalLinkSetDF(dfa, discrete=True)
+    metrics = tls.window_metrics(3, times=[0, 2, 5, 9, 12], metrics=('m', 'n', 'density', 'degree'))
+    assert_equal(list(metrics['m']), [(0, 0), (2, 2), (5, 3), (9, 2), (12, 0)])
+    assert_equal(list(metrics['n']), [(0, 0), (2, 3), (5, 3), (9, 2), (12, 0)])
+    assert_equal([d for _, d in metrics['density']], [0, 2 / 6., 3 / 6., 1., 0])
+    assert_equal([d for _, d in metrics['degree']], [0, 2 / 3., 1., 1., 0])
+    assert_equal(sorted(tls.window_metrics([2, 4], step=4)), [2, 4])
+
+    tls = TemporalLinkSetDF([(u, v, float(ts), float(tf)) for u, v, ts, tf in dfa], discrete=False)
+    assert_equal(list(tls.window_metrics(2., times=[3., 5., 10.], metrics=('m', ))['m']), [(3., 2), (5., 2), (10., 1)])
+
+    itls = ITemporalLinkSetDF([(1, 2, 1), (1, 2, 2), (2, 3, 2), (3, 1, 6)], discrete=True)
+    metrics = itls.window_metrics(2, step=2, metrics=('m', 'interactions'))
+    assert_equal(list(metrics['m']), [(1, 1), (3, 2), (5, 0)])
+    assert_equal(list(metrics['interactions']), [(1, 1), (3, 2), (5, 0)])
+
+
 if __name__ == "__main__":
     test_temporal_link_set_df()
     test_itemporal_link_set_df()
+    test_links_at_times()
+    test_ego_native()
+    test_maximal_cliques_directions()
+    test_read_link_stream()
+    test_lazy()
+    test_builder()
+    test_window_metrics()
@@ -401,8 +401,29 @@ def test_temporal_node_set_op_b_df():
         assert nsa.issuperset(nsa - nsb)
 
 
+def test_nodes_at_times():
+    for d in [False, True]:
+        df = [(1, 2, 3), (2, 1, 4), (3, 3, 5)]
+        times = [0, 2, 3, 5]
+        for ns in [TemporalNodeSetDF(df, discrete=d), TemporalNodeSetB({1, 2}, [(2, 3), (5, 6)], discrete=d)]:
+            assert_equal([(t, set(nodes)) for t, nodes in ns.nodes_at(times=times)], [(t, set(ns.nodes_at(t))) for t in times])
+        ns = ITemporalNodeSetDF([(1, 2), (2, 3), (3, 3)], discrete=d)
+        assert_equal([(t, set(nodes)) for t, nodes in ns.nodes_at(times=[1, 3])], [(1, set()), (3, {2, 3})])
+
+
+def test_common_time_pair():
+    df = [(1, 1, 6), (2, 2, 8), (3, 4, 10), (1, 9, 12)]
+    for d in [False, True]:
+        ns = TemporalNodeSetDF(df, discrete=d)
+        assert_equal(dict(ns.common_time_pair()), {(1, 2): 4 + int(d), (1, 3): 3 + 2 * int(d), (2, 3): 4 + int(d)})
+        assert_equal(dict(ns.common_time_pair([(3, 1), (2, 1), (1, 4)])), {(3, 1): 3 + 2 * int(d), (2, 1): 4 + int(d), (1, 4): 0})
+        assert_equal(ns.total_common_time, 42 + 12 * int(d))
+
+
 if __name__ == "__main__":
     test_temporal_node_set_df()
     test_itemporal_node_set_df()
     test_temporal_node_set_b()
     test_temporal_node_set_op_b_df()
+    test_nodes_at_times()
+    test_common_time_pair()